@@ -0,0 +1,31 @@
+'''Script for rewriting a raster dataset into a layout optimized for reading timeseries.'''
+from argparse import ArgumentParser
+
+import skope
+
+def main():
+    '''Write the series store for the dataset named by command-line arguments.'''
+
+    parser = ArgumentParser()
+    parser.add_argument('-f', dest='datafile', required=True,
+                        help='path to raster dataset file')
+    parser.add_argument('-o', dest='storefile',
+                        help='path to series store file (default: beside the dataset file)')
+    parser.add_argument('-chunked', dest='chunked', action='store_true',
+                        help='write a compressed store divided into tiles')
+    parser.add_argument('-chunk-size', dest='chunk_size', type=int, default=64,
+                        help='width and height of each tile of a chunked store in pixels')
+
+    args = parser.parse_args()
+
+    raster_dataset = skope.RasterDataset(args.datafile, lazy=True, use_series_store=False)
+    if args.chunked:
+        series_store = skope.ChunkedSeriesStore.write(raster_dataset, args.storefile,
+                                                      args.chunk_size)
+    else:
+        series_store = skope.SeriesMajorStore.write(raster_dataset, args.storefile)
+
+    print(series_store.path)
+
+if __name__ == '__main__':
+    main()
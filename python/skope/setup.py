@@ -13,5 +13,5 @@ setup(
     package_dir={'': 'src'},
     data_files=[("", ["LICENSE.txt"])],
     install_requires=['affine >= 2.2.1', 'typing >= 3.6.6'],
-    scripts=['scripts/series.py']
+    scripts=['scripts/series.py', 'scripts/build_series_store.py']
 )
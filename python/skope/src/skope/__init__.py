@@ -2,3 +2,8 @@
 
 # pylint: disable=wildcard-import
 from skope.raster_dataset import *
+from skope.series_store import *
+from skope.shared_arrays import *
+from skope.zonal import *
+from skope.deadline import *
+from skope.netcdf_dataset import *
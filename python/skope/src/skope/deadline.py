@@ -0,0 +1,44 @@
+'''Cooperative time budgets for long-running extractions from raster datasets.'''
+import time
+
+class DeadlineExceeded(TimeoutError):
+    '''Exception raised when an extraction runs past its deadline.  The partial
+    attribute holds the result computed before the deadline passed, in the form
+    the extraction returns, or None if no partial result is available.'''
+
+    def __init__(self, message: str, partial=None):
+        super().__init__(message)
+        self.partial = partial
+
+class Deadline:
+    '''A point in time by which an extraction should finish.  Extractions check
+    the deadline between chunks of work and stop early once it has passed.'''
+
+    def __init__(self, seconds: float):
+        '''Initialize a deadline the given number of seconds from now.'''
+        self.started = time.monotonic()
+        self.expires = self.started + seconds
+
+    @property
+    def elapsed(self) -> float:
+        '''Return the number of seconds since the deadline was set.'''
+        return time.monotonic() - self.started
+
+    @property
+    def remaining(self) -> float:
+        '''Return the number of seconds until the deadline, or zero if it has passed.'''
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        '''Return true if the deadline has passed.'''
+        return time.monotonic() >= self.expires
+
+    def check(self) -> None:
+        '''Raise DeadlineExceeded without a partial result if the deadline has passed.'''
+        if self.expired():
+            raise self.exceeded()
+
+    def exceeded(self, partial=None) -> DeadlineExceeded:
+        '''Return a DeadlineExceeded exception carrying the given partial result.'''
+        return DeadlineExceeded(
+            'Deadline exceeded after {:.3f} seconds'.format(self.elapsed), partial)
@@ -0,0 +1,167 @@
+'''Access to the variables of NetCDF files holding several gridded timeseries.'''
+import os
+import threading
+from typing import List
+
+import numpy
+from osgeo import gdal
+
+from skope.deadline import Deadline
+from skope.raster_dataset import RasterDataset, SERIES_CHUNK_BANDS
+
+class NetCDFDataset:
+    '''Class representing a NetCDF file holding one or more variables, each a
+    timeseries of grids with the time dimension first.  The file is opened once,
+    and each variable is opened once on first use as a lazy RasterDataset whose
+    bands are the time steps of the variable, so that every query for a variable
+    shares one GDAL handle.  Variables on the same grid share one index from
+    coordinates to pixels.  Where GDAL supports multidimensional access, the
+    series of a pixel is read as hyperslabs spanning many time steps rather than
+    one band at a time.'''
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, path: str):
+        '''Initialize a NetCDFDataset from the path to a NetCDF file and find the
+        names of its variables.'''
+        if not os.path.isfile(path):
+            raise FileNotFoundError('Dataset file not found at path ' + path)
+        self.filename = path
+        self._gdal_dataset = gdal.Open(path, gdal.GA_ReadOnly)
+        if self._gdal_dataset is None:
+            raise ValueError('Invalid dataset file found at path ' + path)
+        self._lock = threading.Lock()
+        # the multidimensional dataset is opened and read under its own lock so
+        # that reading hyperslabs does not block opening variables
+        self._array_lock = threading.Lock()
+        self._variables = {}
+        self._arrays = {}
+        self._multidimensional_dataset = None
+
+        # a file with several variables exposes each as a GDAL subdataset, while
+        # a file with one variable exposes it as the bands of the file itself
+        subdatasets = self._gdal_dataset.GetSubDatasets()
+        if subdatasets:
+            self._subdataset_names = {name.rsplit(':', 1)[-1]: name for name, _ in subdatasets}
+        else:
+            band = self._gdal_dataset.GetRasterBand(1)
+            variable_name = band.GetMetadataItem('NETCDF_VARNAME') if band else None
+            self._subdataset_names = {variable_name or 'Band1': None}
+
+    def __repr__(self):
+        return "NetCDFDataset('{}')".format(os.path.basename(self.filename))
+
+    @property
+    def variables(self) -> List[str]:
+        '''Return the names of the variables in the file.'''
+        return list(self._subdataset_names)
+
+    def variable(self, variable_name: str) -> RasterDataset:
+        '''Return the lazy RasterDataset for the named variable, opening it only
+        the first time it is requested.'''
+        with self._lock:
+            raster_dataset = self._variables.get(variable_name)
+            if raster_dataset is None:
+                if variable_name not in self._subdataset_names:
+                    raise KeyError('No variable {} in {}'.format(variable_name, self))
+                subdataset_name = self._subdataset_names[variable_name]
+                gdal_dataset = (self._gdal_dataset if subdataset_name is None
+                                else gdal.Open(subdataset_name, gdal.GA_ReadOnly))
+                raster_dataset = RasterDataset(gdal_dataset, lazy=True, use_series_store=False)
+                raster_dataset.filename = subdataset_name or self.filename
+                self._variables[variable_name] = raster_dataset
+            return raster_dataset
+
+    def pixels_at_points(self, variable_name: str, longitudes, latitudes) -> (
+            numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        '''Return the row and column indices of the pixels of the named variable at
+        each of the given (longitude, latitude) coordinates, as for
+        RasterDataset.pixels_at_points.'''
+        return self._grid(variable_name).pixels_at_points(longitudes, latitudes)
+
+    def series_at_point(self, variable_name: str, longitude: float, latitude: float,
+                        begin: int = None, end: int = None,
+                        deadline: Deadline = None) -> numpy.ndarray:
+        '''Return the values of the named variable at the given (longitude,
+        latitude) coordinates in the specified range of time steps.'''
+        row, column, in_coverage = self.pixels_at_points(variable_name, longitude, latitude)
+        if not in_coverage:
+            raise ValueError('The point ({}, {}) is outside the coverage of {}'.format(
+                longitude, latitude, self))
+        return self.series_at_pixel(variable_name, int(row), int(column), begin, end, deadline)
+
+    def series_at_pixel(self, variable_name: str, row: int, column: int, begin: int = None,
+                        end: int = None, deadline: Deadline = None) -> numpy.ndarray:
+        '''Return the values of the named variable at the pixel with the given
+        (row, column) indices in the specified range of time steps.  The time
+        steps are read in hyperslabs of SERIES_CHUNK_BANDS steps, checking the
+        deadline if given between hyperslabs as RasterDataset.series_at_pixel does.'''
+        raster_dataset = self.variable(variable_name)
+        if begin is None:
+            begin = 0
+        if end is None:
+            end = raster_dataset.bands
+        array, bottom_up = self._array(variable_name, raster_dataset)
+        if array is None or end <= begin:
+            return raster_dataset.series_at_pixel(row, column, begin, end, deadline=deadline)
+
+        if deadline is not None:
+            deadline.check()
+        storage_row = raster_dataset.rows - 1 - row if bottom_up else row
+        chunks = []
+        for chunk_begin in range(begin, end, SERIES_CHUNK_BANDS):
+            if deadline is not None and chunk_begin > begin and deadline.expired():
+                raise deadline.exceeded(numpy.concatenate(chunks))
+            with self._array_lock:
+                chunk = array.ReadAsArray(
+                    array_start_idx=[chunk_begin, storage_row, column],
+                    count=[min(chunk_begin + SERIES_CHUNK_BANDS, end) - chunk_begin, 1, 1])
+            chunks.append(chunk.reshape(-1))
+        return numpy.concatenate(chunks)
+
+    def _grid(self, variable_name: str) -> RasterDataset:
+        '''Return the dataset whose coordinate index is used for the named variable:
+        the first variable opened on the same grid, or else the variable itself.'''
+        raster_dataset = self.variable(variable_name)
+        with self._lock:
+            for other in self._variables.values():
+                if (other.geotransform == raster_dataset.geotransform and
+                        (other.rows, other.cols) == (raster_dataset.rows, raster_dataset.cols)):
+                    return other
+        return raster_dataset
+
+    def _array(self, variable_name: str, raster_dataset: RasterDataset):
+        '''Return the GDAL multidimensional array for the named variable along with
+        true if its rows are stored south to north, or None if the array cannot be
+        opened or its dimensions do not match the bands, rows, and columns of the
+        variable as a raster dataset.'''
+        with self._array_lock:
+            if variable_name not in self._arrays:
+                self._arrays[variable_name] = (self._open_array(variable_name, raster_dataset)
+                                               or (None, False))
+            return self._arrays[variable_name]
+
+    def _open_array(self, variable_name: str, raster_dataset: RasterDataset):
+        '''Open the GDAL multidimensional array for the named variable and return
+        it along with true if its rows are stored south to north, or None if it does
+        not match the variable.  Must be called while holding the array lock.'''
+        if self._multidimensional_dataset is None:
+            if not hasattr(gdal, 'OF_MULTIDIM_RASTER'):
+                return None
+            self._multidimensional_dataset = gdal.OpenEx(self.filename, gdal.OF_MULTIDIM_RASTER)
+            if self._multidimensional_dataset is None:
+                return None
+
+        array = self._multidimensional_dataset.GetRootGroup().OpenMDArray(variable_name)
+        if array is None:
+            return None
+        dimensions = array.GetDimensions()
+        if [dimension.GetSize() for dimension in dimensions] != list(raster_dataset.shape):
+            return None
+
+        # GDAL presents grids north up, so rows stored with latitudes
+        # increasing are read in reverse order
+        latitudes = dimensions[1].GetIndexingVariable()
+        if latitudes is None:
+            return None
+        latitude_values = latitudes.ReadAsArray()
+        return array, len(latitude_values) > 1 and latitude_values[0] < latitude_values[-1]
@@ -1,28 +1,48 @@
 '''Abstractions for working with GDAL-compatible raster datasets.'''
 import os
-from typing import List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
 
 import affine
 import numpy
 from osgeo import gdal
+from osgeo import gdal_array
 import osr
 
+from skope.deadline import Deadline
+from skope.series_store import open_series_store
+from skope.shared_arrays import SharedArray, shared_array_name
+from skope.zonal import MaskCache, masked_statistics, rasterize_geometry
+
+# Number of bands read at a time when reading a series directly from a dataset
+# under a deadline, so that the deadline is checked between reads
+SERIES_CHUNK_BANDS = 1024
+
 class RasterDataset:
     '''Class representing a GDAL-compatible raster dataset.'''
+    # pylint: disable=too-many-instance-attributes
     @staticmethod
     def create(filename: str, file_format: str, pixel_type,
                shape: Tuple[float, float, float],
                origin: Tuple[float, float],
                pixel_size: Tuple[float, float],
-               coordinate_system: str = 'WGS84'):
+               coordinate_system: str = 'WGS84',
+               lazy: bool = False,
+               memory_map: bool = False,
+               options: List[str] = None):
         '''Create a new GDAL dataset, flush it to disk, and return a
-        RasterDataset referencing it.'''
+        RasterDataset referencing it.  Creation options specific to the file
+        format are passed to the GDAL driver, e.g. ['TILED=YES',
+        'BLOCKXSIZE=256', 'BLOCKYSIZE=256', 'COMPRESS=DEFLATE', 'BIGTIFF=YES',
+        'NUM_THREADS=ALL_CPUS'] for GeoTIFF files.'''
 
         # get the GDAL driver for the specified dataset file format
         driver = gdal.GetDriverByName(file_format)
 
         # create the a new gdal.Dataset instance and corresponding data file
-        gdal_dataset = driver.Create(filename, shape[2], shape[1], shape[0], pixel_type)
+        gdal_dataset = driver.Create(filename, shape[2], shape[1], shape[0], pixel_type,
+                                     options=options or [])
 
         # set the spatial dimensions, resolution, and orientation of the dataset
         gdal_dataset.SetGeoTransform((origin[0], pixel_size[0], 0, origin[1], 0, -pixel_size[1]))
@@ -36,16 +56,40 @@ class RasterDataset:
         gdal_dataset = None
 
         # return a new RasterData object referencing the new file
-        return RasterDataset(filename)
+        return RasterDataset(filename, lazy, memory_map)
 
-    def __init__(self, dataset):
+    def __init__(self, dataset, lazy: bool = False, memory_map: bool = False,
+                 use_series_store: bool = True, shared_memory: bool = False):
         '''Initialize a RasterDataset either from gdal.Dataset object or a path
-        to a GDAL-compatible raster dataset file.'''
+        to a GDAL-compatible raster dataset file.  Unless lazy is true, all pixel
+        values are read into memory immediately; otherwise only the pixels needed
+        to answer each query are read from the dataset.  If memory_map is true and
+        the pixel values are stored uncompressed and band-sequential in the file,
+        the file is mapped into memory read-only rather than read, so that
+        processes can share the pages of the operating system's file cache; values
+        written to a mapped dataset are seen in its pixel values once flushed.  If
+        use_series_store is true and an up-to-date store of the dataset optimized
+        for reading timeseries is found beside the dataset file, pixel values are
+        read from that store instead.  If shared_memory is true and another process
+        has shared the pixel values of the current version of the dataset file
+        through a SharedArrayPool, the values are viewed read-only in shared memory
+        rather than read, so that they are held once however many processes use them.
+        A dataset opened before its values are shared keeps its own values until it
+        is reopened, which shared_values_available tells when to do.'''
         self._gdal_dataset, self.filename = _get_gdal_dataset_for_argument(dataset)
         self._geotransform = self._gdal_dataset.GetGeoTransform()
         self._affine = None
         self._inverse_affine = None
-        self._array = self._gdal_dataset.ReadAsArray()
+        self._lazy = lazy
+        self._memory_map = memory_map
+        self._use_series_store = use_series_store
+        self._shared_memory = shared_memory
+        self._shared_array = None
+        self._gdal_lock = threading.Lock()
+        self._array = None
+        self._series_store = None
+        self._stale = False
+        self._load_array()
 
         # ensure that the latitudinal axis of the dataset points north
         if not self.geotransform[5] < 0:
@@ -69,12 +113,72 @@ class RasterDataset:
         '''Return the number of columns of pixels in the raster dataset.'''
         return self._gdal_dataset.RasterXSize
 
+    @property
+    def lazy(self) -> bool:
+        '''Return true if pixel values are read from the dataset only on demand.'''
+        return self._lazy
+
+    @property
+    def series_store(self):
+        '''Return the store from which pixel values are read if the dataset is backed
+        by a store optimized for reading timeseries, and None otherwise.'''
+        return self._series_store
+
+    @property
+    def memory_mapped(self) -> bool:
+        '''Return true if the pixel values are mapped into memory from the dataset file.'''
+        return isinstance(self._array, numpy.memmap)
+
+    @property
+    def shared(self) -> bool:
+        '''Return true if the pixel values are viewed in shared memory.'''
+        return self._shared_array is not None
+
+    def shared_values_available(self) -> bool:
+        '''Return true if the dataset was opened with shared_memory but holds its own
+        pixel values, because they were not yet shared when it was opened, and the
+        values of the current version of its file have since been shared, so that
+        reopening the dataset would attach to them.'''
+        if not self._shared_memory or self.shared or self.filename is None:
+            return False
+        shared_array = _attach_shared_array(self.filename, self.shape)
+        if shared_array is None:
+            return False
+        shared_array.close()
+        return True
+
     @property
     def shape(self) -> Tuple[int]:
         '''Return the dimensions of the 3-D array of pixel values in the
         dataset as the 3-tuple (bands, rows columns).'''
+        if self._array is None:
+            return self.bands, self.rows, self.cols
         return self._array.shape
 
+    @property
+    def nbytes(self) -> int:
+        '''Return the number of bytes of pixel data held in memory by the dataset.
+        Memory-mapped pixel data is held by the operating system's file cache, and
+        shared pixel data by the process that shared it, rather than by the dataset,
+        and is not counted.'''
+        if self._array is None or self.memory_mapped or self.shared:
+            return 0
+        return self._array.nbytes
+
+    @property
+    def resident_nbytes(self) -> int:
+        '''Return the number of bytes of pixel values the dataset views in memory,
+        counting memory-mapped and shared pixel data, unlike nbytes, although only
+        the pages of memory-mapped data that have been read are resident.'''
+        return 0 if self._array is None else self._array.nbytes
+
+    @property
+    def nodata(self):
+        '''Return the value representing missing data in the first band of the
+        dataset, or None if no such value is set.'''
+        with self._gdal_lock:
+            return self._gdal_dataset.GetRasterBand(1).GetNoDataValue()
+
     @property
     def geotransform(self) -> List[float]:
         '''Return the six elements of the geotransform matrix of the dataset
@@ -167,71 +271,508 @@ class RasterDataset:
     def pixel_at_point(self, longitude: float, latitude: float) -> (int, int):
         '''Return the (row, column) indices of the pixel at the given geospatial
         coordinates if they are in the dataset coverage, and None otherwise.'''
-        fractional_column, fractional_row = self.inverse_affine * (longitude, latitude)
-        if self.pixel_in_coverage(fractional_row, fractional_column):
-            return int(fractional_row), int(fractional_column)
+        rows, columns, valid = self.pixels_at_points(longitude, latitude)
+        if valid:
+            return int(rows), int(columns)
         return None
 
+    def pixels_at_points(self, longitudes, latitudes) -> (numpy.ndarray, numpy.ndarray,
+                                                          numpy.ndarray):
+        '''Return arrays of the row and column indices of the pixels at each of the
+        given (longitude, latitude) coordinates, along with a boolean array that is
+        true where the point is within the dataset coverage.  The coordinate
+        arguments may be scalars or arrays of any shapes that broadcast together.
+        Indices of points outside the dataset coverage are set to -1.'''
+        longitudes, latitudes = numpy.broadcast_arrays(
+            numpy.asarray(longitudes, dtype=numpy.float64),
+            numpy.asarray(latitudes, dtype=numpy.float64))
+        inverse = self.inverse_affine
+        fractional_columns = inverse.a * longitudes + inverse.b * latitudes + inverse.c
+        fractional_rows = inverse.d * longitudes + inverse.e * latitudes + inverse.f
+        valid = ((0 <= fractional_columns) & (fractional_columns < self.cols) &
+                 (0 <= fractional_rows) & (fractional_rows < self.rows))
+        rows = numpy.where(valid, numpy.floor(fractional_rows), -1).astype(numpy.intp)
+        columns = numpy.where(valid, numpy.floor(fractional_columns), -1).astype(numpy.intp)
+        return rows, columns, valid
+
     def value_at_pixel(self, band_index: int, row: int, column: int):
         '''Return the value of the pixel with the given (row, column) indices.'''
+        if self._series_store is not None:
+            return self._series_store.value_at_pixel(band_index, row, column)
+        if self._array is None:
+            with self._gdal_lock:
+                band = self._gdal_dataset.GetRasterBand(band_index + 1)
+                return band.ReadAsArray(column, row, 1, 1)[0, 0]
         return self._array[band_index, row, column]
 
     def value_at_point(self, longitude: float, latitude: float, band_index: int):
         '''Return the value of the pixel with the given (longitude, latitude)
         coordinates in the specified band.'''
-        row, column = self.pixel_at_point(longitude, latitude)
+        row, column = self._covered_pixel_at_point(longitude, latitude)
         return self.value_at_pixel(band_index, row, column)
 
     def series_at_pixel(self, row: int, column: int, begin: int = None,
-                        end: int = None) -> numpy.ndarray:
+                        end: int = None, copy: bool = True,
+                        dtype=None, deadline: Deadline = None) -> numpy.ndarray:
         '''Return the values of the pixels with the given (row, column) indices
-        in the specified range of bands.'''
-        if begin is None:
-            begin = 0
-        if end is None:
-            end = self.bands
-        series_length = end - begin
-        series = numpy.empty(series_length)
-        for series_index in range(series_length):
-            series[series_index] = self._array[series_index + begin, row, column]
+        in the specified range of bands.  Values are returned in the native data
+        type of the dataset unless dtype is given.  If copy is false and no dtype
+        conversion is needed, a read-only view of the in-memory pixel values is
+        returned instead of a copy.  If a Deadline is given, values read directly
+        from the dataset are read in groups of SERIES_CHUNK_BANDS bands, and
+        DeadlineExceeded is raised with the values read so far as its partial
+        result if the deadline passes between groups.  The range of bands is
+        interpreted as a slice of the bands, however the values are read.'''
+        begin, end, _ = slice(begin, end).indices(self.bands)
+        if deadline is not None:
+            deadline.check()
+        if self._series_store is not None:
+            series = self._series_store.series_at_pixel(row, column, begin, end)
+        elif self._array is None:
+            series = self._read_series(row, column, begin, end, deadline)
+            return series if dtype is None else series.astype(dtype, copy=False)
+        else:
+            series = self._array[begin:end, row, column]
+        if copy or (dtype is not None and series.dtype != dtype):
+            return series.astype(series.dtype if dtype is None else dtype)
+        series = series.view()
+        series.flags.writeable = False
         return series
 
     def series_at_point(self, longitude: float, latitude: float,
-                        begin: int = None, end: int = None) -> numpy.ndarray:
+                        begin: int = None, end: int = None, copy: bool = True,
+                        dtype=None, deadline: Deadline = None) -> numpy.ndarray:
         '''Return the values of the pixels with the given (longitude, latitude)
         coordinates in the specified range of bands.'''
-        row, column = self.pixel_at_point(longitude, latitude)
-        return self.series_at_pixel(row, column, begin, end)
+        row, column = self._covered_pixel_at_point(longitude, latitude)
+        return self.series_at_pixel(row, column, begin, end, copy, dtype, deadline)
+
+    def series_at_points(self, longitudes, latitudes, begin: int = None,
+                         end: int = None, deadline: Deadline = None) -> numpy.ma.MaskedArray:
+        '''Return the values of the pixels at each of the given (longitude,
+        latitude) coordinates in the specified range of bands as a masked array
+        with one row per point and one column per band.  The rows for points
+        outside the dataset coverage are masked.  If a Deadline is given and it
+        passes after some but not all series are read, DeadlineExceeded is raised
+        with the masked array as its partial result, the rows of unread points masked.'''
+        rows, columns, _ = self.pixels_at_points(longitudes, latitudes)
+        return self.series_at_pixels(rows, columns, begin, end, deadline)
+
+    def series_at_pixels(self, rows, columns, begin: int = None, end: int = None,
+                         deadline: Deadline = None) -> numpy.ma.MaskedArray:
+        '''Return the values of the pixels with each of the given (row, column)
+        indices in the specified range of bands as a masked array with one row per
+        pixel and one column per band.  The rows for indices outside the dataset,
+        such as the indices of -1 that pixels_at_points returns for points outside
+        the dataset coverage, are masked.  The indices are flattened, so a scalar
+        row and column give one row.  The range of bands is interpreted as a slice of
+        the bands, so it is clipped to the bands of the dataset.  Deadlines are as
+        for series_at_points.'''
+        begin, end, _ = slice(begin, end).indices(self.bands)
+        if deadline is not None:
+            deadline.check()
+        rows = numpy.ravel(numpy.asarray(rows, dtype=numpy.intp))
+        columns = numpy.ravel(numpy.asarray(columns, dtype=numpy.intp))
+        valid = (0 <= rows) & (rows < self.rows) & (0 <= columns) & (columns < self.cols)
+        series_length = max(end - begin, 0)
+        if self._array is None:
+            values = numpy.zeros((len(rows), series_length), dtype=self._dtype)
+            for read_count, point_index in enumerate(numpy.flatnonzero(valid)):
+                if deadline is not None and read_count > 0 and deadline.expired():
+                    unread = valid.copy()
+                    unread[:point_index] = False
+                    mask = numpy.repeat((~valid | unread)[:, numpy.newaxis], series_length, axis=1)
+                    raise deadline.exceeded(numpy.ma.MaskedArray(values, mask=mask))
+                values[point_index] = self.series_at_pixel(rows[point_index],
+                                                           columns[point_index],
+                                                           begin, end, copy=False)
+        else:
+            # gather every series with one fancy-indexing operation, using pixel
+            # (0, 0) as a placeholder for indices outside the dataset
+            values = self._array[begin:end, numpy.where(valid, rows, 0),
+                                 numpy.where(valid, columns, 0)].T
+        mask = numpy.repeat(~valid[:, numpy.newaxis], series_length, axis=1)
+        return numpy.ma.MaskedArray(values, mask=mask)
+
+    def zonal_series(self, geometry: dict, begin: int = None, end: int = None,
+                     max_chunk_bytes: int = 64 * 1024 ** 2, mask_cache: MaskCache = None,
+                     deadline: Deadline = None) -> dict:
+        '''Return the per-band mean, minimum, maximum, and count of the values of
+        the pixels whose centers lie within the given GeoJSON Polygon or
+        MultiPolygon geometry, in the specified range of bands, as a dictionary of
+        arrays keyed by statistic name.  Pixels with missing values are excluded.
+        The geometry is rasterized once, and the window of pixels bounding it is
+        read in groups of bands holding at most max_chunk_bytes of pixel data.  If a
+        MaskCache is given, the rasterized geometry is taken from it when present.
+        If a Deadline is given and it passes between groups of bands,
+        DeadlineExceeded is raised with the statistics of the bands read so far
+        as its partial result.'''
+        if begin is None:
+            begin = 0
+        if end is None:
+            end = self.bands
+        if deadline is not None:
+            deadline.check()
+        window, indices = self._geometry_pixels(geometry, mask_cache)
+        if len(indices) == 0:
+            return masked_statistics(numpy.empty((max(end - begin, 0), 0)))
+
+        read = self._window_reader()
+        nodata = self.nodata
+        chunk = max(1, max_chunk_bytes // max(window[2] * window[3] * self._dtype.itemsize, 1))
+        statistics = [masked_statistics(numpy.empty((0, 0)))]
+        for band_begin in range(begin, end, chunk):
+            if deadline is not None and band_begin > begin and deadline.expired():
+                raise deadline.exceeded(_concatenate_statistics(statistics))
+            values = read(band_begin, min(band_begin + chunk, end), *window)
+            statistics.append(masked_statistics(
+                values.reshape(len(values), -1)[:, indices], nodata))
+
+        return _concatenate_statistics(statistics)
+
+    def iter_bands(self, begin: int = None, end: int = None, chunk: int = 1,
+                   prefetch: bool = False, deadline: Deadline = None
+                  ) -> Iterator[Tuple[int, numpy.ndarray]]:
+        '''Iterate over the specified range of bands in groups of at most chunk
+        bands, yielding for each group the index of its first band and a 3D array
+        of its pixel values.  Unless the pixel values are already held in memory,
+        each group is read from the dataset only when needed, so at most one group
+        is held in memory at a time, or two if prefetch is true, in which case the
+        next group is read on a background thread while the current one is used.
+        If a Deadline is given, it is checked before each group is read, and
+        DeadlineExceeded is raised from the iterator once it has passed.  A
+        ValueError is raised at once if chunk is not positive.'''
+        if chunk <= 0:
+            raise ValueError('The chunk of bands must be positive, not {}'.format(chunk))
+        if begin is None:
+            begin = 0
+        if end is None:
+            end = self.bands
+        windows = [(band_begin, min(band_begin + chunk, end), 0, 0, self.rows, self.cols)
+                   for band_begin in range(begin, end, chunk)]
+        return ((window[0], array) for window, array in
+                _read_ahead(self._window_reader(), windows, prefetch, deadline))
+
+    def iter_windows(self, block_shape: Tuple[int, int] = None, begin: int = None,
+                     end: int = None, prefetch: bool = False, deadline: Deadline = None
+                    ) -> Iterator[Tuple[int, int, numpy.ndarray]]:
+        '''Iterate over windows of (rows, columns) pixels covering the dataset,
+        yielding for each window the row and column indices of its northwest pixel
+        and a 3D array of its pixel values in the specified range of bands.  The
+        block shape defaults to the native block size of the dataset and is
+        otherwise rounded up to a multiple of it, so that every read is aligned
+        with the blocks of the dataset file.  Memory use, prefetching, and
+        deadlines are as for iter_bands.  A ValueError is raised at once if either
+        dimension of the block shape is not positive.'''
+        if begin is None:
+            begin = 0
+        if end is None:
+            end = self.bands
+        with self._gdal_lock:
+            native_columns, native_rows = self._gdal_dataset.GetRasterBand(1).GetBlockSize()
+        if block_shape is None:
+            block_shape = (native_rows, native_columns)
+        if block_shape[0] <= 0 or block_shape[1] <= 0:
+            raise ValueError('The block shape must be positive, not {}'.format(block_shape))
+        block_rows = -(-block_shape[0] // native_rows) * native_rows
+        block_columns = -(-block_shape[1] // native_columns) * native_columns
+        windows = [(begin, end, row, column,
+                    min(block_rows, self.rows - row), min(block_columns, self.cols - column))
+                   for row in range(0, self.rows, block_rows)
+                   for column in range(0, self.cols, block_columns)]
+        return ((window[2], window[3], array) for window, array in
+                _read_ahead(self._window_reader(), windows, prefetch, deadline))
 
     def read_band(self, band_index: int) -> numpy.ndarray:
         '''Return pixel values of one band of the dataset as a 2D numpy array.'''
+        if self._series_store is not None:
+            return self._series_store.read_band(band_index)
+        if self._array is None:
+            with self._gdal_lock:
+                band = self._gdal_dataset.GetRasterBand(band_index + 1)
+                return band.ReadAsArray()
         return self._array[band_index]
 
     def write_band(self, band_index: int, array: numpy.ndarray, nodata) -> None:
         '''Copy a 2D numpy array to the specified band of the dataset.'''
         band_number = band_index + 1
-        selected_band = self._gdal_dataset.GetRasterBand(band_number)
-        selected_band.WriteArray(array)
-        selected_band.SetNoDataValue(nodata)
-        selected_band.FlushCache()
+        with self._gdal_lock:
+            selected_band = self._gdal_dataset.GetRasterBand(band_number)
+            selected_band.WriteArray(array)
+            selected_band.SetNoDataValue(nodata)
+            selected_band.FlushCache()
+            self._write_band_to_array(band_index, array)
+
+    def write_bands(self, bands: Iterable[numpy.ndarray], nodata=None,
+                    begin: int = 0) -> None:
+        '''Copy a sequence of 2D numpy arrays, e.g. a 3D numpy array or a generator
+        of 2D arrays, to consecutive bands of the dataset starting at band index
+        begin, and flush the dataset to disk once after all bands are written.
+        The bands are consumed one at a time, so a generator need never hold more
+        than one band in memory, and each band is taken from the sequence before the
+        dataset is locked, so a generator may read from the dataset itself.'''
+        for band_index, array in enumerate(bands, begin):
+            with self._gdal_lock:
+                selected_band = self._gdal_dataset.GetRasterBand(band_index + 1)
+                selected_band.WriteArray(array)
+                if nodata is not None:
+                    selected_band.SetNoDataValue(nodata)
+                self._write_band_to_array(band_index, array)
+        self.flush()
 
     def write_pixel(self, band_index: int, row: int, column: int, value) -> None:
-        '''Write value to one pixel of the dataset.'''
-        band_number = band_index + 1
-        selected_band = self._gdal_dataset.GetRasterBand(band_number)
-        array = selected_band.ReadAsArray()
-        array[row, column] = value
-        selected_band.WriteArray(array)
-        selected_band.FlushCache()
+        '''Write value to one pixel of the dataset, raising an IndexError if the
+        pixel is outside the dataset.'''
+        self._check_pixel_indexes(numpy.array([band_index]), numpy.array([row]),
+                                  numpy.array([column]))
+        with self._gdal_lock:
+            selected_band = self._gdal_dataset.GetRasterBand(band_index + 1)
+            selected_band.WriteArray(numpy.array([[value]]), int(column), int(row))
+            self._write_pixels_to_array(numpy.array([band_index]), numpy.array([row]),
+                                        numpy.array([column]), numpy.array([value]))
+
+    def write_pixels(self, band_index, rows, columns, values) -> None:
+        '''Write values to many pixels of the dataset.  The band, row, and column
+        indices and the values may be scalars or arrays that broadcast together.
+        The updates are grouped by band and by the native blocks of the dataset,
+        so that each block containing updated pixels is read and written once.  The
+        values are converted to the pixel type of the dataset as GDAL converts them
+        before they are written, so the in-memory pixel values are updated from the
+        blocks written.  An IndexError is raised, and no pixel written, if any pixel
+        is outside the dataset.'''
+        band_indexes, rows, columns, values = (
+            numpy.ravel(array) for array in numpy.broadcast_arrays(
+                numpy.asarray(band_index, dtype=numpy.intp), numpy.asarray(rows, dtype=numpy.intp),
+                numpy.asarray(columns, dtype=numpy.intp), numpy.asarray(values)))
+        if len(values) == 0:
+            return
+        self._check_pixel_indexes(band_indexes, rows, columns)
+
+        with self._gdal_lock:
+            block_columns, block_rows = self._gdal_dataset.GetRasterBand(1).GetBlockSize()
+
+            # order the updates by band and block, preserving the order of updates
+            # within each block so that the last value written to a pixel wins
+            block_keys = numpy.stack([band_indexes, rows // block_rows, columns // block_columns])
+            order = numpy.lexsort(block_keys[::-1])
+            _, group_starts = numpy.unique(block_keys[:, order], axis=1, return_index=True)
+
+            for group in numpy.split(order, group_starts[1:]):
+                self._write_block_pixels(int(band_indexes[group[0]]),
+                                         int(rows[group[0]] // block_rows) * block_rows,
+                                         int(columns[group[0]] // block_columns) * block_columns,
+                                         (block_rows, block_columns),
+                                         rows[group], columns[group], values[group])
 
     def flush(self) -> None:
-        '''Flush any changes in the dataset to the file on disk and reopen it.'''
-        self._gdal_dataset.FlushCache()
-        self._gdal_dataset = gdal.Open(self.filename, gdal.GA_Update)
-        self._array = self._gdal_dataset.ReadAsArray()
+        '''Flush any changes in the dataset to the file on disk.  Pixel values held
+        in memory were updated as they were written, converted to the pixel type of
+        the dataset as GDAL converts them, so no pixel values are reread.  Pixel
+        values mapped into memory from the dataset file show the values written only
+        once they are flushed to the file.'''
+        with self._gdal_lock:
+            self._gdal_dataset.FlushCache()
+            if (self._series_store is not None or self.shared) and self._stale:
+                # the store or the shared values no longer match the dataset file
+                self._load_array()
+            self._stale = False
+
+    def close(self) -> None:
+        '''Flush the dataset and close its file and its series store, if any, and
+        release the pixel values held in memory.  The dataset must not be used
+        afterwards.'''
+        with self._gdal_lock:
+            self._gdal_dataset.FlushCache()
+            self._close_series_store()
+            self._array = None
+            self._shared_array = None
+            self._gdal_dataset = None
+
+    def _close_series_store(self) -> None:
+        '''Close the series store of the dataset, if any, and stop using it.'''
+        if self._series_store is not None:
+            self._series_store.close()
+            self._series_store = None
+
+    def _load_array(self) -> None:
+        '''Attach to the shared pixel values of the dataset if they can be found, or
+        else open the series store for the dataset if there is one, and otherwise read
+        or map the pixel values of the dataset into memory unless the dataset is lazy.'''
+        self._close_series_store()
+        self._array = None
+        self._shared_array = None
+        if self._shared_memory and self.filename is not None:
+            self._shared_array = _attach_shared_array(self.filename, self.shape)
+            if self._shared_array is not None:
+                self._array = self._shared_array.array
+                return
+        if self._use_series_store:
+            self._series_store = open_series_store(self.filename)
+            if self._series_store is not None and self._series_store.shape != self.shape:
+                self._close_series_store()
+        if self._lazy or self._series_store is not None:
+            return
+        if self._memory_map:
+            self._array = _memory_map_array(self._gdal_dataset, self.filename)
+        if self._array is None:
+            self._array = self._gdal_dataset.ReadAsArray()
+            if self._array.ndim == 2:
+                # GDAL reads single-band datasets as 2D arrays
+                self._array = self._array[numpy.newaxis]
+
+    def _write_block_pixels(self, band_index: int, yoff: int, xoff: int,
+                            block_shape: Tuple[int, int], rows: numpy.ndarray,
+                            columns: numpy.ndarray, values: numpy.ndarray) -> None:
+        '''Write values to pixels of the native block of the given band whose
+        northwest pixel is at (yoff, xoff), reading and writing the block once, and
+        update the in-memory pixel values of the block or mark the dataset stale.
+        Must be called while holding the GDAL lock.'''
+        ysize = min(block_shape[0], self.rows - yoff)
+        xsize = min(block_shape[1], self.cols - xoff)
+        selected_band = self._gdal_dataset.GetRasterBand(band_index + 1)
+        block = selected_band.ReadAsArray(xoff, yoff, xsize, ysize)
+        block[rows - yoff, columns - xoff] = _convert_pixel_values(values, block.dtype)[0]
+        selected_band.WriteArray(block, xoff, yoff)
+        if self._array_is_writeable():
+            self._array[band_index, yoff:yoff + ysize, xoff:xoff + xsize] = block
+        else:
+            self._stale = True
+
+    def _write_band_to_array(self, band_index: int, array: numpy.ndarray) -> None:
+        '''Copy a band just written to the dataset to the in-memory pixel values,
+        converted to the pixel type of the dataset as GDAL converts them, or mark the
+        dataset stale if its values are not held in a writeable array.  Must be called
+        while holding the GDAL lock.'''
+        if not self._array_is_writeable():
+            self._stale = True
+            return
+        converted, uncertain = _convert_pixel_values(array, self._array.dtype)
+        self._array[band_index] = converted
+        if uncertain.any():
+            rows, columns = numpy.nonzero(uncertain)
+            self._reread_pixels(numpy.full(len(rows), band_index), rows, columns)
+
+    def _write_pixels_to_array(self, band_indexes: numpy.ndarray, rows: numpy.ndarray,
+                               columns: numpy.ndarray, values: numpy.ndarray) -> None:
+        '''Copy pixel values just written to the dataset to the in-memory pixel
+        values, converted to the pixel type of the dataset as GDAL converts them, or
+        mark the dataset stale if the values are not held in a writeable array.
+        Must be called while holding the GDAL lock.'''
+        if not self._array_is_writeable():
+            self._stale = True
+            return
+        converted, uncertain = _convert_pixel_values(values, self._array.dtype)
+        self._array[band_indexes, rows, columns] = converted
+        if uncertain.any():
+            self._reread_pixels(band_indexes[uncertain], rows[uncertain], columns[uncertain])
+
+    def _reread_pixels(self, band_indexes: numpy.ndarray, rows: numpy.ndarray,
+                       columns: numpy.ndarray) -> None:
+        '''Reread pixel values just written from the dataset into the in-memory
+        pixel values.  GDAL reads them from its block cache without flushing them to
+        disk.  Must be called while holding the GDAL lock.'''
+        for band_index, row, column in zip(band_indexes, rows, columns):
+            self._array[band_index, row, column] = self._gdal_dataset.GetRasterBand(
+                int(band_index) + 1).ReadAsArray(int(column), int(row), 1, 1)[0, 0]
+
+    def _check_pixel_indexes(self, band_indexes: numpy.ndarray, rows: numpy.ndarray,
+                             columns: numpy.ndarray) -> None:
+        '''Raise an IndexError if any of the given band, row, or column indices is
+        negative or beyond the last band, row, or column of the dataset.'''
+        for name, indexes, count in (('band', band_indexes, self.bands),
+                                     ('row', rows, self.rows), ('column', columns, self.cols)):
+            outside = (indexes < 0) | (indexes >= count)
+            if outside.any():
+                raise IndexError('The {name} index {index} is outside the {count} {name}s '
+                                 'of {dataset}'.format(name=name, index=indexes[outside][0],
+                                                       count=count, dataset=self))
+
+    def _array_is_writeable(self) -> bool:
+        '''Return true if pixel values are held in memory in an array that must be
+        updated when pixel values are written to the dataset.'''
+        return self._array is not None and not self.memory_mapped and not self.shared
+
+    def _covered_pixel_at_point(self, longitude: float, latitude: float) -> (int, int):
+        '''Return the (row, column) indices of the pixel at the given geospatial
+        coordinates, raising a ValueError if they are outside the dataset coverage.'''
+        pixel = self.pixel_at_point(longitude, latitude)
+        if pixel is None:
+            raise ValueError('The point ({}, {}) is outside the coverage of {}'.format(
+                longitude, latitude, self))
+        return pixel
+
+    @property
+    def _dtype(self) -> numpy.dtype:
+        '''Return the numpy data type corresponding to the pixel type of the dataset.'''
+        with self._gdal_lock:
+            data_type = self._gdal_dataset.GetRasterBand(1).DataType
+        return numpy.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(data_type))
+
+    def _geometry_pixels(self, geometry: dict, mask_cache: MaskCache = None):
+        '''Return the window of the dataset bounding a GeoJSON geometry as the 4-tuple
+        (row, column, rows, columns) along with the indices of the pixels within the
+        geometry in the flattened window, taken from the MaskCache if given.'''
+        if mask_cache is not None:
+            window, _, indices = mask_cache.get(geometry, self.geotransform,
+                                                (self.rows, self.cols))
+            return window, indices
+        window, mask = rasterize_geometry(geometry, self.geotransform, (self.rows, self.cols))
+        return window, numpy.flatnonzero(mask)
+
+    def _window_reader(self):
+        '''Return a function that takes the same arguments as _read_window and
+        returns the pixel values of the window, as a view of the in-memory pixel
+        values if there are any and otherwise read from the dataset.'''
+        if self._array is None:
+            return self._read_window
+        return lambda begin, end, row, column, rows, columns: \
+            self._array[begin:end, row:row + rows, column:column + columns]
+
+    def _read_series(self, row: int, column: int, begin: int, end: int,
+                     deadline: Deadline = None) -> numpy.ndarray:
+        '''Read the values of one pixel in the specified range of bands directly
+        from the dataset, returning them in the native data type of the dataset.
+        If a Deadline is given, the bands are read in groups, checking the
+        deadline between groups.'''
+        if deadline is None:
+            return self._read_window(begin, end, row, column, 1, 1).reshape(-1)
+        chunks = [self._read_window(begin, begin, row, column, 1, 1).reshape(-1)]
+        for band_begin in range(begin, end, SERIES_CHUNK_BANDS):
+            if band_begin > begin and deadline.expired():
+                raise deadline.exceeded(numpy.concatenate(chunks))
+            chunks.append(self._read_window(band_begin, min(band_begin + SERIES_CHUNK_BANDS, end),
+                                            row, column, 1, 1).reshape(-1))
+        return numpy.concatenate(chunks)
+
+    def _read_window(self, begin: int, end: int, row: int, column: int,
+                     rows: int, columns: int) -> numpy.ndarray:
+        '''Read the values of a window of pixels in the specified range of bands
+        directly from the dataset, returning them as a 3D array in the native
+        data type of the dataset.  The range of bands is interpreted as a slice of
+        the bands, as it is when the pixel values are held in memory.'''
+        begin, end, _ = slice(begin, end).indices(self.bands)
+        with self._gdal_lock:
+            data_type = self._gdal_dataset.GetRasterBand(1).DataType
+            dtype = gdal_array.GDALTypeCodeToNumericTypeCode(data_type)
+            if end <= begin:
+                return numpy.empty((0, rows, columns), dtype=dtype)
+            buffer = self._gdal_dataset.ReadRaster(column, row, columns, rows,
+                                                   buf_type=data_type,
+                                                   band_list=list(range(begin + 1, end + 1)))
+        return numpy.frombuffer(bytearray(buffer), dtype=dtype).reshape(end - begin, rows, columns)
 
 # Private helper methods
 
+def _attach_shared_array(path: str, shape: Tuple[int]) -> SharedArray:
+    '''Return the complete shared array holding the pixel values of the current
+    version of the dataset file at path if there is one with the given shape, and
+    None otherwise.'''
+    shared_array = SharedArray.attach(shared_array_name(path))
+    if shared_array is not None and shared_array.array.shape != shape:
+        shared_array.close()
+        return None
+    return shared_array
+
 def _get_gdal_dataset_for_argument(dataset, access=gdal.GA_Update) -> (gdal.Dataset, str):
     '''Examine the dataset argument and return, as a tuple, the corresponding gdal.Dataset object
     and the path to the dataset file if known.'''
@@ -258,3 +799,162 @@ def _get_gdal_dataset_for_argument(dataset, access=gdal.GA_Update) -> (gdal.Data
                         'representing the path to a datafile.')
 
     return  gdal_dataset, gdal_dataset_path
+
+def _read_ahead(read, windows: List[tuple], prefetch: bool,
+                deadline: Deadline = None) -> Iterator[tuple]:
+    '''Yield each window along with the result of calling read with the window as
+    arguments.  If prefetch is true, each window is read on a background thread
+    while the result for the previous window is being consumed.  If a Deadline is
+    given, it is checked before each window is read.'''
+    if not prefetch:
+        for window in windows:
+            if deadline is not None:
+                deadline.check()
+            yield window, read(*window)
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        for window in windows:
+            if deadline is not None:
+                deadline.check()
+            future = executor.submit(read, *window)
+            if pending is not None:
+                yield pending[0], pending[1].result()
+            pending = (window, future)
+        if pending is not None:
+            yield pending[0], pending[1].result()
+
+def _concatenate_statistics(statistics: List[dict]) -> dict:
+    '''Concatenate the per-band statistics of consecutive groups of bands.'''
+    return {name: numpy.concatenate([group_statistics[name] for group_statistics in statistics])
+            for name in statistics[0]}
+
+def _convert_pixel_values(values, dtype: numpy.dtype) -> (numpy.ndarray, numpy.ndarray):
+    '''Return values converted to the given pixel type as GDAL converts values
+    written to a dataset, i.e. rounded to the nearest integer and clamped to the
+    range of an integer type, along with a boolean mask of the values that GDAL may
+    convert differently, which are NaNs, values halfway between two integers, and
+    values out of range, or all values of types whose conversion is not mirrored.'''
+    values = numpy.asarray(values)
+    dtype = numpy.dtype(dtype)
+    exact = numpy.zeros(values.shape, dtype=bool)
+    if numpy.can_cast(values.dtype, dtype, 'safe'):
+        return values.astype(dtype), exact
+    if dtype.kind in 'iu' and values.dtype.kind in 'biu':
+        info = numpy.iinfo(dtype)
+        return numpy.clip(values, info.min, info.max).astype(dtype), exact
+    if dtype.kind in 'iu' and values.dtype.kind == 'f':
+        info = numpy.iinfo(dtype)
+        with numpy.errstate(invalid='ignore'):
+            rounded = numpy.trunc(values + numpy.copysign(0.5, values))
+            uncertain = (numpy.isnan(values) | (numpy.abs(values - numpy.trunc(values)) == 0.5) |
+                         (rounded < info.min) | (rounded > info.max))
+        return numpy.clip(numpy.nan_to_num(rounded), info.min, info.max).astype(dtype), uncertain
+    if dtype.kind == 'f' and values.dtype.kind in 'biuf':
+        with numpy.errstate(over='ignore'):
+            converted = values.astype(dtype)
+        return converted, numpy.isinf(converted) & numpy.isfinite(values)
+    with numpy.errstate(all='ignore'):
+        return values.astype(dtype), ~exact
+
+def _memory_map_array(gdal_dataset: gdal.Dataset, path: str) -> numpy.memmap:
+    '''Return a read-only numpy.memmap of the pixel values in the dataset file with
+    shape (bands, rows, columns) if the values are stored uncompressed,
+    band-sequential, and contiguously in a GeoTIFF or ENVI file, and None otherwise.'''
+    if path is None or gdal_dataset.RasterCount == 0:
+        return None
+
+    image_structure = gdal_dataset.GetMetadata('IMAGE_STRUCTURE')
+    if (image_structure.get('COMPRESSION', 'NONE') != 'NONE' or
+            image_structure.get('INTERLEAVE', 'BAND') != 'BAND'):
+        return None
+
+    # all bands must share one pixel type for the file to be mapped as one array
+    data_types = {gdal_dataset.GetRasterBand(band_number).DataType
+                  for band_number in range(1, gdal_dataset.RasterCount + 1)}
+    if len(data_types) != 1:
+        return None
+    dtype = numpy.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(data_types.pop()))
+
+    driver = gdal_dataset.GetDriver().ShortName
+    if driver == 'GTiff':
+        layout = _geotiff_layout(gdal_dataset, path, dtype.itemsize)
+    elif driver == 'ENVI':
+        layout = _envi_layout(gdal_dataset)
+    else:
+        layout = None
+    if layout is None:
+        return None
+    offset, byte_order = layout
+
+    shape = (gdal_dataset.RasterCount, gdal_dataset.RasterYSize, gdal_dataset.RasterXSize)
+    if os.path.getsize(path) < offset + numpy.prod(shape) * dtype.itemsize:
+        return None
+    return numpy.memmap(path, dtype=dtype.newbyteorder(byte_order), mode='r',
+                        offset=offset, shape=shape)
+
+def _geotiff_layout(gdal_dataset: gdal.Dataset, path: str, itemsize: int) -> (int, str):
+    '''Return the file offset of the first pixel and the byte order of the pixel values
+    in a striped GeoTIFF file if every strip of every band is stored in full, right
+    after the previous strip, and None otherwise.'''
+    block_columns, block_rows = gdal_dataset.GetRasterBand(1).GetBlockSize()
+    if block_columns != gdal_dataset.RasterXSize:
+        return None
+    offset = _contiguous_strips_offset(gdal_dataset, block_rows, itemsize)
+    if offset is None:
+        return None
+
+    with open(path, 'rb') as tiff_file:
+        byte_order = {b'II': '<', b'MM': '>'}.get(tiff_file.read(2))
+    if byte_order is None:
+        return None
+    return offset, byte_order
+
+def _contiguous_strips_offset(gdal_dataset: gdal.Dataset, block_rows: int,
+                              itemsize: int) -> int:
+    '''Return the file offset of the first strip of a striped GeoTIFF file if every
+    strip of every band is stored in full, right after the previous strip, and None
+    otherwise.'''
+    def strip_item(band, name, strip_index):
+        item = band.GetMetadataItem('BLOCK_{}_0_{}'.format(name, strip_index), 'TIFF')
+        return None if item is None else int(item)
+
+    # check the offset and size of every strip, as a strip missing from a sparse
+    # file or rewritten elsewhere in the file would otherwise be mapped wrongly
+    row_bytes = gdal_dataset.RasterXSize * itemsize
+    band_bytes = gdal_dataset.RasterYSize * row_bytes
+    offset = strip_item(gdal_dataset.GetRasterBand(1), 'OFFSET', 0)
+    if offset is None:
+        return None
+    for band_number in range(1, gdal_dataset.RasterCount + 1):
+        band = gdal_dataset.GetRasterBand(band_number)
+        for strip_index, row in enumerate(range(0, gdal_dataset.RasterYSize, block_rows)):
+            strip_offset = offset + (band_number - 1) * band_bytes + row * row_bytes
+            strip_rows = min(block_rows, gdal_dataset.RasterYSize - row)
+            if (strip_item(band, 'OFFSET', strip_index) != strip_offset or
+                    strip_item(band, 'SIZE', strip_index) != strip_rows * row_bytes):
+                return None
+    return offset
+
+def _envi_layout(gdal_dataset: gdal.Dataset) -> (int, str):
+    '''Return the file offset of the first pixel and the byte order of the pixel values
+    in a band-sequential ENVI file as recorded in its header file, or None if the
+    header cannot be found.'''
+    header_paths = [path for path in gdal_dataset.GetFileList() or []
+                    if path.lower().endswith('.hdr')]
+    if not header_paths:
+        return None
+
+    header = {}
+    with open(header_paths[0]) as header_file:
+        for line in header_file:
+            key, separator, value = line.partition('=')
+            if separator:
+                header[key.strip().lower()] = value.strip()
+    if header.get('interleave', 'bsq').lower() != 'bsq':
+        return None
+
+    offset = int(header.get('header offset', '0'))
+    byte_order = '>' if header.get('byte order', '0') == '1' else '<'
+    return offset, byte_order
@@ -0,0 +1,270 @@
+'''Alternative on-disk layouts of raster datasets optimized for reading timeseries.'''
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+
+import numpy
+
+# Suffix appended to the path of a dataset file to name its series-major store
+SERIES_MAJOR_SUFFIX = '.series.npy'
+
+# Suffix appended to the path of a dataset file to name its chunked series store
+CHUNKED_SUFFIX = '.series.npz'
+
+# Default bound on the bytes of decompressed chunks cached by a chunked series store
+CHUNK_CACHE_BYTES = 256 * 1024 ** 2
+
+class SeriesMajorStore:
+    '''Read-only store of the pixel values of a raster dataset laid out with the
+    band axis innermost, as a C-contiguous (rows, columns, bands) array in a .npy
+    file, so that the full series of any one pixel occupies one contiguous run of
+    bytes on disk.  The store should be closed when no longer needed, e.g. by
+    using it as a context manager.'''
+
+    @staticmethod
+    def write(raster_dataset, path: str = None,
+              max_chunk_bytes: int = 64 * 1024 ** 2) -> 'SeriesMajorStore':
+        '''Write the pixel values of a RasterDataset to a new series-major store at
+        path, or beside the dataset file if path is None, and return the store.
+        Bands are copied in groups holding at most max_chunk_bytes of pixel data.'''
+        if path is None:
+            path = series_major_path(raster_dataset.filename)
+
+        dtype = raster_dataset.read_band(0).dtype
+        array = numpy.lib.format.open_memmap(
+            path, mode='w+', dtype=dtype,
+            shape=(raster_dataset.rows, raster_dataset.cols, raster_dataset.bands))
+
+        band_bytes = raster_dataset.rows * raster_dataset.cols * dtype.itemsize
+        chunk_bands = max(1, max_chunk_bytes // max(band_bytes, 1))
+        for begin in range(0, raster_dataset.bands, chunk_bands):
+            end = min(begin + chunk_bands, raster_dataset.bands)
+            array[:, :, begin:end] = numpy.stack(
+                [raster_dataset.read_band(band_index) for band_index in range(begin, end)],
+                axis=-1)
+
+        array.flush()
+        del array
+        return SeriesMajorStore(path)
+
+    def __init__(self, path: str):
+        '''Open the series-major store at path by mapping it into memory read-only.'''
+        self.path = path
+        self._array = numpy.load(path, mmap_mode='r')
+
+    def __repr__(self):
+        return "SeriesMajorStore('{}')".format(os.path.basename(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        '''Release the mapping of the store into memory once no views of the values
+        returned by the store remain.'''
+        self._array = None
+
+    @property
+    def shape(self) -> (int, int, int):
+        '''Return the dimensions of the stored dataset as the 3-tuple (bands, rows, columns).'''
+        rows, columns, bands = self._array.shape
+        return bands, rows, columns
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        '''Return the data type of the stored pixel values.'''
+        return self._array.dtype
+
+    def value_at_pixel(self, band_index: int, row: int, column: int):
+        '''Return the value of the pixel with the given (row, column) indices.'''
+        return self._array[row, column, band_index]
+
+    def series_at_pixel(self, row: int, column: int, begin: int, end: int) -> numpy.ndarray:
+        '''Return a read-only view of the values of the pixel with the given
+        (row, column) indices in the specified range of bands.'''
+        return self._array[row, column, begin:end]
+
+    def read_band(self, band_index: int) -> numpy.ndarray:
+        '''Return the pixel values of one band as a 2D numpy array.'''
+        return numpy.ascontiguousarray(self._array[:, :, band_index])
+
+    def chunk(self, row: int, column: int, size: int) -> numpy.ndarray:
+        '''Return a copy of the values of all bands in the tile of at most size by
+        size pixels whose northwest pixel has the given (row, column) indices.'''
+        return numpy.array(self._array[row:row + size, column:column + size, :])
+
+class ChunkedSeriesStore:
+    '''Read-only store of the pixel values of a raster dataset divided into tiles
+    spanning all bands, each tile compressed separately and laid out with the band
+    axis innermost.  The store is a NumPy .npz archive holding one member per tile,
+    so only the tile containing a requested pixel is decompressed.  Recently used
+    tiles are kept decompressed in a cache bounded by bytes.  The store should be
+    closed when no longer needed, e.g. by using it as a context manager.'''
+    # pylint: disable=too-many-instance-attributes
+
+    @staticmethod
+    def write(raster_dataset, path: str = None, chunk_size: int = 64,
+              max_cache_bytes: int = CHUNK_CACHE_BYTES) -> 'ChunkedSeriesStore':
+        '''Write the pixel values of a RasterDataset to a new chunked store at path,
+        or beside the dataset file if path is None, using tiles of chunk_size by
+        chunk_size pixels, and return the store.'''
+        if path is None:
+            path = chunked_path(raster_dataset.filename)
+
+        # stage the values in a temporary series-major store so that each tile can
+        # be copied out of it without holding the whole dataset in memory
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as temp_dir:
+            staging_store = SeriesMajorStore.write(raster_dataset,
+                                                   os.path.join(temp_dir, 'staging.npy'))
+            bands, rows, columns = staging_store.shape
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                _write_member(archive, 'shape', numpy.array([bands, rows, columns]))
+                _write_member(archive, 'chunk_size', numpy.array(chunk_size))
+                for row in range(0, rows, chunk_size):
+                    for column in range(0, columns, chunk_size):
+                        name = _chunk_name(row // chunk_size, column // chunk_size)
+                        _write_member(archive, name, staging_store.chunk(row, column, chunk_size))
+            del staging_store
+
+        return ChunkedSeriesStore(path, max_cache_bytes)
+
+    def __init__(self, path: str, max_cache_bytes: int = CHUNK_CACHE_BYTES):
+        '''Open the chunked store at path, caching at most max_cache_bytes bytes
+        of decompressed tiles.'''
+        self.path = path
+        self.max_cache_bytes = max_cache_bytes
+        self._archive = numpy.load(path)
+        self._shape = tuple(int(size) for size in self._archive['shape'])
+        self._chunk_size = int(self._archive['chunk_size'])
+        self._chunks = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self._dtype = self._chunk(0, 0).dtype
+
+    def __repr__(self):
+        return "ChunkedSeriesStore('{}')".format(os.path.basename(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        '''Close the archive holding the tiles and empty the cache of tiles.'''
+        with self._lock:
+            self._archive.close()
+            self._chunks.clear()
+            self._cache_bytes = 0
+
+    @property
+    def shape(self) -> (int, int, int):
+        '''Return the dimensions of the stored dataset as the 3-tuple (bands, rows, columns).'''
+        return self._shape
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        '''Return the data type of the stored pixel values.'''
+        return self._dtype
+
+    @property
+    def cache_bytes(self) -> int:
+        '''Return the bytes of decompressed tiles currently cached.'''
+        with self._lock:
+            return self._cache_bytes
+
+    def value_at_pixel(self, band_index: int, row: int, column: int):
+        '''Return the value of the pixel with the given (row, column) indices.'''
+        chunk = self._chunk(row // self._chunk_size, column // self._chunk_size)
+        return chunk[row % self._chunk_size, column % self._chunk_size, band_index]
+
+    def series_at_pixel(self, row: int, column: int, begin: int, end: int) -> numpy.ndarray:
+        '''Return a read-only view of the values of the pixel with the given
+        (row, column) indices in the specified range of bands.'''
+        chunk = self._chunk(row // self._chunk_size, column // self._chunk_size)
+        return chunk[row % self._chunk_size, column % self._chunk_size, begin:end]
+
+    def read_band(self, band_index: int) -> numpy.ndarray:
+        '''Return the pixel values of one band as a 2D numpy array.'''
+        _, rows, columns = self._shape
+        band = numpy.empty((rows, columns), dtype=self._dtype)
+        for row in range(0, rows, self._chunk_size):
+            for column in range(0, columns, self._chunk_size):
+                chunk = self._chunk(row // self._chunk_size, column // self._chunk_size)
+                band[row:row + chunk.shape[0], column:column + chunk.shape[1]] = \
+                    chunk[:, :, band_index]
+        return band
+
+    def _chunk(self, chunk_row: int, chunk_column: int) -> numpy.ndarray:
+        '''Return the decompressed tile with the given indices, from the cache if present.'''
+        key = (chunk_row, chunk_column)
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+                return chunk
+
+        # decompress the tile without holding the lock so that tiles are read in
+        # parallel, accepting that threads missing the same tile at once each
+        # decompress it
+        chunk = self._archive[_chunk_name(chunk_row, chunk_column)]
+        chunk.flags.writeable = False
+
+        with self._lock:
+            cached_chunk = self._chunks.get(key)
+            if cached_chunk is not None:
+                self._chunks.move_to_end(key)
+                return cached_chunk
+            self._chunks[key] = chunk
+            self._cache_bytes += chunk.nbytes
+
+            # evict least recently used tiles, always keeping the one just read
+            while len(self._chunks) > 1 and self._cache_bytes > self.max_cache_bytes:
+                _, evicted = self._chunks.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+            return chunk
+
+def series_major_path(dataset_path: str) -> str:
+    '''Return the path of the series-major store for the given dataset file.'''
+    return dataset_path + SERIES_MAJOR_SUFFIX
+
+def chunked_path(dataset_path: str) -> str:
+    '''Return the path of the chunked series store for the given dataset file.'''
+    return dataset_path + CHUNKED_SUFFIX
+
+def open_series_store(dataset_path: str):
+    '''Return a store of the dataset file at dataset_path in a layout optimized for
+    reading timeseries if one exists beside the file and is at least as recent as
+    the file, and None otherwise.  A series-major store is preferred over a
+    chunked store when both exist.'''
+    if dataset_path is None:
+        return None
+    store_path = series_major_path(dataset_path)
+    if _is_current(store_path, dataset_path):
+        return SeriesMajorStore(store_path)
+    store_path = chunked_path(dataset_path)
+    if _is_current(store_path, dataset_path):
+        return ChunkedSeriesStore(store_path)
+    return None
+
+# Private helper methods
+
+def _is_current(store_path: str, dataset_path: str) -> bool:
+    '''Return true if a store exists at store_path and was modified no earlier
+    than the dataset file at dataset_path.'''
+    try:
+        return os.stat(store_path).st_mtime_ns >= os.stat(dataset_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def _chunk_name(chunk_row: int, chunk_column: int) -> str:
+    return 'chunk_{}_{}'.format(chunk_row, chunk_column)
+
+def _write_member(archive: zipfile.ZipFile, name: str, array: numpy.ndarray) -> None:
+    '''Write an array to a member of a .npz archive so that numpy.load can read it.'''
+    with archive.open(name + '.npy', 'w', force_zip64=True) as member:
+        numpy.lib.format.write_array(member, array, allow_pickle=False)
@@ -0,0 +1,170 @@
+'''Pixel values of raster datasets shared among processes through shared memory.'''
+import hashlib
+import json
+import os
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy
+
+# Prefix of the names of the shared memory segments holding pixel values
+SEGMENT_PREFIX = 'skope_'
+
+# Bytes reserved at the start of each segment for a header describing the array,
+# keeping the pixel values page-aligned.  The first byte of the header is set once
+# the array is complete and is followed by a JSON description of the array.
+HEADER_BYTES = 4096
+
+class SharedArray:
+    '''Array of pixel values held in a named shared memory segment, preceded by a
+    header recording its data type and shape, so that any process knowing the name
+    of the segment can attach to it as a read-only numpy array without copying,
+    once the creating process has filled the array and marked it complete.'''
+
+    @staticmethod
+    def create(name: str, dtype, shape) -> 'SharedArray':
+        '''Create a new zero-filled segment with the given name holding an array of
+        the given data type and shape, and return a SharedArray whose array is
+        writeable so that it can be filled by the creating process.  Other processes
+        cannot attach to the segment until it is marked complete.'''
+        dtype = numpy.dtype(dtype)
+        header = json.dumps({'dtype': dtype.str, 'shape': list(shape)}).encode('ascii')
+        nbytes = int(numpy.prod(shape)) * dtype.itemsize
+        segment = shared_memory.SharedMemory(name, create=True,
+                                             size=HEADER_BYTES + max(nbytes, 1))
+        segment.buf[1:1 + len(header)] = header
+        return SharedArray(segment, dtype, shape, owner=True)
+
+    @staticmethod
+    def attach(name: str) -> 'SharedArray':
+        '''Attach to the existing segment with the given name and return a
+        SharedArray holding a read-only view of its array, or None if there is no
+        such segment or if its array is not yet complete.'''
+        try:
+            segment = _attach_segment(name)
+        except (FileNotFoundError, ValueError):
+            # a segment that has just been created may not have been sized yet
+            return None
+        if segment.size < HEADER_BYTES or segment.buf[0] != 1:
+            segment.close()
+            return None
+        header = json.loads(bytes(segment.buf[1:HEADER_BYTES]).rstrip(b'\0'))
+        return SharedArray(segment, numpy.dtype(header['dtype']), tuple(header['shape']))
+
+    def __init__(self, segment: shared_memory.SharedMemory, dtype: numpy.dtype, shape,
+                 owner: bool = False):
+        '''Initialize a SharedArray viewing the array in the given segment.  Only
+        the owner of a segment, i.e. the process that created it, may write to the
+        array or unlink the segment.'''
+        self.name = segment.name
+        self.owner = owner
+        self._segment = segment
+        self.array = numpy.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=HEADER_BYTES)
+        self.array.flags.writeable = owner
+
+    def __repr__(self):
+        return "SharedArray('{}')".format(self.name)
+
+    @property
+    def nbytes(self) -> int:
+        '''Return the number of bytes of pixel values in the segment.'''
+        return self.array.nbytes
+
+    def mark_complete(self) -> None:
+        '''Make the array read-only and allow other processes to attach to it.  Only
+        the owner of the segment may mark it complete, once it has filled the array.'''
+        self.array.flags.writeable = False
+        self._segment.buf[0] = 1
+
+    def close(self) -> None:
+        '''Detach from the segment, unlinking it if this process owns it.  The
+        array must not be used afterwards.'''
+        self.array = None
+        self._segment.close()
+        if self.owner:
+            self._segment.unlink()
+
+class SharedArrayPool:
+    '''Thread-safe collection of the shared arrays created by one process, e.g. a
+    server's master process or a sidecar, holding the pixel values of raster
+    datasets for RasterDatasets opened with shared_memory=True in other processes
+    to attach to.  The segments are unlinked when the pool is closed.'''
+
+    def __init__(self):
+        '''Initialize an empty pool.'''
+        self._arrays = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._arrays)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def nbytes(self) -> int:
+        '''Return the total bytes of pixel values held in the pool.'''
+        with self._lock:
+            return sum(shared_array.nbytes for shared_array in self._arrays.values())
+
+    def add(self, raster_dataset) -> SharedArray:
+        '''Copy the pixel values of a RasterDataset into a new segment named for its
+        file, unless the pool already holds them, and return the SharedArray.  The
+        values are copied one band at a time, so a lazy RasterDataset is shared
+        without ever holding more than one band in this process, and other
+        processes cannot attach to them until all bands are copied.'''
+        name = shared_array_name(raster_dataset.filename)
+        with self._lock:
+            if name in self._arrays:
+                return self._arrays[name]
+
+        first_band = raster_dataset.read_band(0)
+        shared_array = SharedArray.create(
+            name, first_band.dtype, (raster_dataset.bands,) + first_band.shape)
+        try:
+            shared_array.array[0] = first_band
+            for band_index in range(1, raster_dataset.bands):
+                shared_array.array[band_index] = raster_dataset.read_band(band_index)
+            shared_array.mark_complete()
+        except BaseException:
+            shared_array.close()
+            raise
+
+        with self._lock:
+            self._arrays[name] = shared_array
+        return shared_array
+
+    def close(self) -> None:
+        '''Unlink all segments in the pool.'''
+        with self._lock:
+            for shared_array in self._arrays.values():
+                shared_array.close()
+            self._arrays.clear()
+
+def shared_array_name(dataset_path: str) -> str:
+    '''Return the name of the segment holding the pixel values of the dataset file
+    at the given path.  The name identifies the current version of the file, so
+    processes never attach to the values of a file that has since changed.'''
+    stat = os.stat(dataset_path)
+    identity = '{}\0{}\0{}'.format(os.path.realpath(dataset_path), stat.st_mtime_ns, stat.st_size)
+    return SEGMENT_PREFIX + hashlib.sha1(identity.encode('utf-8')).hexdigest()[:24]
+
+# Private helper methods
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    '''Return the existing segment with the given name without registering it with
+    the resource tracker of this process, which would otherwise unlink the segment
+    when this process exits although other processes are still using it.'''
+    try:
+        # pylint: disable=unexpected-keyword-arg
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # the track argument was added in Python 3.13
+        segment = shared_memory.SharedMemory(name)
+        # pylint: disable=protected-access
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
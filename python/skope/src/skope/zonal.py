@@ -0,0 +1,161 @@
+'''Rasterization of vector geometries onto the pixel grids of raster datasets.'''
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy
+from osgeo import gdal
+from osgeo import ogr
+
+def rasterize_geometry(geometry: dict, geotransform: List[float],
+                       shape: Tuple[int, int]) -> (Tuple[int, int, int, int], numpy.ndarray):
+    '''Rasterize a GeoJSON geometry onto the north-up pixel grid with the given
+    geotransform and (rows, columns) shape.  Return the window of the grid bounding
+    the geometry as the 4-tuple (row, column, rows, columns), clipped to the grid,
+    along with a boolean array over the window that is true for each pixel whose
+    center lies within the geometry.'''
+    ogr_geometry = ogr.CreateGeometryFromJson(json.dumps(geometry))
+    if ogr_geometry is None:
+        raise ValueError('Invalid GeoJSON geometry: ' + json.dumps(geometry))
+
+    window = _envelope_window(ogr_geometry.GetEnvelope(), geotransform, shape)
+    if window[2] == 0 or window[3] == 0:
+        return window, numpy.zeros(window[2:], dtype=bool)
+
+    # burn the geometry into an in-memory raster covering just the window
+    mask_dataset = gdal.GetDriverByName('MEM').Create('', window[3], window[2], 1, gdal.GDT_Byte)
+    mask_dataset.SetGeoTransform((geotransform[0] + window[1] * geotransform[1],
+                                  geotransform[1], 0,
+                                  geotransform[3] + window[0] * geotransform[5],
+                                  0, geotransform[5]))
+    vector_dataset = ogr.GetDriverByName('Memory').CreateDataSource('')
+    layer = vector_dataset.CreateLayer('geometry')
+    feature = ogr.Feature(layer.GetLayerDefn())
+    feature.SetGeometry(ogr_geometry)
+    layer.CreateFeature(feature)
+    gdal.RasterizeLayer(mask_dataset, [1], layer, burn_values=[1])
+
+    return window, mask_dataset.ReadAsArray().astype(bool)
+
+class MaskCache:
+    '''Thread-safe LRU cache of the windows, masks, and pixel indices produced by
+    rasterizing GeoJSON geometries, keyed by a hash of the geometry together with
+    the geotransform and shape of the pixel grid, so that datasets on the same grid
+    share entries.  The cache is bounded by the bytes of the cached masks and
+    indices, and entries may also be kept in a directory that outlives the cache.'''
+
+    def __init__(self, max_bytes: int, directory: str = None):
+        '''Initialize an empty cache holding at most max_bytes bytes of masks and
+        indices in memory, and storing entries as files in directory if given.'''
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, geometry: dict, geotransform: List[float], shape: Tuple[int, int]
+           ) -> (Tuple[int, int, int, int], numpy.ndarray, numpy.ndarray):
+        '''Return the window and mask that rasterize_geometry returns for the given
+        arguments, along with the indices of the pixels within the geometry in the
+        flattened window, rasterizing the geometry only if no entry is cached.'''
+        key = _mask_key(geometry, geotransform, shape)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._load(key)
+        if entry is None:
+            window, mask = rasterize_geometry(geometry, geotransform, shape)
+            entry = (window, mask, numpy.flatnonzero(mask))
+            self._store(key, entry)
+
+        # the arrays are shared by every user of the cache
+        entry[1].flags.writeable = False
+        entry[2].flags.writeable = False
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self._total_bytes += entry[1].nbytes + entry[2].nbytes
+            while len(self._entries) > 1 and self._total_bytes > self.max_bytes:
+                _, (_, evicted_mask, evicted_indices) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_mask.nbytes + evicted_indices.nbytes
+        return entry
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.npz')
+
+    def _load(self, key: str):
+        '''Return the entry stored in the cache directory under key, or None.'''
+        if self.directory is None or not os.path.isfile(self._path(key)):
+            return None
+        with numpy.load(self._path(key)) as stored:
+            mask = stored['mask']
+            return tuple(map(int, stored['window'])), mask, numpy.flatnonzero(mask)
+
+    def _store(self, key: str, entry) -> None:
+        '''Store an entry in the cache directory under key, writing to a temporary
+        file first so that concurrent readers never see a partial file.'''
+        if self.directory is None:
+            return
+        temporary_path = '{}.{}.{}.tmp.npz'.format(self._path(key)[:-4], os.getpid(),
+                                                  threading.get_ident())
+        numpy.savez_compressed(temporary_path, window=numpy.array(entry[0]), mask=entry[1])
+        os.replace(temporary_path, self._path(key))
+
+def masked_statistics(values: numpy.ndarray, nodata=None) -> dict:
+    '''Return the per-band mean, minimum, maximum, and count of the valid values in
+    a 2D array with one row per band and one column per pixel, as a dictionary of
+    arrays keyed by statistic name.  Values that are NaN or equal to nodata are not
+    valid.  Statistics other than count are NaN for bands with no valid values.'''
+    values = values.astype(numpy.float64, copy=False)
+    valid = ~numpy.isnan(values)
+    if nodata is not None:
+        valid &= values != nodata
+
+    count = valid.sum(axis=1)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        mean = numpy.where(valid, values, 0).sum(axis=1) / count
+    minimum = numpy.amin(numpy.where(valid, values, numpy.inf), axis=1, initial=numpy.inf)
+    maximum = numpy.amax(numpy.where(valid, values, -numpy.inf), axis=1, initial=-numpy.inf)
+    empty = count == 0
+    minimum[empty] = numpy.nan
+    maximum[empty] = numpy.nan
+
+    return {'mean': mean, 'min': minimum, 'max': maximum, 'count': count}
+
+# Private helper methods
+
+def _envelope_window(envelope: Tuple[float, float, float, float], geotransform: List[float],
+                     shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    '''Return the window of the pixels of the grid bounding the given (min_x, max_x,
+    min_y, max_y) envelope as the 4-tuple (row, column, rows, columns), clipped to
+    the grid.'''
+    min_x, max_x, min_y, max_y = envelope
+    grid_rows, grid_columns = shape
+    column_begin = min(max(0, math.floor((min_x - geotransform[0]) / geotransform[1])),
+                       grid_columns)
+    column_end = max(min(grid_columns, math.ceil((max_x - geotransform[0]) / geotransform[1])),
+                     column_begin)
+    row_begin = min(max(0, math.floor((max_y - geotransform[3]) / geotransform[5])), grid_rows)
+    row_end = max(min(grid_rows, math.ceil((min_y - geotransform[3]) / geotransform[5])),
+                  row_begin)
+    return (row_begin, column_begin, row_end - row_begin, column_end - column_begin)
+
+def _mask_key(geometry: dict, geotransform: List[float], shape: Tuple[int, int]) -> str:
+    '''Return a hash identifying the rasterization of a geometry onto a pixel grid.'''
+    description = json.dumps([geometry, list(geotransform), list(shape)],
+                             sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
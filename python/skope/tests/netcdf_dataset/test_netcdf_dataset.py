@@ -0,0 +1,78 @@
+'''Tests of the NetCDFDataset class.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import Deadline, NetCDFDataset, RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+def write_netcdf_file(filename: str) -> None:
+    '''Write a NetCDF file holding the variables ppt and gdd, each with 3 time
+    steps on a grid of 2 rows and 4 columns of one-degree pixels whose latitudes
+    are stored south to north.'''
+    gdal_dataset = gdal.GetDriverByName('netCDF').CreateMultiDimensional(filename)
+    group = gdal_dataset.GetRootGroup()
+    float64 = gdal.ExtendedDataType.Create(gdal.GDT_Float64)
+    time = group.CreateDimension('time', None, None, 3)
+    latitude = group.CreateDimension('lat', gdal.DIM_TYPE_HORIZONTAL_Y, None, 2)
+    longitude = group.CreateDimension('lon', gdal.DIM_TYPE_HORIZONTAL_X, None, 4)
+    for dimension, values, units in [(latitude, [43.5, 44.5], 'degrees_north'),
+                                     (longitude, [-122.5, -121.5, -120.5, -119.5], 'degrees_east')]:
+        coordinates = group.CreateMDArray(dimension.GetName(), [dimension], float64)
+        coordinates.WriteArray(numpy.array(values))
+        coordinates.CreateAttribute('units', [], gdal.ExtendedDataType.CreateString()).Write(units)
+        dimension.SetIndexingVariable(coordinates)
+    for name, offset in [('ppt', 0), ('gdd', 100)]:
+        variable = group.CreateMDArray(name, [time, latitude, longitude],
+                                       gdal.ExtendedDataType.Create(gdal.GDT_Float32))
+        variable.WriteArray(numpy.arange(24, dtype=numpy.float32).reshape(3, 2, 4) + offset)
+
+@pytest.fixture(scope='module')
+def netcdf_dataset(test_dataset_filename) -> NetCDFDataset:
+    '''Return a NetCDFDataset for a new NetCDF file.'''
+    filename = test_dataset_filename(__file__, '.nc')
+    write_netcdf_file(filename)
+    return NetCDFDataset(filename)
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_variables_are_enumerated(netcdf_dataset: NetCDFDataset):
+    assert sorted(netcdf_dataset.variables) == ['gdd', 'ppt']
+
+def test_variable_is_lazy_raster_dataset_with_one_band_per_time_step(netcdf_dataset: NetCDFDataset):
+    variable = netcdf_dataset.variable('ppt')
+    assert isinstance(variable, RasterDataset)
+    assert variable.lazy
+    assert variable.shape == (3, 2, 4)
+
+def test_variable_is_opened_once(netcdf_dataset: NetCDFDataset):
+    assert netcdf_dataset.variable('gdd') is netcdf_dataset.variable('gdd')
+
+def test_unknown_variable_raises_key_error(netcdf_dataset: NetCDFDataset):
+    with pytest.raises(KeyError):
+        netcdf_dataset.variable('tmax')
+
+def test_series_at_point_of_northern_pixel(netcdf_dataset: NetCDFDataset):
+    assert netcdf_dataset.series_at_point('ppt', -121.5, 44.5).tolist() == [5, 13, 21]
+
+def test_series_at_point_of_southern_pixel_of_second_variable(netcdf_dataset: NetCDFDataset):
+    assert netcdf_dataset.series_at_point('gdd', -119.5, 43.5).tolist() == [103, 111, 119]
+
+def test_series_at_point_matches_variable_read_band_by_band(netcdf_dataset: NetCDFDataset):
+    variable = netcdf_dataset.variable('ppt')
+    expected = [variable.read_band(band_index)[1, 2] for band_index in range(3)]
+    assert netcdf_dataset.series_at_pixel('ppt', 1, 2).tolist() == expected
+
+def test_range_of_series_at_point_is_correct(netcdf_dataset: NetCDFDataset):
+    assert netcdf_dataset.series_at_point('ppt', -121.5, 44.5, 1, 3).tolist() == [13, 21]
+
+def test_series_at_point_in_hyperslabs_of_one_time_step(netcdf_dataset: NetCDFDataset, monkeypatch):
+    monkeypatch.setattr('skope.netcdf_dataset.SERIES_CHUNK_BANDS', 1)
+    assert netcdf_dataset.series_at_point('ppt', -121.5, 44.5, deadline=Deadline(60)).tolist() == [5, 13, 21]
+
+def test_series_at_point_outside_coverage_raises_value_error(netcdf_dataset: NetCDFDataset):
+    with pytest.raises(ValueError, match='outside the coverage'):
+        netcdf_dataset.series_at_point('ppt', -130, 44.5)
@@ -0,0 +1,102 @@
+'''Tests of RasterDataset instances backed by a chunked series store.'''
+
+import os
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import RasterDataset, ChunkedSeriesStore, chunked_path
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def datafile_path(test_dataset_filename) -> str:
+    '''Create a new dataset file with a distinct value in every pixel of every band,
+    and a chunked series store with 2x2 pixel tiles beside it.'''
+
+    datafile_path = test_dataset_filename(__file__)
+
+    raster_dataset = RasterDataset.create(datafile_path, 'GTiff',
+                                          gdal.GDT_Float32,
+                                          shape=(4, 3, 5),
+                                          origin=(-123, 45),
+                                          pixel_size=(1.0, 1.0),
+                                          coordinate_system='WGS84')
+
+    for band_index in range(0, 4):
+        raster_dataset.write_band(
+            band_index,
+            numpy.arange(15).reshape(3, 5) + 100 * band_index,
+            float('nan'))
+
+    raster_dataset.flush()
+
+    ChunkedSeriesStore.write(RasterDataset(datafile_path, lazy=True), chunk_size=2)
+
+    return datafile_path
+
+@pytest.fixture(scope='module')
+def raster_dataset(datafile_path) -> RasterDataset:
+    '''Return a RasterDataset for the test dataset file.'''
+    return RasterDataset(datafile_path)
+
+@pytest.fixture(scope='module')
+def expected_array(datafile_path) -> numpy.ndarray:
+    '''Return the pixel values of the test dataset read directly with GDAL.'''
+    return gdal.Open(datafile_path).ReadAsArray()
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long, protected-access
+
+def test_store_is_written_beside_dataset_file(datafile_path):
+    assert os.path.isfile(chunked_path(datafile_path))
+
+def test_dataset_is_backed_by_store(raster_dataset: RasterDataset):
+    assert isinstance(raster_dataset.series_store, ChunkedSeriesStore)
+    assert raster_dataset.shape == (4, 3, 5)
+
+def test_series_at_every_pixel_is_read_from_store(raster_dataset: RasterDataset, expected_array):
+    for row in range(3):
+        for column in range(5):
+            assert raster_dataset.series_at_pixel(row, column).tolist() == expected_array[:, row, column].tolist()
+
+def test_value_at_pixel_is_read_from_store(raster_dataset: RasterDataset):
+    assert raster_dataset.value_at_pixel(band_index=2, row=2, column=4) == 214
+
+def test_read_band_is_assembled_from_tiles(raster_dataset: RasterDataset, expected_array):
+    assert raster_dataset.read_band(3).tolist() == expected_array[3].tolist()
+
+def test_least_recently_used_tiles_are_evicted_beyond_max_cache_bytes(datafile_path):
+    # full tiles of 4 float32 bands hold 64 bytes, and the tiles of the last row
+    # and of the last column 32 bytes; opening the store reads tile (0, 0)
+    with ChunkedSeriesStore(chunked_path(datafile_path), max_cache_bytes=80) as series_store:
+        series_store.series_at_pixel(0, 4, 0, 4)
+        assert list(series_store._chunks) == [(0, 2)]
+        series_store.series_at_pixel(2, 0, 0, 4)
+        series_store.series_at_pixel(1, 4, 0, 4)
+        series_store.series_at_pixel(2, 2, 0, 4)
+        assert list(series_store._chunks) == [(0, 2), (1, 1)]
+        assert series_store.cache_bytes == 64
+
+def test_closing_store_empties_cache(datafile_path):
+    series_store = ChunkedSeriesStore(chunked_path(datafile_path))
+    series_store.close()
+    assert series_store.cache_bytes == 0
+
+def test_reloading_values_closes_replaced_store(datafile_path, monkeypatch):
+    raster_dataset = RasterDataset(datafile_path)
+    series_store = raster_dataset.series_store
+    closed = []
+    monkeypatch.setattr(series_store, 'close', lambda: closed.append(series_store))
+    raster_dataset._load_array()
+    assert closed == [series_store]
+    assert raster_dataset.series_store is not series_store
+
+def test_closing_dataset_closes_store(datafile_path):
+    raster_dataset = RasterDataset(datafile_path)
+    series_store = raster_dataset.series_store
+    series_store.series_at_pixel(2, 4, 0, 4)
+    raster_dataset.close()
+    assert raster_dataset.series_store is None
+    assert series_store.cache_bytes == 0
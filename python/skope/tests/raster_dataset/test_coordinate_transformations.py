@@ -2,6 +2,7 @@
 
 import pytest
 
+import numpy
 from osgeo import gdal
 from skope import RasterDataset
 
@@ -58,3 +59,27 @@ def test_pixel_at_point_just_northwest_of_southeast_corner_of_southeast_pixel_is
 
 def test_pixel_at_point_just_southeast_of_southeast_corner_of_southeast_pixel_is_outside_coverage(raster_dataset: RasterDataset):
     assert raster_dataset.pixel_at_point(-117.999, 36.999) is None
+
+def test_pixels_at_points_match_pixel_at_point(raster_dataset: RasterDataset):
+    longitudes = numpy.array([-123, -122.5, -122.001, -121.999, -118.001])
+    latitudes = numpy.array([45, 44, 43.001, 42.999, 37.001])
+    rows, columns, valid = raster_dataset.pixels_at_points(longitudes, latitudes)
+    assert rows.tolist() == [0, 0, 0, 1, 3]
+    assert columns.tolist() == [0, 0, 0, 1, 4]
+    assert valid.all()
+
+def test_pixels_at_points_outside_coverage_are_invalid(raster_dataset: RasterDataset):
+    rows, columns, valid = raster_dataset.pixels_at_points([-123.001, -117.999, -120], [45.001, 36.999, 41])
+    assert valid.tolist() == [False, False, True]
+    assert rows.tolist() == [-1, -1, 2]
+    assert columns.tolist() == [-1, -1, 3]
+
+def test_pixels_at_points_broadcasts_coordinates(raster_dataset: RasterDataset):
+    rows, columns, valid = raster_dataset.pixels_at_points([[-123], [-119.5]], [44, 40, 38])
+    assert valid.shape == (2, 3)
+    assert rows.tolist() == [[0, 2, 3], [0, 2, 3]]
+    assert columns.tolist() == [[0, 0, 0], [3, 3, 3]]
+
+def test_value_at_point_outside_coverage_raises_value_error(raster_dataset: RasterDataset):
+    with pytest.raises(ValueError, match='outside the coverage'):
+        raster_dataset.value_at_point(-130, 45, band_index=0)
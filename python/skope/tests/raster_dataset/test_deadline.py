@@ -0,0 +1,99 @@
+'''Tests of deadlines on extractions from a RasterDataset.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import Deadline, DeadlineExceeded, RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+class ExpiringDeadline(Deadline):
+    '''A deadline that passes after it has been checked a given number of times.'''
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, checks: int):
+        super().__init__(60)
+        self.checks = checks
+
+    def expired(self) -> bool:
+        '''Count a check and return true once the given number of checks is used up.'''
+        self.checks -= 1
+        return self.checks < 0
+
+@pytest.fixture(scope='module')
+def filename(test_dataset_filename) -> str:
+    '''Create a 6-band, 2x3 pixel dataset and return the path to its file.'''
+    filename = test_dataset_filename(__file__)
+    raster_dataset = RasterDataset.create(filename, 'GTiff', gdal.GDT_Float32, shape=(6, 2, 3),
+                                          origin=(-123, 45), pixel_size=(1.0, 1.0))
+    raster_dataset.write_bands(numpy.arange(6 * 2 * 3, dtype=numpy.float32).reshape(6, 2, 3))
+    return filename
+
+@pytest.fixture(scope='module')
+def raster_dataset(filename) -> RasterDataset:
+    '''Return a RasterDataset holding the test dataset in memory.'''
+    return RasterDataset(filename)
+
+@pytest.fixture(scope='module')
+def lazy_dataset(filename) -> RasterDataset:
+    '''Return a RasterDataset reading the test dataset on demand.'''
+    return RasterDataset(filename, lazy=True, use_series_store=False)
+
+def polygon() -> dict:
+    '''Return a GeoJSON Polygon enclosing the whole dataset.'''
+    return {'type': 'Polygon', 'coordinates': [[[-124, 46], [-119, 46], [-119, 42],
+                                                [-124, 42], [-124, 46]]]}
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_deadline_in_future_has_not_expired():
+    deadline = Deadline(60)
+    assert not deadline.expired()
+    assert 0 < deadline.remaining <= 60
+    deadline.check()
+
+def test_expired_deadline_check_raises_deadline_exceeded_without_partial_result():
+    with pytest.raises(DeadlineExceeded) as error:
+        Deadline(0).check()
+    assert error.value.partial is None
+
+def test_deadline_exceeded_is_timeout_error():
+    assert issubclass(DeadlineExceeded, TimeoutError)
+
+def test_series_at_pixel_with_unexpired_deadline_returns_full_series(lazy_dataset: RasterDataset):
+    series = lazy_dataset.series_at_pixel(1, 2, deadline=Deadline(60))
+    assert series.tolist() == [5, 11, 17, 23, 29, 35]
+
+def test_series_at_pixel_with_expired_deadline_raises_deadline_exceeded(raster_dataset: RasterDataset):
+    with pytest.raises(DeadlineExceeded):
+        raster_dataset.series_at_pixel(0, 0, deadline=Deadline(0))
+
+def test_lazy_series_at_pixel_returns_bands_read_before_deadline(lazy_dataset: RasterDataset, monkeypatch):
+    monkeypatch.setattr('skope.raster_dataset.SERIES_CHUNK_BANDS', 2)
+    with pytest.raises(DeadlineExceeded) as error:
+        lazy_dataset.series_at_pixel(0, 1, deadline=ExpiringDeadline(2))
+    assert error.value.partial.tolist() == [1, 7, 13, 19]
+
+def test_lazy_series_at_points_masks_points_not_read_before_deadline(lazy_dataset: RasterDataset):
+    with pytest.raises(DeadlineExceeded) as error:
+        lazy_dataset.series_at_points([-122.5, -121.5, -120.5], [44.5, 44.5, 44.5],
+                                      deadline=ExpiringDeadline(2))
+    partial = error.value.partial
+    assert numpy.ma.getmaskarray(partial).any(axis=1).tolist() == [False, False, True]
+    assert partial[1].tolist() == [1, 7, 13, 19, 25, 31]
+
+def test_zonal_series_returns_statistics_of_bands_read_before_deadline(raster_dataset: RasterDataset):
+    with pytest.raises(DeadlineExceeded) as error:
+        raster_dataset.zonal_series(polygon(), max_chunk_bytes=2 * 3 * 4 * 2,
+                                    deadline=ExpiringDeadline(2))
+    assert error.value.partial['count'].tolist() == [6, 6, 6, 6]
+    assert error.value.partial['mean'].tolist() == [2.5, 8.5, 14.5, 20.5]
+
+def test_iter_bands_stops_when_deadline_passes(raster_dataset: RasterDataset):
+    band_begins = []
+    with pytest.raises(DeadlineExceeded):
+        for band_begin, _ in raster_dataset.iter_bands(chunk=2, deadline=ExpiringDeadline(2)):
+            band_begins.append(band_begin)
+    assert band_begins == [0, 2]
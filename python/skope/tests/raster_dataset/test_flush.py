@@ -0,0 +1,81 @@
+'''Tests of the RasterDataset flush method.'''
+import numpy
+import pytest
+from osgeo import gdal
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name, protected-access
+
+@pytest.fixture
+def raster_dataset(test_dataset_filename) -> RasterDataset:
+    '''Return a new 2-band, 2x3 pixel unsigned integer dataset.'''
+    return RasterDataset.create(test_dataset_filename(__file__),
+                                'GTiff', gdal.GDT_UInt16,
+                                shape=(2, 2, 3),
+                                origin=(-123, 45),
+                                pixel_size=(1.0, 1.0),
+                                coordinate_system='WGS84')
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_flush_keeps_open_gdal_dataset(raster_dataset: RasterDataset):
+    gdal_dataset = raster_dataset._gdal_dataset
+    raster_dataset.write_band(0, numpy.ones((2, 3)), 0)
+    raster_dataset.flush()
+    assert raster_dataset._gdal_dataset is gdal_dataset
+
+def test_flush_writes_values_to_file(raster_dataset: RasterDataset):
+    raster_dataset.write_band(1, numpy.array([[1, 2, 3], [4, 5, 6]]), 0)
+    raster_dataset.write_pixel(0, 1, 2, 9)
+    raster_dataset.flush()
+    assert gdal.Open(raster_dataset.filename).ReadAsArray().tolist() == [[[0, 0, 0], [0, 0, 9]],
+                                                                         [[1, 2, 3], [4, 5, 6]]]
+
+def test_values_written_are_readable_before_and_after_flush(raster_dataset: RasterDataset):
+    raster_dataset.write_band(1, numpy.array([[1, 2, 3], [4, 5, 6]]), 0)
+    assert raster_dataset.series_at_pixel(1, 1).tolist() == [0, 5]
+    raster_dataset.flush()
+    assert raster_dataset.series_at_pixel(1, 1).tolist() == [0, 5]
+
+def test_values_written_out_of_range_match_values_clamped_by_gdal(raster_dataset: RasterDataset):
+    raster_dataset.write_band(0, numpy.full((2, 3), 70000.0), 0)
+    raster_dataset.flush()
+    assert raster_dataset.read_band(0).tolist() == \
+           gdal.Open(raster_dataset.filename).GetRasterBand(1).ReadAsArray().tolist()
+
+def test_flush_clears_stale_flag(raster_dataset: RasterDataset):
+    raster_dataset.write_pixel(0, 0, 0, 3)
+    raster_dataset.flush()
+    assert not raster_dataset._stale
+
+def test_written_values_match_values_converted_by_gdal(raster_dataset: RasterDataset):
+    raster_dataset.write_band(0, numpy.array([[1.2, 2.5, -1.0], [4.7, 70000.0, numpy.nan]]), 0)
+    raster_dataset.write_pixels(1, [0, 1, 1], [0, 1, 2], [3.5, 9.9, -7.0])
+    in_memory = raster_dataset._array.tolist()
+    raster_dataset.flush()
+    assert in_memory == gdal.Open(raster_dataset.filename).ReadAsArray().tolist()
+
+def test_written_integer_values_out_of_range_match_values_in_file(raster_dataset: RasterDataset):
+    raster_dataset.write_pixels(0, [0, 1], [0, 2], numpy.array([-1, 70000], dtype=numpy.int64))
+    raster_dataset.write_pixel(1, 1, 1, -5)
+    in_memory = raster_dataset._array.tolist()
+    raster_dataset.flush()
+    assert in_memory == gdal.Open(raster_dataset.filename).ReadAsArray().tolist()
+    assert in_memory[0][0][0] == 0 and in_memory[0][1][2] == 65535
+
+def test_only_band_pixels_gdal_may_convert_differently_are_reread(raster_dataset: RasterDataset, monkeypatch):
+    reread = []
+    original = raster_dataset._reread_pixels
+    def recording_reread(band_indexes, rows, columns):
+        reread.extend(zip(band_indexes.tolist(), rows.tolist(), columns.tolist()))
+        original(band_indexes, rows, columns)
+    monkeypatch.setattr(raster_dataset, '_reread_pixels', recording_reread)
+    raster_dataset.write_band(0, numpy.array([[1.2, 2.5, 3.0], [4.7, 5.0, 6.1]]), 0)
+    raster_dataset.write_pixels(1, [0, 1], [0, 2], [0.4, 70000.0])
+    assert reread == [(0, 0, 1)]
+
+def test_pixel_writes_to_writeable_array_do_not_mark_dataset_stale(
+        raster_dataset: RasterDataset):
+    raster_dataset.write_pixels(0, [0, 1], [0, 2], [1.0, 2.0])
+    assert not raster_dataset._stale
@@ -0,0 +1,73 @@
+'''Tests of the RasterDataset band and window iterators.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def band_stack() -> numpy.ndarray:
+    '''Return pixel values for a 7-band, 20x30 pixel dataset.'''
+    return numpy.arange(7 * 20 * 30, dtype=numpy.float32).reshape(7, 20, 30)
+
+@pytest.fixture(scope='module')
+def datafile_path(test_dataset_filename, band_stack) -> str:
+    '''Create a new tiled dataset file with 16x16 pixel blocks.'''
+    datafile_path = test_dataset_filename(__file__)
+    raster_dataset = RasterDataset.create(datafile_path, 'GTiff', gdal.GDT_Float32,
+                                          shape=band_stack.shape, origin=(-123, 45),
+                                          pixel_size=(1.0, 1.0), lazy=True,
+                                          options=['TILED=YES', 'BLOCKXSIZE=16',
+                                                   'BLOCKYSIZE=16'])
+    raster_dataset.write_bands(band_stack)
+    return datafile_path
+
+@pytest.fixture(scope='module', params=[False, True], ids=['eager', 'lazy'])
+def raster_dataset(request, datafile_path) -> RasterDataset:
+    '''Return an eager and a lazy RasterDataset for the test dataset file.'''
+    return RasterDataset(datafile_path, lazy=request.param)
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_iter_bands_yields_chunks_of_bands(raster_dataset: RasterDataset, band_stack, prefetch):
+    chunks = list(raster_dataset.iter_bands(chunk=3, prefetch=prefetch))
+    assert [band_begin for band_begin, _ in chunks] == [0, 3, 6]
+    assert [bands.shape for _, bands in chunks] == [(3, 20, 30), (3, 20, 30), (1, 20, 30)]
+    assert numpy.array_equal(numpy.concatenate([bands for _, bands in chunks]), band_stack)
+
+def test_iter_bands_yields_specified_range_of_bands(raster_dataset: RasterDataset, band_stack):
+    chunks = list(raster_dataset.iter_bands(2, 5, chunk=2))
+    assert [band_begin for band_begin, _ in chunks] == [2, 4]
+    assert numpy.array_equal(numpy.concatenate([bands for _, bands in chunks]), band_stack[2:5])
+
+def test_iter_windows_defaults_to_native_block_size(raster_dataset: RasterDataset):
+    windows = list(raster_dataset.iter_windows())
+    assert [(row, column) for row, column, _ in windows] == [(0, 0), (0, 16), (16, 0), (16, 16)]
+    assert [block.shape for _, _, block in windows] == [(7, 16, 16), (7, 16, 14), (7, 4, 16), (7, 4, 14)]
+
+def test_iter_windows_rounds_block_shape_up_to_native_blocks(raster_dataset: RasterDataset):
+    windows = list(raster_dataset.iter_windows((20, 17)))
+    assert [(row, column) for row, column, _ in windows] == [(0, 0)]
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_iter_windows_covers_dataset(raster_dataset: RasterDataset, band_stack, prefetch):
+    assembled = numpy.zeros((2, 20, 30), dtype=numpy.float32)
+    for row, column, block in raster_dataset.iter_windows(begin=3, end=5, prefetch=prefetch):
+        assembled[:, row:row + block.shape[1], column:column + block.shape[2]] = block
+    assert numpy.array_equal(assembled, band_stack[3:5])
+
+@pytest.mark.parametrize('chunk', [0, -1])
+def test_iter_bands_rejects_chunk_that_is_not_positive(raster_dataset: RasterDataset, chunk):
+    with pytest.raises(ValueError):
+        raster_dataset.iter_bands(chunk=chunk)
+
+@pytest.mark.parametrize('block_shape', [(0, 16), (16, -1)])
+def test_iter_windows_rejects_block_shape_that_is_not_positive(raster_dataset: RasterDataset,
+                                                               block_shape):
+    with pytest.raises(ValueError):
+        raster_dataset.iter_windows(block_shape)
@@ -0,0 +1,82 @@
+'''Tests of RasterDataset instances that read pixel values on demand.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def datafile_path(test_dataset_filename) -> str:
+    '''Create a new dataset file with a distinct value in every pixel of every band.'''
+
+    datafile_path = test_dataset_filename(__file__)
+
+    raster_dataset = RasterDataset.create(datafile_path, 'GTiff',
+                                          gdal.GDT_Float32,
+                                          shape=(10, 2, 3),
+                                          origin=(-123, 45),
+                                          pixel_size=(1.0, 1.0),
+                                          coordinate_system='WGS84')
+
+    for band_index in range(0, 10):
+        raster_dataset.write_band(
+            band_index,
+            numpy.array([[1, 2, 3], [4, 5, 6]]) + 10 * band_index,
+            float('nan'))
+
+    raster_dataset.flush()
+
+    return datafile_path
+
+@pytest.fixture(scope='module')
+def raster_dataset(datafile_path) -> RasterDataset:
+    '''Return a lazy RasterDataset for the test dataset file.'''
+    return RasterDataset(datafile_path, lazy=True)
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long, protected-access
+
+def test_lazy_dataset_holds_no_pixel_values_in_memory(raster_dataset: RasterDataset):
+    assert raster_dataset.lazy
+    assert raster_dataset._array is None
+    assert raster_dataset.nbytes == 0
+
+def test_shape_is_read_from_dataset_metadata(raster_dataset: RasterDataset):
+    assert raster_dataset.shape == (10, 2, 3)
+
+def test_value_at_pixel_is_read_from_dataset(raster_dataset: RasterDataset):
+    assert raster_dataset.value_at_pixel(band_index=0, row=0, column=0) == 1
+    assert raster_dataset.value_at_pixel(band_index=3, row=1, column=2) == 36
+
+def test_series_at_pixel_is_read_from_dataset(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_pixel(1, 1).tolist() == [5.0, 15.0, 25.0, 35.0, 45.0, 55.0, 65.0, 75.0, 85.0, 95.0]
+
+def test_range_of_series_at_pixel_is_read_from_dataset(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_pixel(0, 2, 5, 8).tolist() == [53.0, 63.0, 73.0]
+
+def test_empty_range_of_series_at_pixel_is_empty_array(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_pixel(0, 2, 5, 5).tolist() == []
+
+def test_series_at_point_is_read_from_dataset(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_point(-121, 44, end=3).tolist() == [6.0, 16.0, 26.0]
+
+def test_read_band_is_read_from_dataset(raster_dataset: RasterDataset):
+    assert raster_dataset.read_band(2).tolist() == [[21, 22, 23], [24, 25, 26]]
+
+def test_lazy_reads_match_eager_reads(raster_dataset: RasterDataset, datafile_path):
+    eager_dataset = RasterDataset(datafile_path)
+    assert raster_dataset.shape == eager_dataset.shape
+    for row in range(2):
+        for column in range(3):
+            assert raster_dataset.series_at_pixel(row, column).tolist() == \
+                   eager_dataset.series_at_pixel(row, column).tolist()
+
+@pytest.mark.parametrize('begin, end', [(8, 20), (-3, None), (12, 15)])
+def test_range_of_bands_beyond_dataset_is_clipped_as_for_eager_reads(raster_dataset: RasterDataset, datafile_path, begin, end):
+    eager_dataset = RasterDataset(datafile_path)
+    assert raster_dataset.series_at_pixel(0, 2, begin, end).tolist() == \
+           eager_dataset.series_at_pixel(0, 2, begin, end).tolist()
+    assert raster_dataset._read_window(8, 20, 0, 2, 1, 1).reshape(-1).tolist() == [83.0, 93.0]
@@ -0,0 +1,71 @@
+'''Tests of the MaskCache class and its use by RasterDataset.zonal_series.'''
+
+import os
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import MaskCache, RasterDataset, rasterize_geometry
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def raster_dataset(test_dataset_filename) -> RasterDataset:
+    '''Create a 2-band, 4x5 pixel dataset with one-degree pixels.'''
+    raster_dataset = RasterDataset.create(test_dataset_filename(__file__), 'GTiff',
+                                          gdal.GDT_Float32, shape=(2, 4, 5),
+                                          origin=(-123, 45), pixel_size=(1.0, 1.0))
+    raster_dataset.write_bands(numpy.arange(2 * 4 * 5, dtype=numpy.float32).reshape(2, 4, 5))
+    return raster_dataset
+
+def square(west, north, east, south) -> dict:
+    '''Return a GeoJSON Polygon for the rectangle with the given edges.'''
+    return {'type': 'Polygon', 'coordinates': [[[west, north], [east, north], [east, south],
+                                                [west, south], [west, north]]]}
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_cached_mask_matches_rasterized_geometry(raster_dataset: RasterDataset):
+    geometry = square(-122.4, 43.9, -120.6, 41.9)
+    window, mask, indices = MaskCache(1024).get(geometry, raster_dataset.geotransform, (4, 5))
+    expected_window, expected_mask = rasterize_geometry(geometry, raster_dataset.geotransform, (4, 5))
+    assert window == expected_window
+    assert numpy.array_equal(mask, expected_mask)
+    assert indices.tolist() == numpy.flatnonzero(expected_mask).tolist()
+
+def test_repeated_get_returns_cached_entry(raster_dataset: RasterDataset):
+    mask_cache = MaskCache(1024)
+    first = mask_cache.get(square(-123, 45, -121, 43), raster_dataset.geotransform, (4, 5))
+    second = mask_cache.get(square(-123, 45, -121, 43), raster_dataset.geotransform, (4, 5))
+    assert second[1] is first[1]
+    assert not first[1].flags.writeable
+
+def test_entries_differ_by_grid(raster_dataset: RasterDataset):
+    mask_cache = MaskCache(1024)
+    mask_cache.get(square(-123, 45, -121, 43), raster_dataset.geotransform, (4, 5))
+    mask_cache.get(square(-123, 45, -121, 43), raster_dataset.geotransform, (3, 5))
+    assert len(mask_cache) == 2
+
+def test_least_recently_used_entries_are_evicted_when_bytes_exceeded(raster_dataset: RasterDataset):
+    mask_cache = MaskCache(1)
+    mask_cache.get(square(-123, 45, -121, 43), raster_dataset.geotransform, (4, 5))
+    mask_cache.get(square(-122, 44, -120, 42), raster_dataset.geotransform, (4, 5))
+    assert len(mask_cache) == 1
+
+def test_entries_are_reloaded_from_cache_directory(raster_dataset: RasterDataset, tmpdir):
+    directory = str(tmpdir.join('masks'))
+    geometry = square(-122.4, 43.9, -120.6, 41.9)
+    first = MaskCache(1024, directory).get(geometry, raster_dataset.geotransform, (4, 5))
+    assert len(os.listdir(directory)) == 1
+    second = MaskCache(1024, directory).get(geometry, raster_dataset.geotransform, (4, 5))
+    assert second[0] == first[0]
+    assert numpy.array_equal(second[1], first[1])
+
+def test_zonal_series_with_mask_cache_matches_without(raster_dataset: RasterDataset):
+    geometry = square(-122.4, 43.9, -120.6, 41.9)
+    cached = raster_dataset.zonal_series(geometry, mask_cache=MaskCache(1024))
+    uncached = raster_dataset.zonal_series(geometry)
+    for name in ['mean', 'min', 'max', 'count']:
+        assert cached[name].tolist() == uncached[name].tolist()
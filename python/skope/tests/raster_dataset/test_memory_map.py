@@ -0,0 +1,94 @@
+'''Tests of RasterDataset instances backed by memory-mapped dataset files.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal, osr
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+def create_dataset_file(path, options, bands_written=4):
+    '''Create a 4-band, 2x3 pixel dataset file with the given GTiff creation options
+    and a distinct value in every pixel of the first bands_written bands.'''
+    gdal_dataset = gdal.GetDriverByName('GTiff').Create(path, 3, 2, 4, gdal.GDT_Float32,
+                                                        options=options)
+    gdal_dataset.SetGeoTransform((-123, 1.0, 0, 45, 0, -1.0))
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS('WGS84')
+    gdal_dataset.SetProjection(srs.ExportToWkt())
+    for band_index in range(bands_written):
+        gdal_dataset.GetRasterBand(band_index + 1).WriteArray(
+            numpy.array([[1, 2, 3], [4, 5, 6]]) + 10 * band_index)
+    gdal_dataset = None
+
+@pytest.fixture(scope='module')
+def band_interleaved_path(test_dataset_filename) -> str:
+    '''Return the path to an uncompressed, band-interleaved dataset file.'''
+    path = test_dataset_filename(__file__)
+    create_dataset_file(path, ['INTERLEAVE=BAND'])
+    return path
+
+@pytest.fixture(scope='module')
+def compressed_path(test_dataset_filename) -> str:
+    '''Return the path to a compressed dataset file.'''
+    path = test_dataset_filename(__file__).replace('.tif', '_compressed.tif')
+    create_dataset_file(path, ['INTERLEAVE=BAND', 'COMPRESS=DEFLATE'])
+    return path
+
+@pytest.fixture(scope='module')
+def raster_dataset(band_interleaved_path) -> RasterDataset:
+    '''Return a memory-mapped RasterDataset for the band-interleaved dataset file.'''
+    return RasterDataset(band_interleaved_path, memory_map=True)
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long, protected-access
+
+def test_uncompressed_band_interleaved_dataset_is_memory_mapped(raster_dataset: RasterDataset):
+    assert raster_dataset.memory_mapped
+    assert isinstance(raster_dataset._array, numpy.memmap)
+
+def test_memory_mapped_dataset_reports_no_bytes_held_in_memory(raster_dataset: RasterDataset):
+    assert raster_dataset.nbytes == 0
+
+def test_memory_mapped_values_match_values_read_with_gdal(raster_dataset: RasterDataset, band_interleaved_path):
+    assert numpy.array_equal(raster_dataset._array, gdal.Open(band_interleaved_path).ReadAsArray())
+
+def test_series_at_pixel_reads_memory_mapped_values(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_pixel(1, 2).tolist() == [6.0, 16.0, 26.0, 36.0]
+
+def test_memory_mapped_values_are_read_only(raster_dataset: RasterDataset):
+    with pytest.raises(ValueError):
+        raster_dataset._array[0, 0, 0] = 0
+
+def test_compressed_dataset_falls_back_to_reading_values(compressed_path):
+    raster_dataset = RasterDataset(compressed_path, memory_map=True)
+    assert not raster_dataset.memory_mapped
+    assert raster_dataset.series_at_pixel(1, 2).tolist() == [6.0, 16.0, 26.0, 36.0]
+
+def test_dataset_of_many_strips_is_memory_mapped(test_dataset_filename):
+    path = test_dataset_filename(__file__).replace('.tif', '_strips.tif')
+    create_dataset_file(path, ['INTERLEAVE=BAND', 'BLOCKYSIZE=1'])
+    raster_dataset = RasterDataset(path, memory_map=True)
+    assert raster_dataset.memory_mapped
+    assert numpy.array_equal(raster_dataset._array, gdal.Open(path).ReadAsArray())
+
+def test_sparse_dataset_falls_back_to_reading_values(test_dataset_filename):
+    path = test_dataset_filename(__file__).replace('.tif', '_sparse.tif')
+    create_dataset_file(path, ['INTERLEAVE=BAND', 'BLOCKYSIZE=1', 'SPARSE_OK=TRUE'],
+                        bands_written=2)
+    raster_dataset = RasterDataset(path, memory_map=True)
+    assert not raster_dataset.memory_mapped
+    assert raster_dataset.series_at_pixel(1, 2).tolist() == [6.0, 16.0, 0.0, 0.0]
+
+def test_values_written_to_memory_mapped_dataset_are_seen_once_flushed(test_dataset_filename):
+    path = test_dataset_filename(__file__).replace('.tif', '_written.tif')
+    create_dataset_file(path, ['INTERLEAVE=BAND'])
+    raster_dataset = RasterDataset(path, memory_map=True)
+    raster_dataset.write_pixel(band_index=1, row=1, column=2, value=-1.0)
+    raster_dataset.write_pixels(band_index=[2, 3], rows=0, columns=[0, 1], values=[-2.0, -3.0])
+    raster_dataset.flush()
+    assert raster_dataset.memory_mapped
+    assert raster_dataset.series_at_pixel(1, 2).tolist() == [6.0, -1.0, 26.0, 36.0]
+    assert raster_dataset.value_at_pixel(band_index=2, row=0, column=0) == -2.0
+    assert raster_dataset.value_at_pixel(band_index=3, row=0, column=1) == -3.0
@@ -129,3 +129,25 @@ def test_range_5_to_5_of_series_at_point_in_pixel_0_0_is_empty_array(raster_data
 
 def test_range_5_to_6_of_series_at_point_in_pixel_0_0_is_single_element_array(raster_dataset: RasterDataset):
     assert raster_dataset.series_at_point(-123, 45, 5, 6).tolist() == [51.0]
+
+def test_series_preserves_native_dtype_of_dataset(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_pixel(0, 0).dtype == numpy.float32
+
+def test_series_converted_to_requested_dtype(raster_dataset: RasterDataset):
+    series_array = raster_dataset.series_at_pixel(0, 0, dtype=numpy.float64)
+    assert series_array.dtype == numpy.float64
+    assert series_array.tolist() == [1.0, 11.0, 21.0, 31.0, 41.0, 51.0, 61.0, 71.0, 81.0, 91.0]
+
+def test_series_copy_is_writeable_and_independent_of_dataset(raster_dataset: RasterDataset):
+    series_array = raster_dataset.series_at_pixel(0, 0)
+    series_array[0] = -1
+    assert raster_dataset.value_at_pixel(0, 0, 0) == 1
+
+def test_series_without_copy_is_read_only_view_of_dataset(raster_dataset: RasterDataset):
+    series_array = raster_dataset.series_at_pixel(0, 0, 2, 4, copy=False)
+    assert series_array.tolist() == [21.0, 31.0]
+    assert not series_array.flags.writeable
+    assert numpy.shares_memory(series_array, raster_dataset._array) # pylint: disable=protected-access
+
+def test_series_at_point_without_copy_is_correct(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_point(-122, 44, copy=False).tolist() == [4.0, 14.0, 24.0, 34.0, 44.0, 54.0, 64.0, 74.0, 84.0, 94.0]
@@ -0,0 +1,89 @@
+'''Tests of the RasterDataset batch series extraction method.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def datafile_path(test_dataset_filename) -> str:
+    '''Create a new dataset file with a distinct value in every pixel of every band.'''
+
+    datafile_path = test_dataset_filename(__file__)
+
+    raster_dataset = RasterDataset.create(datafile_path, 'GTiff',
+                                          gdal.GDT_Float32,
+                                          shape=(5, 2, 2),
+                                          origin=(-123, 45),
+                                          pixel_size=(1.0, 1.0),
+                                          coordinate_system='WGS84')
+
+    for band_index in range(0, 5):
+        raster_dataset.write_band(
+            band_index,
+            numpy.array([[1, 2], [3, 4]]) + 10 * band_index,
+            float('nan'))
+
+    raster_dataset.flush()
+
+    return datafile_path
+
+@pytest.fixture(scope='module', params=[False, True], ids=['eager', 'lazy'])
+def raster_dataset(request, datafile_path) -> RasterDataset:
+    '''Return an eager and a lazy RasterDataset for the test dataset file.'''
+    return RasterDataset(datafile_path, lazy=request.param)
+
+@pytest.fixture(scope='module')
+def longitudes() -> numpy.ndarray:
+    '''Return longitudes of points in each pixel and one point outside the coverage.'''
+    return numpy.array([-123, -122, -123, -121.001, -125])
+
+@pytest.fixture(scope='module')
+def latitudes() -> numpy.ndarray:
+    '''Return latitudes of points in each pixel and one point outside the coverage.'''
+    return numpy.array([45, 45, 44, 43.001, 45])
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_series_at_points_returns_masked_array(raster_dataset, longitudes, latitudes):
+    assert isinstance(raster_dataset.series_at_points(longitudes, latitudes), numpy.ma.MaskedArray)
+
+def test_series_at_points_has_one_row_per_point_and_one_column_per_band(raster_dataset, longitudes, latitudes):
+    assert raster_dataset.series_at_points(longitudes, latitudes).shape == (5, 5)
+
+def test_series_at_points_matches_series_at_point(raster_dataset, longitudes, latitudes):
+    series = raster_dataset.series_at_points(longitudes, latitudes)
+    for point_index in range(4):
+        assert series[point_index].tolist() == raster_dataset.series_at_point(
+            longitudes[point_index], latitudes[point_index]).tolist()
+
+def test_series_at_points_masks_points_outside_coverage(raster_dataset, longitudes, latitudes):
+    mask = numpy.ma.getmaskarray(raster_dataset.series_at_points(longitudes, latitudes))
+    assert mask[4].all()
+    assert not mask[:4].any()
+
+def test_range_of_series_at_points_is_correct(raster_dataset, longitudes, latitudes):
+    series = raster_dataset.series_at_points(longitudes[:2], latitudes[:2], 2, 4)
+    assert series.tolist() == [[21.0, 31.0], [22.0, 32.0]]
+
+def test_series_at_pixels_matches_series_at_points(raster_dataset, longitudes, latitudes):
+    rows, columns, _ = raster_dataset.pixels_at_points(longitudes, latitudes)
+    series = raster_dataset.series_at_pixels(rows, columns)
+    assert series.tolist() == raster_dataset.series_at_points(longitudes, latitudes).tolist()
+
+def test_series_at_pixels_masks_indices_outside_dataset(raster_dataset):
+    mask = numpy.ma.getmaskarray(raster_dataset.series_at_pixels([0, -1, 2, 1], [1, 0, 0, 1]))
+    assert mask.any(axis=1).tolist() == [False, True, True, False]
+
+def test_series_at_pixels_clips_range_of_bands_to_dataset(raster_dataset):
+    series = raster_dataset.series_at_pixels([0, 5], [1, 0], 3, 100)
+    assert series.shape == (2, 2)
+    assert series[0].tolist() == [32, 42]
+    assert series.mask[1].all()
+
+def test_series_at_pixels_accepts_scalar_indices(raster_dataset):
+    assert raster_dataset.series_at_pixels(1, 1).tolist() == [[4, 14, 24, 34, 44]]
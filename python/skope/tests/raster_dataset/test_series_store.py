@@ -0,0 +1,88 @@
+'''Tests of RasterDataset instances backed by a series-major store.'''
+
+import os
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import RasterDataset, SeriesMajorStore, series_major_path
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def datafile_path(test_dataset_filename) -> str:
+    '''Create a new dataset file with a distinct value in every pixel of every band,
+    and a series-major store beside it.'''
+
+    datafile_path = test_dataset_filename(__file__)
+
+    raster_dataset = RasterDataset.create(datafile_path, 'GTiff',
+                                          gdal.GDT_Float32,
+                                          shape=(10, 2, 3),
+                                          origin=(-123, 45),
+                                          pixel_size=(1.0, 1.0),
+                                          coordinate_system='WGS84')
+
+    for band_index in range(0, 10):
+        raster_dataset.write_band(
+            band_index,
+            numpy.array([[1, 2, 3], [4, 5, 6]]) + 10 * band_index,
+            float('nan'))
+
+    raster_dataset.flush()
+
+    SeriesMajorStore.write(RasterDataset(datafile_path, lazy=True), max_chunk_bytes=50)
+
+    return datafile_path
+
+@pytest.fixture(scope='module')
+def raster_dataset(datafile_path) -> RasterDataset:
+    '''Return a RasterDataset for the test dataset file.'''
+    return RasterDataset(datafile_path)
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long, protected-access
+
+def test_store_is_written_beside_dataset_file(datafile_path):
+    assert os.path.isfile(series_major_path(datafile_path))
+
+def test_store_layout_is_series_major(datafile_path):
+    array = numpy.load(series_major_path(datafile_path), mmap_mode='r')
+    assert array.shape == (2, 3, 10)
+    assert array.flags.c_contiguous
+
+def test_dataset_is_backed_by_store(raster_dataset: RasterDataset):
+    assert isinstance(raster_dataset.series_store, SeriesMajorStore)
+    assert raster_dataset._array is None
+    assert raster_dataset.shape == (10, 2, 3)
+
+def test_series_at_pixel_is_read_from_store(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_pixel(1, 1).tolist() == [5.0, 15.0, 25.0, 35.0, 45.0, 55.0, 65.0, 75.0, 85.0, 95.0]
+    assert raster_dataset.series_at_pixel(0, 2, 5, 8).tolist() == [53.0, 63.0, 73.0]
+
+def test_series_at_pixel_without_copy_is_contiguous_view_of_store(raster_dataset: RasterDataset):
+    series_array = raster_dataset.series_at_pixel(1, 2, copy=False)
+    assert series_array.flags.c_contiguous
+    assert not series_array.flags.writeable
+
+def test_value_at_pixel_is_read_from_store(raster_dataset: RasterDataset):
+    assert raster_dataset.value_at_pixel(band_index=3, row=1, column=2) == 36
+
+def test_read_band_is_read_from_store(raster_dataset: RasterDataset):
+    assert raster_dataset.read_band(2).tolist() == [[21, 22, 23], [24, 25, 26]]
+
+def test_series_at_points_is_read_from_store(raster_dataset: RasterDataset):
+    assert raster_dataset.series_at_points([-123, -121], [45, 44], 0, 2).tolist() == [[1.0, 11.0], [6.0, 16.0]]
+
+def test_store_is_ignored_when_disabled(datafile_path):
+    assert RasterDataset(datafile_path, use_series_store=False).series_store is None
+
+def test_store_older_than_dataset_file_is_ignored(datafile_path):
+    stat = os.stat(datafile_path)
+    store_path = series_major_path(datafile_path)
+    os.utime(store_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1000000000))
+    try:
+        assert RasterDataset(datafile_path).series_store is None
+    finally:
+        os.utime(store_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
@@ -0,0 +1,100 @@
+'''Tests of RasterDataset instances viewing pixel values in shared memory.'''
+import os
+
+import pytest
+
+import numpy
+from osgeo import gdal, osr
+
+from skope import RasterDataset, SharedArray, SharedArrayPool, shared_array_name
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long, protected-access
+
+@pytest.fixture(scope='module')
+def dataset_path(test_dataset_filename) -> str:
+    '''Return the path to a 4-band, 2x3 pixel dataset file with a distinct value in
+    every pixel of every band.'''
+    path = test_dataset_filename(__file__)
+    gdal_dataset = gdal.GetDriverByName('GTiff').Create(path, 3, 2, 4, gdal.GDT_Float32)
+    gdal_dataset.SetGeoTransform((-123, 1.0, 0, 45, 0, -1.0))
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS('WGS84')
+    gdal_dataset.SetProjection(srs.ExportToWkt())
+    for band_index in range(4):
+        gdal_dataset.GetRasterBand(band_index + 1).WriteArray(
+            numpy.array([[1, 2, 3], [4, 5, 6]]) + 10 * band_index)
+    gdal_dataset = None
+    return path
+
+@pytest.fixture
+def pool(dataset_path):
+    '''Return a pool sharing the pixel values of the dataset file, closed after the test.'''
+    with SharedArrayPool() as pool:
+        pool.add(RasterDataset(dataset_path, lazy=True))
+        yield pool
+
+def test_pool_holds_pixel_values_of_dataset(pool: SharedArrayPool):
+    assert len(pool) == 1
+    assert pool.nbytes == 4 * 2 * 3 * 4
+
+def test_adding_dataset_twice_shares_it_once(pool: SharedArrayPool, dataset_path):
+    pool.add(RasterDataset(dataset_path, lazy=True))
+    assert len(pool) == 1
+
+@pytest.mark.usefixtures('pool')
+def test_dataset_attaches_to_shared_values(dataset_path):
+    raster_dataset = RasterDataset(dataset_path, shared_memory=True)
+    assert raster_dataset.shared
+    assert numpy.array_equal(raster_dataset._array, gdal.Open(dataset_path).ReadAsArray())
+
+@pytest.mark.usefixtures('pool')
+def test_shared_dataset_reports_no_bytes_held_in_memory(dataset_path):
+    assert RasterDataset(dataset_path, shared_memory=True).nbytes == 0
+
+@pytest.mark.usefixtures('pool')
+def test_series_at_pixel_reads_shared_values(dataset_path):
+    raster_dataset = RasterDataset(dataset_path, shared_memory=True)
+    assert raster_dataset.series_at_pixel(1, 2).tolist() == [6.0, 16.0, 26.0, 36.0]
+
+@pytest.mark.usefixtures('pool')
+def test_shared_values_are_read_only(dataset_path):
+    raster_dataset = RasterDataset(dataset_path, shared_memory=True)
+    with pytest.raises(ValueError):
+        raster_dataset._array[0, 0, 0] = 0
+
+def test_dataset_reads_values_when_none_are_shared(dataset_path):
+    raster_dataset = RasterDataset(dataset_path, shared_memory=True)
+    assert not raster_dataset.shared
+    assert raster_dataset.nbytes == 4 * 2 * 3 * 4
+
+@pytest.mark.usefixtures('pool')
+def test_dataset_ignores_values_shared_before_file_changed(dataset_path):
+    stat = os.stat(dataset_path)
+    os.utime(dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    try:
+        assert not RasterDataset(dataset_path, shared_memory=True).shared
+    finally:
+        os.utime(dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+def test_incomplete_shared_values_cannot_be_attached(dataset_path):
+    shared_array = SharedArray.create(shared_array_name(dataset_path), numpy.float32, (4, 2, 3))
+    try:
+        assert SharedArray.attach(shared_array.name) is None
+        assert not RasterDataset(dataset_path, shared_memory=True).shared
+        shared_array.mark_complete()
+        assert SharedArray.attach(shared_array.name) is not None
+    finally:
+        shared_array.close()
+
+def test_dataset_opened_before_values_are_shared_can_be_reopened(dataset_path):
+    raster_dataset = RasterDataset(dataset_path, shared_memory=True)
+    assert not raster_dataset.shared_values_available()
+    with SharedArrayPool() as pool:
+        pool.add(RasterDataset(dataset_path, lazy=True))
+        assert raster_dataset.shared_values_available()
+        assert not RasterDataset(dataset_path, shared_memory=True).shared_values_available()
+
+def test_closing_pool_unlinks_segments(dataset_path):
+    with SharedArrayPool() as pool:
+        pool.add(RasterDataset(dataset_path, lazy=True))
+    assert SharedArray.attach(shared_array_name(dataset_path)) is None
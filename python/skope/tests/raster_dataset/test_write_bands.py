@@ -0,0 +1,58 @@
+'''Tests of the RasterDataset write_bands method and of dataset creation options.'''
+import numpy
+import pytest
+from osgeo import gdal
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def band_stack() -> numpy.ndarray:
+    '''Return pixel values for a 6-band, 20x30 pixel dataset.'''
+    return numpy.arange(6 * 20 * 30, dtype=numpy.float32).reshape(6, 20, 30)
+
+@pytest.fixture(scope='module')
+def tiled_dataset(test_dataset_filename, band_stack) -> RasterDataset:
+    '''Return a lazy, tiled, compressed dataset written from a 3D array.'''
+    raster_dataset = RasterDataset.create(test_dataset_filename(__file__), 'GTiff',
+                                          gdal.GDT_Float32, shape=band_stack.shape,
+                                          origin=(-123, 45), pixel_size=(1.0, 1.0),
+                                          lazy=True,
+                                          options=['TILED=YES', 'BLOCKXSIZE=16',
+                                                   'BLOCKYSIZE=16', 'COMPRESS=DEFLATE',
+                                                   'NUM_THREADS=2'])
+    raster_dataset.write_bands(band_stack, nodata=-1)
+    return raster_dataset
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_creation_options_are_applied(tiled_dataset: RasterDataset):
+    gdal_dataset = gdal.Open(tiled_dataset.filename)
+    assert gdal_dataset.GetMetadata('IMAGE_STRUCTURE')['COMPRESSION'] == 'DEFLATE'
+    assert gdal_dataset.GetRasterBand(1).GetBlockSize() == [16, 16]
+
+def test_bands_written_from_array_are_in_file(tiled_dataset: RasterDataset, band_stack):
+    assert numpy.array_equal(gdal.Open(tiled_dataset.filename).ReadAsArray(), band_stack)
+
+def test_nodata_value_is_set_on_every_band(tiled_dataset: RasterDataset):
+    gdal_dataset = gdal.Open(tiled_dataset.filename)
+    assert [gdal_dataset.GetRasterBand(band_number).GetNoDataValue() for band_number in range(1, 7)] == [-1] * 6
+
+def test_bands_written_from_generator_starting_at_band_index(test_dataset_filename, band_stack):
+    path = test_dataset_filename(__file__).replace('.tif', '_generator.tif')
+    raster_dataset = RasterDataset.create(path, 'GTiff', gdal.GDT_Float32, shape=band_stack.shape,
+                                          origin=(-123, 45), pixel_size=(1.0, 1.0))
+    raster_dataset.write_bands((band for band in band_stack[2:]), begin=2)
+    assert numpy.array_equal(raster_dataset.read_band(0), numpy.zeros((20, 30)))
+    assert numpy.array_equal(raster_dataset.read_band(5), band_stack[5])
+    assert numpy.array_equal(gdal.Open(path).ReadAsArray()[2:], band_stack[2:])
+
+def test_bands_written_from_generator_reading_the_lazy_dataset(test_dataset_filename, band_stack):
+    path = test_dataset_filename(__file__).replace('.tif', '_doubled.tif')
+    raster_dataset = RasterDataset.create(path, 'GTiff', gdal.GDT_Float32, shape=band_stack.shape,
+                                          origin=(-123, 45), pixel_size=(1.0, 1.0), lazy=True)
+    raster_dataset.write_bands(band_stack)
+    raster_dataset.write_bands(raster_dataset.read_band(band_index) * 2
+                               for band_index in range(raster_dataset.bands))
+    assert numpy.array_equal(gdal.Open(path).ReadAsArray(), band_stack * 2)
@@ -0,0 +1,71 @@
+'''Tests of the RasterDataset write_pixel and write_pixels methods.'''
+import numpy
+import pytest
+from osgeo import gdal
+
+from skope import RasterDataset
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture
+def raster_dataset(test_dataset_filename) -> RasterDataset:
+    '''Return a new 3-band, 4x5 pixel dataset with all pixel values set to zero.'''
+    raster_dataset = RasterDataset.create(test_dataset_filename(__file__),
+                                          'GTiff', gdal.GDT_Float32,
+                                          shape=(3, 4, 5),
+                                          origin=(-123, 45),
+                                          pixel_size=(1.0, 1.0),
+                                          coordinate_system='WGS84')
+    for band_index in range(3):
+        raster_dataset.write_band(band_index, numpy.zeros((4, 5)), float('nan'))
+    raster_dataset.flush()
+    return raster_dataset
+
+def values_in_file(raster_dataset: RasterDataset) -> numpy.ndarray:
+    '''Flush the dataset and return its pixel values as read by GDAL.'''
+    raster_dataset.flush()
+    return gdal.Open(raster_dataset.filename).ReadAsArray()
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_write_pixel_updates_in_memory_values_without_flush(raster_dataset: RasterDataset):
+    raster_dataset.write_pixel(1, 2, 3, 7)
+    assert raster_dataset.value_at_pixel(1, 2, 3) == 7
+
+def test_write_pixel_writes_only_one_pixel_to_file(raster_dataset: RasterDataset):
+    raster_dataset.write_pixel(1, 2, 3, 7)
+    expected = numpy.zeros((3, 4, 5))
+    expected[1, 2, 3] = 7
+    assert numpy.array_equal(values_in_file(raster_dataset), expected)
+
+def test_write_pixels_writes_pixels_in_several_bands_and_blocks(raster_dataset: RasterDataset):
+    band_indexes = [0, 2, 0, 1, 2]
+    rows = [0, 3, 1, 2, 0]
+    columns = [0, 4, 2, 3, 1]
+    values = [1, 2, 3, 4, 5]
+    raster_dataset.write_pixels(band_indexes, rows, columns, values)
+    expected = numpy.zeros((3, 4, 5))
+    expected[band_indexes, rows, columns] = values
+    assert numpy.array_equal(raster_dataset._array, expected) # pylint: disable=protected-access
+    assert numpy.array_equal(values_in_file(raster_dataset), expected)
+
+def test_write_pixels_broadcasts_scalar_band_index_and_value(raster_dataset: RasterDataset):
+    raster_dataset.write_pixels(2, numpy.array([0, 1, 2, 3]), numpy.array([4, 3, 2, 1]), 9)
+    assert raster_dataset.read_band(2)[[0, 1, 2, 3], [4, 3, 2, 1]].tolist() == [9, 9, 9, 9]
+    assert values_in_file(raster_dataset)[2, [0, 1, 2, 3], [4, 3, 2, 1]].tolist() == [9, 9, 9, 9]
+
+def test_last_value_written_to_a_pixel_wins(raster_dataset: RasterDataset):
+    raster_dataset.write_pixels(0, [1, 1], [1, 1], [5, 6])
+    assert raster_dataset.value_at_pixel(0, 1, 1) == 6
+    assert values_in_file(raster_dataset)[0, 1, 1] == 6
+
+@pytest.mark.parametrize('band_index, row, column', [
+    (3, 0, 0), (-1, 0, 0), (0, 4, 0), (0, -1, 0), (0, 0, 5), (0, 0, -1)
+])
+def test_pixels_outside_dataset_are_rejected_without_writing(raster_dataset: RasterDataset,
+                                                             band_index, row, column):
+    with pytest.raises(IndexError):
+        raster_dataset.write_pixels([0, band_index], [1, row], [1, column], 8)
+    with pytest.raises(IndexError):
+        raster_dataset.write_pixel(band_index, row, column, 8)
+    assert not values_in_file(raster_dataset).any()
@@ -0,0 +1,66 @@
+'''Tests of the RasterDataset zonal series method.'''
+
+import pytest
+
+import numpy
+from osgeo import gdal
+
+from skope import RasterDataset, rasterize_geometry
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def raster_dataset(test_dataset_filename) -> RasterDataset:
+    '''Create a 3-band, 4x5 pixel dataset with one-degree pixels and one missing value.'''
+    raster_dataset = RasterDataset.create(test_dataset_filename(__file__), 'GTiff',
+                                          gdal.GDT_Float32, shape=(3, 4, 5),
+                                          origin=(-123, 45), pixel_size=(1.0, 1.0))
+    bands = numpy.arange(3 * 4 * 5, dtype=numpy.float32).reshape(3, 4, 5)
+    bands[2, 1, 1] = -9999
+    raster_dataset.write_bands(bands, nodata=-9999)
+    return raster_dataset
+
+def square(west, north, east, south) -> dict:
+    '''Return a GeoJSON Polygon for the rectangle with the given edges.'''
+    return {'type': 'Polygon', 'coordinates': [[[west, north], [east, north], [east, south],
+                                                [west, south], [west, north]]]}
+
+# pylint: disable=redefined-outer-name, missing-docstring, line-too-long
+
+def test_rasterize_geometry_returns_window_and_mask_of_pixel_centers(raster_dataset: RasterDataset):
+    window, mask = rasterize_geometry(square(-122.4, 43.9, -120.6, 41.9), raster_dataset.geotransform, (4, 5))
+    assert window == (1, 0, 3, 3)
+    assert mask.tolist() == [[False, True, True], [False, True, True], [False, False, False]]
+
+def test_rasterize_geometry_outside_grid_returns_empty_window(raster_dataset: RasterDataset):
+    window, mask = rasterize_geometry(square(-100, 10, -99, 9), raster_dataset.geotransform, (4, 5))
+    assert window[2:] == (0, 0)
+    assert mask.size == 0
+
+def test_zonal_series_computes_statistics_of_pixels_in_polygon(raster_dataset: RasterDataset):
+    statistics = raster_dataset.zonal_series(square(-122.4, 43.9, -120.6, 41.9))
+    # pixels (1, 1), (1, 2), (2, 1) and (2, 2) of each band
+    assert statistics['count'].tolist() == [4, 4, 3]
+    assert statistics['mean'].tolist() == [9.0, 29.0, (47 + 51 + 52) / 3]
+    assert statistics['min'].tolist() == [6.0, 26.0, 47.0]
+    assert statistics['max'].tolist() == [12.0, 32.0, 52.0]
+
+def test_zonal_series_of_multipolygon_combines_polygons(raster_dataset: RasterDataset):
+    geometry = {'type': 'MultiPolygon',
+                'coordinates': [square(-123, 45, -122, 44)['coordinates'],
+                                square(-119, 42, -118, 41)['coordinates']]}
+    statistics = raster_dataset.zonal_series(geometry, 0, 1)
+    assert statistics['count'].tolist() == [2]
+    assert statistics['mean'].tolist() == [(0 + 19) / 2]
+
+def test_zonal_series_in_small_chunks_matches_single_chunk(raster_dataset: RasterDataset):
+    geometry = square(-123, 45, -118, 41)
+    chunked = raster_dataset.zonal_series(geometry, max_chunk_bytes=1)
+    single = raster_dataset.zonal_series(geometry)
+    for name in ['mean', 'min', 'max', 'count']:
+        assert chunked[name].tolist() == single[name].tolist()
+
+def test_zonal_series_outside_coverage_has_no_values(raster_dataset: RasterDataset):
+    statistics = raster_dataset.zonal_series(square(-100, 10, -99, 9))
+    assert statistics['count'].tolist() == [0, 0, 0]
+    assert numpy.isnan(statistics['mean']).all()
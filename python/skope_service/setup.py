@@ -12,5 +12,6 @@ setup(
     packages=['skope_service'],
     package_dir={'': 'src'},
     data_files=[("", ["LICENSE.txt"])],
-    install_requires=['skope==0.1.0', 'typing >= 3.6.6', 'Flask >= 1.0.2']
+    install_requires=['skope==0.1.0', 'typing >= 3.6.6', 'Flask >= 1.0.2'],
+    extras_require={'arrow': ['pyarrow']}
 )
@@ -0,0 +1,190 @@
+'''ASGI variant of the timeseries service for asyncio servers such as uvicorn.'''
+import asyncio
+import io
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from skope_service.flask_app import app as flask_app
+
+class AsgiApp:
+    '''ASGI application serving the routes of a WSGI application, e.g. the Flask
+    timeseries service, from an asyncio event loop.  Each request is handled by
+    the WSGI application on a bounded pool of threads, where GDAL reads release the
+    GIL, while the event loop receives request bodies and sends responses, so slow
+    clients hold no thread.  Response bodies are produced one chunk at a time, each
+    chunk taking a thread only while it is produced, with the chunks of the WSGI
+    application joined on that thread into chunks of at least chunk_bytes bytes so
+    that small chunks cost neither a thread hop nor a send each.  At most
+    max_workers chunks are produced at once, and requests beyond max_pending in
+    flight are refused with 503 Service Unavailable, so that load is shed rather
+    than queued without bound.'''
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, wsgi_app, max_workers: int, max_pending: int,
+                 max_body_bytes: int = 16 * 1024 ** 2, chunk_bytes: int = 64 * 1024):
+        '''Initialize the application with a pool of max_workers threads, admitting
+        at most max_pending requests at once and request bodies of at most
+        max_body_bytes bytes, and sending response bodies in chunks of at least
+        chunk_bytes bytes but for the last.'''
+        self.wsgi_app = wsgi_app
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_body_bytes = max_body_bytes
+        self.chunk_bytes = chunk_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='skope-service')
+        self._semaphore = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        '''Return the number of requests in flight.'''
+        return self._pending
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        if self._pending >= self.max_pending:
+            await _send_error(send, 503, 'The service is handling too many requests.')
+            return
+        self._pending += 1
+        try:
+            body = await self._read_body(receive, send)
+            if body is None:
+                return
+            await self._respond(_wsgi_environ(scope, body), send)
+        finally:
+            self._pending -= 1
+
+    async def _respond(self, environ: dict, send) -> None:
+        '''Call the WSGI application for a request and send its response, taking a
+        thread from the pool to produce each chunk of the response body.'''
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):  # pylint: disable=unused-argument
+            response_start['status'] = int(status.split(' ', 1)[0])
+            response_start['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                         for name, value in headers]
+
+        response = []
+
+        def start():
+            response.append(self.wsgi_app(environ, start_response))
+            return self._next_chunk(iter(response[0]))
+
+        try:
+            chunks, chunk = await self._run(start)
+            await send({'type': 'http.response.start', 'status': response_start['status'],
+                        'headers': response_start['headers']})
+            while chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunks, chunk = await self._run(self._next_chunk, chunks)
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if response and hasattr(response[0], 'close'):
+                await self._run(response[0].close)
+
+    def _next_chunk(self, chunks):
+        '''Return the given iterator over the chunks of a WSGI response body along
+        with the next chunks joined until they hold at least chunk_bytes bytes or
+        the body ends, in which case the bytes joined are the last of the body.'''
+        joined = bytearray()
+        for chunk in chunks:
+            joined.extend(chunk)
+            if len(joined) >= self.chunk_bytes:
+                break
+        return chunks, bytes(joined)
+
+    async def _run(self, function, *args):
+        '''Call a function on the pool of threads once fewer than max_workers calls
+        are running, and return its result.'''
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _read_body(self, receive, send) -> bytes:
+        '''Return the body of a request, or None if the client disconnected before
+        sending all of it, or if it is larger than max_body_bytes, in which case the
+        request is refused with 413 Payload Too Large.'''
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.extend(message.get('body', b''))
+            if len(body) > self.max_body_bytes:
+                await _send_error(send, 413, 'The request body is too large.')
+                return None
+            if not message.get('more_body', False):
+                break
+        return bytes(body)
+
+    async def _lifespan(self, receive, send) -> None:
+        '''Handle the startup and shutdown events of the server, shutting down the
+        pool of threads when the server stops.'''
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+# Private helper methods
+
+def _wsgi_environ(scope: dict, body: bytes) -> dict:
+    '''Return the WSGI environment for an ASGI HTTP request with the given body.'''
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1')
+        value = value.decode('latin-1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'content-length':
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = environ[key] + ',' + value if key in environ else value
+    return environ
+
+async def _send_error(send, status: int, message: str) -> None:
+    '''Send a JSON response with the given status and message.'''
+    body = json.dumps({'status': status, 'message': message}).encode('utf-8')
+    headers = [(b'content-type', b'application/json'),
+               (b'content-length', str(len(body)).encode('latin-1'))]
+    if status == 503:
+        headers.append((b'retry-after', b'1'))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+# create the ASGI application serving the routes of the Flask application
+app = AsgiApp(  # pylint: disable=invalid-name
+    flask_app,
+    max_workers=flask_app.config['TIMESERIES_ASGI_MAX_WORKERS'],
+    max_pending=flask_app.config['TIMESERIES_ASGI_MAX_PENDING_REQUESTS'],
+    max_body_bytes=flask_app.config['TIMESERIES_ASGI_MAX_BODY_BYTES'],
+    chunk_bytes=flask_app.config['TIMESERIES_ASGI_CHUNK_BYTES'])
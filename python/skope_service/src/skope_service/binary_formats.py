@@ -0,0 +1,101 @@
+'''Binary encodings of timeseries response bodies.'''
+import io
+from typing import List
+
+import numpy
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None  # pylint: disable=invalid-name
+
+# MIME type of the raw little-endian bytes of the values of a response
+OCTET_STREAM = 'application/octet-stream'
+
+# MIME type of the values of a response as a NumPy .npy file
+NPY = 'application/x-npy'
+
+# MIME type of all series of a response as an Arrow IPC stream
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+def binary_mimetypes() -> List[str]:
+    '''Return the binary MIME types in which response bodies can be encoded.  The
+    Arrow IPC stream format is available only if pyarrow is installed.'''
+    if pyarrow is None:
+        return [OCTET_STREAM, NPY]
+    return [OCTET_STREAM, NPY, ARROW_STREAM]
+
+def encode_body(body: dict, mimetype: str) -> (bytes, dict):
+    '''Encode a timeseries response body, whose series fields hold numpy arrays, in
+    the given binary MIME type, and return the encoded bytes along with the headers
+    describing them.  The raw and .npy encodings hold the values field only, as a
+    1D array, or as a 2D array with one row per point for MultiPoint geometries,
+    in which the rows of points without series are zero and are listed in the
+    X-Missing-Rows header.  Raw bytes are little-endian, with the dtype and shape of
+    the array given in the X-Dtype and X-Shape headers.  The Arrow encoding holds a
+    table with one row per band and a column for each series field, with one
+    column per point for MultiPoint geometries.'''
+    headers = {
+        'X-Dataset-Id': body['datasetId'],
+        'X-Variable-Name': body['variableName'],
+        'X-Start': body['start'],
+        'X-End': body['end']
+    }
+    if body.get('partial'):
+        headers['X-Partial'] = 'true'
+    if mimetype == ARROW_STREAM:
+        return _arrow_stream(body), headers
+
+    array, missing_rows = _values_array(body['values'])
+    array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+    headers['X-Dtype'] = array.dtype.str
+    headers['X-Shape'] = ','.join(str(size) for size in array.shape)
+    if missing_rows:
+        headers['X-Missing-Rows'] = ','.join(str(row) for row in missing_rows)
+    if mimetype == NPY:
+        npy_file = io.BytesIO()
+        numpy.lib.format.write_array(npy_file, array, allow_pickle=False)
+        return npy_file.getvalue(), headers
+    return array.tobytes(), headers
+
+# Private helper methods
+
+def _values_array(values) -> (numpy.ndarray, List[int]):
+    '''Return the values field of a response body as one C-contiguous array, along
+    with the indices of the rows of points without series.'''
+    if isinstance(values, numpy.ndarray):
+        return numpy.ascontiguousarray(values), []
+
+    # a MultiPoint geometry has a series or None for each point
+    missing_rows = [row for row, series in enumerate(values) if series is None]
+    present = [series for series in values if series is not None]
+    if not present:
+        return numpy.zeros((len(values), 0)), missing_rows
+    array = numpy.zeros((len(values), len(present[0])), dtype=present[0].dtype)
+    for row, series in enumerate(values):
+        if series is not None:
+            array[row] = series
+    return array, missing_rows
+
+def _arrow_stream(body: dict) -> bytes:
+    '''Return the series fields of a response body as an Arrow IPC stream holding
+    one table, with the other fields of the body as metadata of its schema.'''
+    begin = int(body['start'])
+    bands = int(body['end']) - begin + 1
+    columns = {'band': pyarrow.array(numpy.arange(begin, begin + bands))}
+    for name in ['values', 'uncertainty', 'min', 'max', 'count']:
+        field = body.get(name)
+        if isinstance(field, numpy.ndarray):
+            columns[name] = pyarrow.array(field)
+        elif field is not None:
+            for point_index, series in enumerate(field):
+                columns['{}_{}'.format(name, point_index)] = (
+                    pyarrow.nulls(bands) if series is None else pyarrow.array(series))
+
+    metadata = {key: str(body[key]) for key in ['datasetId', 'variableName', 'start', 'end']}
+    metadata['partial'] = str(bool(body.get('partial'))).lower()
+    table = pyarrow.table(columns).replace_schema_metadata(metadata)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,120 @@
+'''Process-wide cache of opened RasterDataset instances.'''
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List
+
+from skope import RasterDataset
+from skope_service.single_flight import SingleFlight
+
+class DatasetCache:
+    '''Thread-safe LRU cache of RasterDataset instances bounded both by the
+    number of cached datasets and by the total bytes of pixel data they hold.
+    Cached datasets are reopened when the modification time of their files
+    changes, or when a reopen function says so.  Concurrent requests for a dataset
+    that is not cached wait for a single load of the dataset rather than each
+    loading it.'''
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, max_datasets: int, max_bytes: int,
+                 opener: Callable[[str], RasterDataset] = RasterDataset,
+                 reopen: Callable[[RasterDataset], bool] = None):
+        '''Initialize an empty cache holding at most max_datasets datasets and
+        at most max_bytes bytes of pixel data.  The opener function is called
+        with a file path to load each dataset not yet in the cache.  If a reopen
+        function is given, it is called with each cached dataset requested and
+        the dataset is reopened if it returns true, e.g. once pixel values that
+        were not yet shared when the dataset was opened have been shared.'''
+        self.max_datasets = max_datasets
+        self.max_bytes = max_bytes
+        self._opener = opener
+        self._reopen = reopen
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        '''Return the total bytes of pixel data held by the cached datasets.'''
+        with self._lock:
+            return self._total_bytes
+
+    def datasets(self) -> List[RasterDataset]:
+        '''Return the cached datasets, least recently used first.'''
+        with self._lock:
+            return [entry.dataset for entry in self._entries.values()]
+
+    def get(self, key: Hashable, path: str):
+        '''Return the dataset cached under key, opening the file at path if the
+        dataset is not cached or if the file has changed since it was opened.'''
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.path == path and entry.mtime == mtime:
+                self._entries.move_to_end(key)
+                dataset = entry.dataset
+            else:
+                dataset = None
+        if dataset is not None and (self._reopen is None or not self._reopen(dataset)):
+            return dataset
+
+        # open the dataset without holding the lock so that loads of other
+        # datasets are not serialized behind this one, sharing one load among
+        # concurrent requests for the same version of the same file
+        dataset = self._loads.do((key, path, mtime), lambda: self._opener(path))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.dataset is dataset:
+                self._entries.move_to_end(key)
+                return dataset
+            self._discard(key)
+            entry = _CacheEntry(dataset, path, mtime, dataset.nbytes)
+            self._entries[key] = entry
+            self._total_bytes += entry.nbytes
+            self._evict()
+
+        return dataset
+
+    def invalidate(self, key: Hashable) -> None:
+        '''Remove the dataset cached under key, if any.'''
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        '''Remove all datasets from the cache.'''
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.nbytes
+
+    def _evict(self) -> None:
+        # never evict the most recently added entry, even if it alone exceeds the byte limit
+        while len(self._entries) > 1 and (len(self._entries) > self.max_datasets or
+                                          self._total_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.nbytes
+
+# Private helper classes
+
+class _CacheEntry:
+    '''A cached dataset along with the path and modification time of its file
+    and the bytes of pixel data it held when cached.'''
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('dataset', 'path', 'mtime', 'nbytes')
+
+    def __init__(self, dataset, path: str, mtime: int, nbytes: int):
+        self.dataset = dataset
+        self.path = path
+        self.mtime = mtime
+        self.nbytes = nbytes
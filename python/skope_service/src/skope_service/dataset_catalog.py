@@ -0,0 +1,108 @@
+'''Index of the dataset files available to the timeseries service.'''
+import os
+import re
+import threading
+from string import Formatter
+from typing import List
+
+class CatalogEntry:
+    '''A dataset file found by a DatasetCatalog, along with the size and
+    modification time of the file when the catalog last scanned its directory.'''
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('path', 'size', 'mtime')
+
+    def __init__(self, path: str, size: int, mtime: int):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+
+    def __repr__(self):
+        return "CatalogEntry('{}')".format(self.path)
+
+class DatasetCatalog:
+    '''Thread-safe index of the dataset files in the directory named by a path
+    template such as '../data/{datasetId}_{variableName}', mapping each dataset
+    and variable to the file whose name is the expanded template followed by one
+    of the given extensions.  The directory is scanned once when the catalog is
+    created and again only when the modification time of the directory changes,
+    i.e. when files are added, removed, or renamed, so that each lookup costs one
+    stat of the directory and a dictionary hit rather than probes for each file.'''
+
+    def __init__(self, path_template: str, extensions: List[str],
+                 excluded_templates: List[str] = None):
+        '''Initialize the catalog and scan the directory named by path_template.
+        When files with the same name but different extensions exist, the file
+        whose extension comes first in extensions is used.  Files whose names match
+        any of the path templates in excluded_templates, e.g. the template naming
+        uncertainty files beside the value files, are not indexed.'''
+        self.path_template = path_template
+        self.extensions = list(extensions)
+        self._excluded_names = [_name_pattern(template) for template in excluded_templates or []]
+        self.directory = os.path.dirname(path_template) or os.curdir
+        self._entries = {}
+        self._directory_mtime = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def __len__(self):
+        self._refresh_if_changed()
+        with self._lock:
+            return len(self._entries)
+
+    def lookup(self, dataset_id: str, variable_name: str) -> CatalogEntry:
+        '''Return the entry for the file holding the given variable of the given
+        dataset, or None if there is no such file.'''
+        self._refresh_if_changed()
+        name = os.path.basename(self.path_template.format(datasetId=dataset_id,
+                                                          variableName=variable_name))
+        with self._lock:
+            return self._entries.get(name)
+
+    def refresh(self) -> None:
+        '''Rescan the directory, replacing the index of its dataset files.'''
+        try:
+            directory_mtime = os.stat(self.directory).st_mtime_ns
+            with os.scandir(self.directory) as directory_entries:
+                files = [entry for entry in directory_entries if entry.is_file()]
+        except FileNotFoundError:
+            directory_mtime, files = None, []
+
+        # index each file by its name without extension, preferring the file
+        # with the earliest listed extension when several share a name
+        entries = {}
+        for extension in reversed(self.extensions):
+            for file in files:
+                name, file_extension = os.path.splitext(file.name)
+                if file_extension == extension and not self._is_excluded(name):
+                    stat = file.stat()
+                    entries[name] = CatalogEntry(file.path, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            self._entries = entries
+            self._directory_mtime = directory_mtime
+
+    def _refresh_if_changed(self) -> None:
+        '''Rescan the directory if it has been modified since it was last scanned.'''
+        try:
+            directory_mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            directory_mtime = None
+        with self._lock:
+            changed = directory_mtime != self._directory_mtime
+        if changed:
+            self.refresh()
+
+    def _is_excluded(self, name: str) -> bool:
+        return any(pattern.fullmatch(name) for pattern in self._excluded_names)
+
+# Private helper methods
+
+def _name_pattern(path_template: str):
+    '''Return a compiled regular expression matching the file names, without
+    extension, that the file name in path_template expands to.'''
+    pattern = ''
+    for literal, field_name, _, _ in Formatter().parse(os.path.basename(path_template)):
+        pattern += re.escape(literal)
+        if field_name is not None:
+            pattern += '.+'
+    return re.compile(pattern)
@@ -3,13 +3,31 @@ import sys
 
 if 'pytest' not in sys.modules:
     TIMESERIES_SERVICE_BASE = '/timeseries-service/api/v1'
+    TIMESERIES_DATA_PATH_TEMPLATE = '../data/{datasetId}_{variableName}'
+    TIMESERIES_UNCERTAINTY_PATH_TEMPLATE = '../data/{datasetId}_{variableName}_uncertainty'
 else:
     TIMESERIES_SERVICE_BASE = ''
+    TIMESERIES_DATA_PATH_TEMPLATE = 'data/{datasetId}_{variableName}'
+    TIMESERIES_UNCERTAINTY_PATH_TEMPLATE = 'data/{datasetId}_{variableName}_uncertainty'
 
 TIMESERIES_SERVICE_NAME	= 'SKOPE Timeseries Service'
-TIMESERIES_DATA_PATH_TEMPLATE = '../data/{datasetId}_{variableName}'
-TIMESERIES_UNCERTAINTY_PATH_TEMPLATE = '../data/{datasetId}_{variableName}_uncertainty'
 TIMESERIES_DATA_FILE_EXTENSIONS = ['.tif', '.nc', '.nc4']
 TIMESERIES_GDALLOCATIONINFO_COMMAND = 'gdallocationinfo'
 TIMESERIES_ZONALINFO_COMMAND = 'python ../../geoserver-loader/scripts/zonalinfo.py'
 TIMESERIES_MAX_PROCESSING_TIME = 5000
+TIMESERIES_DATASET_CACHE_MAX_DATASETS = 16
+TIMESERIES_DATASET_CACHE_MAX_BYTES = 4 * 1024 ** 3
+TIMESERIES_LAZY_DATASETS = False
+TIMESERIES_MEMORY_MAP_DATASETS = False
+TIMESERIES_MASK_CACHE_MAX_BYTES = 256 * 1024 ** 2
+TIMESERIES_MASK_CACHE_DIRECTORY = None
+TIMESERIES_STREAM_MIN_VALUES = 100000
+TIMESERIES_RESPONSE_CACHE_MAX_BYTES = 64 * 1024 ** 2
+TIMESERIES_ASGI_MAX_WORKERS = 16
+TIMESERIES_ASGI_MAX_PENDING_REQUESTS = 4096
+TIMESERIES_ASGI_MAX_BODY_BYTES = 16 * 1024 ** 2
+TIMESERIES_ASGI_CHUNK_BYTES = 64 * 1024
+TIMESERIES_SHARED_MEMORY_DATASETS = False
+TIMESERIES_SHARED_MEMORY_PRELOAD = []
+TIMESERIES_WARMUP_MANIFEST = None
+TIMESERIES_WARMUP_THREADS = 4
@@ -1,8 +1,23 @@
 '''Define endpoints for timeseries service.'''
 
-from flask import Flask, jsonify, request
+import datetime
+import hashlib
+import json
+import math
+import os
 
-from skope import RasterDataset
+import numpy
+from flask import Flask, Response, abort, jsonify, request
+from werkzeug.http import is_resource_modified
+
+from skope import Deadline, DeadlineExceeded, MaskCache, RasterDataset
+from skope_service.binary_formats import binary_mimetypes, encode_body
+from skope_service.dataset_cache import DatasetCache
+from skope_service.dataset_catalog import DatasetCatalog
+from skope_service.json_stream import iter_json
+from skope_service.response_cache import ResponseCache
+from skope_service.single_flight import SingleFlight
+from skope_service.warmup import Warmup, read_manifest
 
 # create the Flask application instance
 app = Flask(__name__)  # pylint: disable=invalid-name
@@ -13,40 +28,424 @@ app.config.from_object('skope_service.default_settings')
 # extract the service base URI path from the configuration
 SERVICE_BASE = app.config['TIMESERIES_SERVICE_BASE']
 
+# index the dataset and uncertainty files available to the service
+dataset_catalog = DatasetCatalog(  # pylint: disable=invalid-name
+    path_template=app.config['TIMESERIES_DATA_PATH_TEMPLATE'],
+    extensions=app.config['TIMESERIES_DATA_FILE_EXTENSIONS'],
+    excluded_templates=[app.config['TIMESERIES_UNCERTAINTY_PATH_TEMPLATE']])
+uncertainty_catalog = DatasetCatalog(  # pylint: disable=invalid-name
+    path_template=app.config['TIMESERIES_UNCERTAINTY_PATH_TEMPLATE'],
+    extensions=app.config['TIMESERIES_DATA_FILE_EXTENSIONS'])
+
+# create the cache of opened datasets shared by all requests handled by this process
+dataset_cache = DatasetCache(  # pylint: disable=invalid-name
+    max_datasets=app.config['TIMESERIES_DATASET_CACHE_MAX_DATASETS'],
+    max_bytes=app.config['TIMESERIES_DATASET_CACHE_MAX_BYTES'],
+    opener=lambda path: RasterDataset(
+        path,
+        lazy=app.config['TIMESERIES_LAZY_DATASETS'],
+        memory_map=app.config['TIMESERIES_MEMORY_MAP_DATASETS'],
+        shared_memory=app.config['TIMESERIES_SHARED_MEMORY_DATASETS']),
+    reopen=(RasterDataset.shared_values_available
+            if app.config['TIMESERIES_SHARED_MEMORY_DATASETS'] else None))
+
+# create the cache of rasterized geometries shared by all datasets on the same grid
+mask_cache = MaskCache(  # pylint: disable=invalid-name
+    max_bytes=app.config['TIMESERIES_MASK_CACHE_MAX_BYTES'],
+    directory=app.config['TIMESERIES_MASK_CACHE_DIRECTORY'])
+
+# create the cache of extracted series shared by all requests handled by this process
+response_cache = ResponseCache(  # pylint: disable=invalid-name
+    max_bytes=app.config['TIMESERIES_RESPONSE_CACHE_MAX_BYTES'])
+
+# share each extraction of series among concurrent identical requests
+series_extractions = SingleFlight()  # pylint: disable=invalid-name
+
+# track the warm-up of the datasets listed in the manifest, started by each process
+# serving requests
+warmup = Warmup(max_workers=app.config['TIMESERIES_WARMUP_THREADS'])  # pylint: disable=invalid-name
+
+@app.before_request
+def start_warmup():
+    '''Start the warm-up of the datasets listed in the manifest in this process
+    unless it has been started already.  The warm-up is started on the first request
+    handled by each process rather than when the application is imported, so that
+    a server's master process neither loads the datasets nor passes a warm-up
+    without a thread to the workers it forks.  Servers may start it earlier, e.g.
+    from a gunicorn post_fork hook.  The manifest is read by the warm-up, which
+    reports a manifest that cannot be read in the status rather than failing the
+    request.'''
+    if not warmup.started:
+        manifest = app.config['TIMESERIES_WARMUP_MANIFEST']
+        warmup.start(_warm_dataset, (lambda: read_manifest(manifest)) if manifest else [])
+
 @app.route(SERVICE_BASE + '/status')
 def get_status():
-    '''Return the name and status of the timeseries service.'''
-    return jsonify({'name': app.config['TIMESERIES_SERVICE_NAME']})
+    '''Return the name and status of the timeseries service, including the progress
+    of the warm-up of the datasets listed in the manifest and the bytes of pixel
+    values of the cached datasets resident in memory, counting memory-mapped and
+    shared values, which the warm-up pages in, as resident.  The status is 503
+    Service Unavailable until the warm-up started in this process is finished, so
+    that load balancers can wait for the service to be ready.'''
+    status = {'name': app.config['TIMESERIES_SERVICE_NAME']}
+    status.update(warmup.status())
+    status['bytesResident'] = sum(dataset.resident_nbytes
+                                  for dataset in dataset_cache.datasets())
+    response = jsonify(status)
+    if not status['ready']:
+        response.status_code = 503
+    return response
 
 @app.route(SERVICE_BASE + '/timeseries/<dataset_id>/<variable_name>')
 def get_timeseries(dataset_id, variable_name):
-    '''Return the timeseries at specified point.'''
+    '''Return the timeseries at the point given by the longitude and latitude query
+    parameters, or for the GeoJSON geometry given by the boundaryGeometry parameter,
+    along with the matching uncertainties if the uncertainty parameter is true.'''
+
+    if 'boundaryGeometry' in request.args:
+        try:
+            geometry = json.loads(request.args.get('boundaryGeometry'))
+        except ValueError:
+            abort(400, 'The boundaryGeometry parameter is not valid JSON.')
+    else:
+        try:
+            coordinates = [float(request.args['longitude']), float(request.args['latitude'])]
+        except (KeyError, ValueError):
+            abort(400, 'The longitude and latitude parameters must both be given as numbers.')
+        geometry = {'type': 'Point', 'coordinates': coordinates}
 
-    longitude = float(request.args.get('longitude'))
-    latitude = float(request.args.get('latitude'))
-    start = request.args.get('start')
-    end = request.args.get('end')
+    return _timeseries_response(dataset_id, variable_name, geometry,
+                                request.args.get('start'), request.args.get('end'),
+                                request.args.get('uncertainty', 'false').lower() == 'true')
 
-    raster_dataset = RasterDataset(
-        'data/' + dataset_id + '_' + variable_name + '.tif')
+@app.route(SERVICE_BASE + '/timeseries/<dataset_id>/<variable_name>', methods=['POST'])
+def post_timeseries(dataset_id, variable_name):
+    '''Return the timeseries for the GeoJSON geometry in the request body, along
+    with the matching uncertainties if the uncertainty property of the body is true.'''
 
-    begin = None if start is None else int(start)
-    end = None if end is None else int(end) + 1
-    series = list(raster_dataset.series_at_point(longitude, latitude, begin, end))
+    request_body = request.get_json(force=True)
+    if not isinstance(request_body, dict) or 'boundaryGeometry' not in request_body:
+        abort(400, 'The request body must be a JSON object with a boundaryGeometry property.')
+
+    return _timeseries_response(dataset_id, variable_name, request_body['boundaryGeometry'],
+                                request_body.get('start'), request_body.get('end'),
+                                bool(request_body.get('uncertainty', False)))
+
+def _timeseries_response(dataset_id, variable_name, geometry, start, end, uncertainty=False):
+    '''Return the response holding the timeseries of the given dataset and variable
+    for the given GeoJSON geometry in the inclusive range of bands from start to end.
+    If uncertainty is true, the matching series of the uncertainty dataset for the
+    variable are returned in the uncertainty field.  The extraction is given
+    TIMESERIES_MAX_PROCESSING_TIME milliseconds from when the datasets are opened,
+    which is not limited, after which the values extracted so far are returned and
+    marked partial, and the time taken is reported in the processingTime field and
+    the Server-Timing header.  Responses holding at least
+    TIMESERIES_STREAM_MIN_VALUES values are streamed.  The response is JSON unless
+    the Accept header of the request prefers one of the binary formats.
+
+    Complete series are cached under the normalized request, with points snapped
+    to the pixels containing them, until the dataset files change.  Concurrent
+    requests with the same normalized request share one extraction if it completes
+    within the processing time left to each request, and otherwise each request
+    extracts the series under its own deadline.  Responses to GET requests carry
+    a weak ETag, since responses to the same normalized request hold the same
+    series but not the same bytes, and a Last-Modified date, both derived from the
+    normalized request and the dataset files.  Conditional requests for unchanged
+    responses are answered with 304 Not Modified without extracting the series.'''
+    # pylint: disable=too-many-locals
+
+    _validate_geometry(geometry)
+    raster_dataset = _get_raster_dataset(dataset_id, variable_name)
+    datasets = [raster_dataset]
+    if uncertainty:
+        datasets.append(_get_uncertainty_dataset(dataset_id, variable_name, raster_dataset))
+    deadline = Deadline(app.config['TIMESERIES_MAX_PROCESSING_TIME'] / 1000)
+
+    try:
+        begin = 0 if start is None else int(start)
+        end = raster_dataset.bands if end is None else int(end) + 1
+    except (TypeError, ValueError):
+        abort(400, 'The start and end of the timeseries must be band indexes.')
+    if not 0 <= begin <= end <= raster_dataset.bands:
+        abort(400, 'The start and end of the timeseries must lie within the {} bands of '
+              'the dataset.'.format(raster_dataset.bands))
+
+    mimetype = request.accept_mimetypes.best_match(['application/json'] + binary_mimetypes(),
+                                                   default='application/json')
+    cache_key = (dataset_id, variable_name, begin, end, uncertainty,
+                 _geometry_key(raster_dataset, geometry))
+    file_stamps = tuple((stat.st_mtime_ns, stat.st_size)
+                        for stat in (os.stat(dataset.filename) for dataset in datasets))
+    etag = hashlib.sha256(repr((cache_key, file_stamps, mimetype)).encode('utf-8')).hexdigest()
+    last_modified = datetime.datetime.fromtimestamp(
+        max(mtime for mtime, _ in file_stamps) // 10 ** 9, datetime.timezone.utc)
+    if request.method == 'GET' and not is_resource_modified(
+            request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        response.vary.add('Accept')
+        return response
 
     response_body = {
         'datasetId': dataset_id,
         'variableName': variable_name,
-        'boundaryGeometry': {
-            'type': 'Point',
-            'coordinates': [longitude, latitude]
-        },
-        'start': '0' if begin is None else str(begin),
-        'end': '4' if end is None else str(end-1),
-        'values': series
+        'boundaryGeometry': geometry,
+        'start': str(begin),
+        'end': str(end-1)
     }
+    series_fields = response_cache.get(cache_key, file_stamps)
+    if series_fields is None:
+        series_fields = series_extractions.do(
+            (cache_key, file_stamps),
+            lambda: _series_for_geometry(datasets, geometry, begin, end, deadline),
+            timeout=deadline.remaining,
+            reusable=lambda fields, error: error is None and not fields.get('partial'))
+        if not series_fields.get('partial'):
+            response_cache.put(cache_key, file_stamps, series_fields)
+    response_body.update(series_fields)
+
+    processing_time = deadline.elapsed * 1000
+    response_body['processingTime'] = round(processing_time, 3)
+    if mimetype == 'application/json':
+        response = _json_response(response_body)
+    else:
+        data, headers = encode_body(response_body, mimetype)
+        response = Response(data, mimetype=mimetype, headers=headers)
+    response.vary.add('Accept')
+    response.headers['Server-Timing'] = 'extract;dur={:.3f}'.format(processing_time)
+    if request.method == 'GET' and not response_body.get('partial'):
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+    return response
+
+def _series_for_geometry(datasets, geometry, begin, end, deadline):
+    '''Return the fields of the response body holding the series of values for the
+    given GeoJSON Point, MultiPoint, Polygon, or MultiPolygon geometry, as numpy
+    arrays, from the first of the given datasets, and the matching series of
+    uncertainties from the second if given.  The datasets share one pixel grid, so
+    the pixels covered by the geometry are found once for both.  If the deadline
+    passes before the series are complete, the fields hold the partial series, the
+    partial field is true, and the end field is the last band included.'''
+
+    geometry_type = geometry.get('type')
+    if geometry_type == 'Point':
+        return _point_fields(datasets, geometry, begin, end, deadline)
+    if geometry_type == 'MultiPoint':
+        return _multipoint_fields(datasets, geometry, begin, end, deadline)
+    if geometry_type in ('Polygon', 'MultiPolygon'):
+        return _zonal_fields(datasets, geometry, begin, end, deadline)
+    abort(400, 'Unsupported boundaryGeometry type: {}'.format(geometry_type))
+
+def _point_fields(datasets, geometry, begin, end, deadline):
+    '''Return the fields of the response body holding the series for a GeoJSON
+    Point geometry, as for _series_for_geometry.'''
+    longitude, latitude = geometry['coordinates'][:2]
+    row, column, in_coverage = datasets[0].pixels_at_points(longitude, latitude)
+    if not in_coverage:
+        abort(400, 'The point ({}, {}) is outside the dataset coverage.'.format(
+            longitude, latitude))
+    series, complete = _extract(lambda dataset: dataset.series_at_pixel(
+        int(row), int(column), begin, end, copy=False, deadline=deadline), datasets)
+    length = min(0 if values is None else len(values) for values in series)
+    fields = {name: _point_values(values, dataset, length)
+              for name, values, dataset in zip(['values', 'uncertainty'], series, datasets)}
+    return fields if complete else _partial_fields(fields, begin, length)
+
+def _multipoint_fields(datasets, geometry, begin, end, deadline):
+    '''Return the fields of the response body holding the series for a GeoJSON
+    MultiPoint geometry, as for _series_for_geometry.'''
+    points = numpy.array([point[:2] for point in geometry['coordinates']],
+                         dtype=numpy.float64)
+    rows, columns, _ = datasets[0].pixels_at_points(points[:, 0], points[:, 1])
+    series, complete = _extract(lambda dataset: dataset.series_at_pixels(
+        rows, columns, begin, end, deadline=deadline), datasets)
+    fields = {name: _multipoint_values(values, len(points))
+              for name, values in zip(['values', 'uncertainty'], series)}
+    return fields if complete else _partial_fields(fields, begin, end - begin)
+
+def _zonal_fields(datasets, geometry, begin, end, deadline):
+    '''Return the fields of the response body holding the zonal statistics for a
+    GeoJSON Polygon or MultiPolygon geometry, as for _series_for_geometry.'''
+    try:
+        statistics, complete = _extract(lambda dataset: dataset.zonal_series(
+            geometry, begin, end, mask_cache=mask_cache, deadline=deadline), datasets)
+    except ValueError as error:
+        abort(400, str(error))
+    length = min(0 if values is None else len(values['mean']) for values in statistics)
+    fields = {
+        'values': statistics[0]['mean'][:length],
+        'min': statistics[0]['min'][:length],
+        'max': statistics[0]['max'][:length],
+        'count': statistics[0]['count'][:length]
+    }
+    if len(statistics) > 1:
+        fields['uncertainty'] = statistics[1]['mean'][:length] if length else []
+    return fields if complete else _partial_fields(fields, begin, length)
+
+def _validate_geometry(geometry):
+    '''Abort with 400 Bad Request unless geometry is a GeoJSON Point, MultiPoint,
+    Polygon, or MultiPolygon geometry with well-formed numeric coordinates.'''
+    if not isinstance(geometry, dict):
+        abort(400, 'The boundaryGeometry must be a GeoJSON geometry object.')
+    geometry_type = geometry.get('type')
+    depth = {'Point': 0, 'MultiPoint': 1, 'Polygon': 2, 'MultiPolygon': 3}.get(geometry_type)
+    if depth is None:
+        abort(400, 'Unsupported boundaryGeometry type: {}'.format(geometry_type))
+    if not _valid_coordinates(geometry.get('coordinates'), depth):
+        abort(400, 'The coordinates of the {} boundaryGeometry are malformed.'.format(
+            geometry_type))
+
+def _valid_coordinates(coordinates, depth):
+    '''Return true if coordinates are a GeoJSON position of at least two finite
+    numbers, for depth zero, or a non-empty list of valid coordinates of one
+    less depth.'''
+    if not isinstance(coordinates, list) or not coordinates:
+        return False
+    if depth == 0:
+        return len(coordinates) >= 2 and all(
+            isinstance(number, (int, float)) and not isinstance(number, bool) and
+            math.isfinite(number) for number in coordinates)
+    return all(_valid_coordinates(item, depth - 1) for item in coordinates)
+
+def _geometry_key(raster_dataset, geometry):
+    '''Return a hashable key identifying the pixels of the given dataset covered by
+    a GeoJSON geometry, so that points falling in the same pixels share a key.'''
+    geometry_type = geometry.get('type')
+    if geometry_type == 'Point':
+        longitude, latitude = geometry['coordinates'][:2]
+        row, column, _ = raster_dataset.pixels_at_points(longitude, latitude)
+        return geometry_type, int(row), int(column)
+    if geometry_type == 'MultiPoint':
+        points = numpy.array([point[:2] for point in geometry['coordinates']],
+                             dtype=numpy.float64)
+        rows, columns, _ = raster_dataset.pixels_at_points(points[:, 0], points[:, 1])
+        return geometry_type, tuple(rows.tolist()), tuple(columns.tolist())
+    return geometry_type, json.dumps(geometry, sort_keys=True)
+
+def _extract(extract, datasets):
+    '''Call an extraction function, which applies a deadline, with each dataset in
+    turn, and return a list of the results along with true if every extraction
+    finished before the deadline.  Otherwise the list holds the partial result of
+    the interrupted extraction and None for each extraction not begun, and false is
+    returned.  Abort with 503 Service Unavailable if the deadline passed before any
+    values were extracted from the first dataset.'''
+    results = []
+    for dataset in datasets:
+        try:
+            results.append(extract(dataset))
+        except DeadlineExceeded as error:
+            if error.partial is None and not results:
+                abort(503, 'The request could not be processed within {} ms.'.format(
+                    app.config['TIMESERIES_MAX_PROCESSING_TIME']))
+            results.append(error.partial)
+            results.extend([None] * (len(datasets) - len(results)))
+            return results, False
+    return results, True
+
+def _partial_fields(fields, begin, length):
+    '''Return the fields of a response body holding partial series of the given
+    length, marked partial and with the end field set to the last band included.'''
+    fields['partial'] = True
+    fields['end'] = str(begin + length - 1)
+    return fields
+
+def _point_values(series, dataset, length):
+    '''Return the first length values of a series extracted from a dataset, or an
+    empty array of the pixel type of the dataset if the series was not begun before
+    the deadline, so that binary responses describe even empty series correctly.'''
+    if series is None:
+        return numpy.empty(0, dataset._dtype)  # pylint: disable=protected-access
+    return series[:length]
+
+def _multipoint_values(series, count):
+    '''Return the series of values at each of count points as a list of arrays,
+    with None in place of the series for points outside the dataset coverage, or not
+    read before the deadline.'''
+    if series is None:
+        return [None] * count
+    return [None if point_mask else point_series
+            for point_series, point_mask
+            in zip(series.data, numpy.ma.getmaskarray(series).any(axis=1))]
+
+def _json_response(body):
+    '''Return a JSON response holding a body whose fields may hold numpy arrays.
+    Bodies holding at least TIMESERIES_STREAM_MIN_VALUES values are streamed as the
+    JSON text is produced, so that neither the text nor lists of Python numbers
+    for the whole body are held in memory.'''
+    if _count_values(body) >= app.config['TIMESERIES_STREAM_MIN_VALUES']:
+        return Response(iter_json(body), mimetype='application/json')
+    return jsonify(_json_fields(body))
+
+def _count_values(value):
+    '''Return the number of elements of the numpy arrays in a response body.'''
+    if isinstance(value, dict):
+        return sum(_count_values(item) for item in value.values())
+    if isinstance(value, list):
+        return sum(_count_values(item) for item in value)
+    return value.size if isinstance(value, numpy.ndarray) else 0
+
+def _json_fields(value):
+    '''Return a response body with each numpy array replaced by a list of numbers.'''
+    if isinstance(value, dict):
+        return {key: _json_fields(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_fields(item) for item in value]
+    return _json_values(value) if isinstance(value, numpy.ndarray) else value
+
+def _json_values(array):
+    '''Return the values in a numpy array as a list of Python numbers, with NaN
+    and infinite values replaced by None so that they are serialized as null, as
+    they are in streamed responses.'''
+    values = array.tolist()
+    if array.dtype.kind == 'f':
+        return [value if math.isfinite(value) else None for value in values]
+    return values
+
+def _get_raster_dataset(dataset_id, variable_name):
+    '''Return the cached RasterDataset for the given dataset and variable, or abort
+    with 404 Not Found if the catalog holds no file for them.'''
+    entry = dataset_catalog.lookup(dataset_id, variable_name)
+    if entry is None:
+        abort(404, 'No data found for variable {} of dataset {}.'.format(
+            variable_name, dataset_id))
+    return dataset_cache.get((dataset_id, variable_name), entry.path)
+
+def _get_uncertainty_dataset(dataset_id, variable_name, raster_dataset):
+    '''Return the cached RasterDataset holding the uncertainties of the given
+    variable of the given dataset, whose values are held by raster_dataset, or abort
+    with 404 Not Found if there is none.  Abort with 500 Internal Server Error if
+    the uncertainties are not on the same pixel grid as the values.'''
+    entry = uncertainty_catalog.lookup(dataset_id, variable_name)
+    if entry is None:
+        abort(404, 'No uncertainty data found for variable {} of dataset {}.'.format(
+            variable_name, dataset_id))
+    uncertainty_dataset = dataset_cache.get((dataset_id, variable_name, 'uncertainty'),
+                                            entry.path)
+    if (tuple(uncertainty_dataset.geotransform) != tuple(raster_dataset.geotransform) or
+            uncertainty_dataset.shape[1:] != raster_dataset.shape[1:]):
+        abort(500, 'The uncertainty data for variable {} of dataset {} are not on the '
+              'same grid as the values.'.format(variable_name, dataset_id))
+    return uncertainty_dataset
 
-    return jsonify(response_body)
+def _warm_dataset(dataset_id, variable_name):
+    '''Open the given variable of the given dataset and its uncertainties, if any,
+    into the dataset cache, reading through the pixel values of lazy and
+    memory-mapped datasets so that the operating system pages them in.  Raise
+    FileNotFoundError if the catalog holds no file for the variable.'''
+    entry = dataset_catalog.lookup(dataset_id, variable_name)
+    if entry is None:
+        raise FileNotFoundError('No data found for variable {} of dataset {}.'.format(
+            variable_name, dataset_id))
+    datasets = [dataset_cache.get((dataset_id, variable_name), entry.path)]
+    entry = uncertainty_catalog.lookup(dataset_id, variable_name)
+    if entry is not None:
+        datasets.append(dataset_cache.get((dataset_id, variable_name, 'uncertainty'),
+                                          entry.path))
+    for dataset in datasets:
+        if dataset.series_store is None and (dataset.lazy or dataset.memory_mapped):
+            for _, band in dataset.iter_bands(prefetch=True):
+                band.max()
 
 if __name__ == '__main__':
     app.run(port=8001, debug=True)
@@ -0,0 +1,71 @@
+'''Incremental JSON encoding of response bodies holding numpy arrays.'''
+import json
+from typing import Iterator
+
+import numpy
+
+# Number of array elements formatted at a time when streaming an array
+CHUNK_VALUES = 4096
+
+def iter_json(value, chunk_values: int = CHUNK_VALUES) -> Iterator[str]:
+    '''Yield the JSON text of a value made of dictionaries, lists, tuples, numpy
+    arrays, and values that json.dumps accepts, piece by piece, so that the text of
+    a large array is never held in memory at once.  Arrays are formatted
+    chunk_values elements at a time, with NaN and infinite values written as null.'''
+    if isinstance(value, dict):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield (',' if index else '') + json.dumps(str(key)) + ':'
+            yield from iter_json(item, chunk_values)
+        yield '}'
+    elif isinstance(value, numpy.ndarray) and value.ndim > 0:
+        yield from iter_json_array(value, chunk_values)
+    elif isinstance(value, (list, tuple)):
+        yield '['
+        for index, item in enumerate(value):
+            if index:
+                yield ','
+            yield from iter_json(item, chunk_values)
+        yield ']'
+    elif isinstance(value, (numpy.generic, numpy.ndarray)):
+        yield from iter_json_array(numpy.asarray(value).reshape(1), chunk_values, bare=True)
+    else:
+        yield json.dumps(value)
+
+def iter_json_array(array: numpy.ndarray, chunk_values: int = CHUNK_VALUES,
+                    bare: bool = False) -> Iterator[str]:
+    '''Yield the JSON text of a numpy array of numbers, with one nested JSON
+    array per dimension, formatting chunk_values elements at a time.  NaN and
+    infinite values are written as null.  If bare is true the brackets around a
+    one-dimensional array are omitted.'''
+    if array.ndim > 1:
+        yield '['
+        for index, row in enumerate(array):
+            if index:
+                yield ','
+            yield from iter_json_array(row, chunk_values)
+        yield ']'
+        return
+
+    if not bare:
+        yield '['
+    for begin in range(0, len(array), chunk_values):
+        yield (',' if begin else '') + ','.join(_format_values(array[begin:begin + chunk_values]))
+    if not bare:
+        yield ']'
+
+# Private helper methods
+
+def _format_values(values: numpy.ndarray) -> list:
+    '''Return the JSON text of each number in a 1D numpy array as a list of strings,
+    formatting integer and boolean values with one vectorized conversion.
+    Floating-point values are written as json.dumps writes the Python floats that
+    tolist returns, so values of any precision are written as jsonify writes them.'''
+    if values.dtype.kind == 'b':
+        return numpy.where(values, 'true', 'false').tolist()
+    if values.dtype.kind != 'f':
+        return values.astype(str).tolist()
+    text = [float.__repr__(value) for value in values.tolist()]
+    for index in numpy.flatnonzero(~numpy.isfinite(values)):
+        text[index] = 'null'
+    return text
@@ -0,0 +1,92 @@
+'''Process-wide cache of the series extracted for timeseries requests.'''
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+import numpy
+
+class ResponseCache:
+    '''Thread-safe LRU cache of the series fields of timeseries responses, keyed by
+    a normalized request and bounded by the bytes of the cached arrays.  Each
+    entry is stored with a stamp, e.g. the modification times of the dataset files
+    it was extracted from, and is discarded when looked up with a different stamp.'''
+
+    def __init__(self, max_bytes: int):
+        '''Initialize an empty cache holding at most max_bytes bytes of arrays.'''
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        '''Return the total bytes of the cached arrays.'''
+        with self._lock:
+            return self._total_bytes
+
+    def get(self, key: Hashable, stamp: Hashable):
+        '''Return the fields cached under key with the given stamp, or None if
+        there are none.  Fields cached under key with another stamp are discarded.'''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != stamp:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, stamp: Hashable, fields: dict) -> None:
+        '''Cache a copy of the given fields under key with the given stamp.  The
+        arrays in the fields are copied so that the cache never holds views of the
+        pixel values of a dataset, which would keep the whole dataset in memory.'''
+        fields = _copy_arrays(fields)
+        nbytes = _count_bytes(fields)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (stamp, fields, nbytes)
+            self._total_bytes += nbytes
+
+            # evict least recently used entries, always keeping the one just added
+            while len(self._entries) > 1 and self._total_bytes > self.max_bytes:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+
+    def clear(self) -> None:
+        '''Remove all entries from the cache.'''
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+# Private helper methods
+
+def _copy_arrays(value):
+    '''Return a copy of a structure of dictionaries and lists with each numpy array
+    replaced by a read-only copy.'''
+    if isinstance(value, dict):
+        return {key: _copy_arrays(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_arrays(item) for item in value]
+    if isinstance(value, numpy.ndarray):
+        value = numpy.array(value)
+        value.flags.writeable = False
+    return value
+
+def _count_bytes(value) -> int:
+    '''Return the total bytes of the numpy arrays in a structure of dictionaries
+    and lists.'''
+    if isinstance(value, dict):
+        return sum(_count_bytes(item) for item in value.values())
+    if isinstance(value, list):
+        return sum(_count_bytes(item) for item in value)
+    return value.nbytes if isinstance(value, numpy.ndarray) else 0
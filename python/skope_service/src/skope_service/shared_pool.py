@@ -0,0 +1,55 @@
+'''Preloading of datasets into shared memory for the workers of a multi-process server.
+
+The pixel values of the datasets listed in TIMESERIES_SHARED_MEMORY_PRELOAD are
+copied once into shared memory, either by a sidecar process started beside the
+server from the same working directory,
+
+    python -m skope_service.shared_pool
+
+or by the master process of a gunicorn server, calling preload_shared_datasets
+from its when_ready hook and closing the returned pool from its on_exit hook.
+Workers attach to the shared values when TIMESERIES_SHARED_MEMORY_DATASETS is true.'''
+import signal
+import threading
+from typing import Iterable, Tuple
+
+from skope import RasterDataset, SharedArrayPool
+from skope_service.flask_app import app, dataset_catalog, uncertainty_catalog
+
+def preload_shared_datasets(dataset_keys: Iterable[Tuple[str, str]] = None) -> SharedArrayPool:
+    '''Copy the pixel values of the given (datasetId, variableName) pairs, or of the
+    pairs listed in TIMESERIES_SHARED_MEMORY_PRELOAD if none are given, along with
+    their uncertainties where there are any, into a new SharedArrayPool and return
+    the pool.  Raise FileNotFoundError if the catalog holds no file for a pair.'''
+    if dataset_keys is None:
+        dataset_keys = app.config['TIMESERIES_SHARED_MEMORY_PRELOAD']
+
+    pool = SharedArrayPool()
+    try:
+        for dataset_id, variable_name in dataset_keys:
+            entry = dataset_catalog.lookup(dataset_id, variable_name)
+            if entry is None:
+                raise FileNotFoundError('No data found for variable {} of dataset {}.'.format(
+                    variable_name, dataset_id))
+            entries = [entry, uncertainty_catalog.lookup(dataset_id, variable_name)]
+            for entry in entries:
+                if entry is not None:
+                    pool.add(RasterDataset(entry.path, lazy=True, use_series_store=False))
+    except BaseException:
+        pool.close()
+        raise
+    return pool
+
+def main():
+    '''Preload the configured datasets and hold them in shared memory until the
+    process is interrupted or terminated.'''
+    stopped = threading.Event()
+    for signal_number in [signal.SIGINT, signal.SIGTERM]:
+        signal.signal(signal_number, lambda *args: stopped.set())
+
+    with preload_shared_datasets() as pool:
+        print('Sharing {} datasets in {} bytes.'.format(len(pool), pool.nbytes), flush=True)
+        stopped.wait()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''Deduplication of concurrent identical calls.'''
+import threading
+from typing import Callable, Hashable, Optional
+
+class SingleFlight:
+    '''Thread-safe coordinator of calls identified by keys, ensuring that only one
+    call with a given key is in flight at a time.  Threads making a call with the
+    key of a call already in flight wait for that call to finish and share its
+    result, or its exception, instead of repeating the work.'''
+
+    def __init__(self):
+        '''Initialize a coordinator with no calls in flight.'''
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, function: Callable[[], object], timeout: float = None,
+           reusable: Callable[[object, Optional[BaseException]], bool] = None):
+        '''Call function and return its result, unless a call with the same key is
+        already in flight, in which case wait for that call and return its result
+        or raise its exception.  A waiting thread instead calls function itself,
+        without sharing the call with other threads, if the call in flight does not
+        finish within timeout seconds, or if reusable is given and returns false
+        when called with the result and exception, or None, of the call in flight.'''
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout) or (
+                    reusable is not None and not reusable(call.result, call.error)):
+                return function()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+# Private helper classes
+
+class _Call:
+    '''A call in flight along with its result or exception once finished.'''
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
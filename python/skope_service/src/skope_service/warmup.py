@@ -0,0 +1,131 @@
+'''Warm-up of the datasets listed in a manifest when the service starts.'''
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Tuple, Union
+
+def read_manifest(path: str) -> List[Tuple[str, str]]:
+    '''Return the (datasetId, variableName) pairs listed in the manifest at path, a
+    JSON array of objects each with datasetId and variableName properties.'''
+    with open(path) as manifest_file:
+        manifest = json.load(manifest_file)
+    return [(entry['datasetId'], entry['variableName']) for entry in manifest]
+
+class Warmup:
+    '''Background loading of datasets on a pool of threads, tracking the datasets
+    loaded and failed so far and the time taken, so that the service can report
+    when it is ready to answer requests without loading datasets first.  Each
+    process runs its own warm-up, as the caches it fills belong to the process.'''
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, max_workers: int):
+        '''Initialize a warm-up loading at most max_workers datasets at once.'''
+        self.max_workers = max_workers
+        self._loaded = []
+        self._failed = []
+        self._pid = None
+        self._started = None
+        self._finished = None
+        self._error = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        '''Return true if the warm-up has been started in this process.'''
+        return self._pid == os.getpid()
+
+    @property
+    def ready(self) -> bool:
+        '''Return true once every dataset has been loaded or has failed to load in
+        a warm-up started in this process.'''
+        return self.started and self._done.is_set()
+
+    def start(self, load: Callable[[str, str], None],
+              dataset_keys: Union[Iterable[Tuple[str, str]],
+                                  Callable[[], Iterable[Tuple[str, str]]]]) -> None:
+        '''Start calling load with each of the given (datasetId, variableName) pairs
+        on a background thread, returning immediately, unless the warm-up has
+        already been started in this process.  The pairs may instead be given by a
+        function, e.g. one reading a manifest, which is called on the background
+        thread, so that if it raises an exception the warm-up finishes and reports
+        the exception as its error.  A warm-up started by a process before it forked
+        this one is started afresh, as its thread does not run here.'''
+        if not callable(dataset_keys):
+            dataset_keys = list(dataset_keys)
+        with self._lock:
+            if self.started:
+                return
+            self._pid = os.getpid()
+            self._loaded = []
+            self._failed = []
+            self._started = time.monotonic()
+            self._finished = None
+            self._error = None
+            self._done = threading.Event()
+        if not callable(dataset_keys) and not dataset_keys:
+            self._finish()
+            return
+        threading.Thread(target=self._run, args=(load, dataset_keys),
+                         name='skope-warmup', daemon=True).start()
+
+    def wait(self, timeout: float = None) -> bool:
+        '''Wait until the warm-up is finished or timeout seconds have passed, and
+        return true if it is finished.'''
+        return self._done.wait(timeout)
+
+    def status(self) -> dict:
+        '''Return whether the warm-up is finished, the datasets loaded and failed so
+        far, the seconds spent warming up so far, and the error that prevented the
+        datasets to load from being listed, if any.'''
+        with self._lock:
+            if not self.started:
+                duration = 0.0
+            else:
+                duration = (self._finished or time.monotonic()) - self._started
+            return {
+                'ready': self.ready,
+                'loadedDatasets': [_dataset_json(key) for key in self._loaded],
+                'failedDatasets': [_dataset_json(key) for key in self._failed],
+                'warmupDuration': round(duration, 3),
+                'warmupError': self._error
+            }
+
+    def _run(self, load, dataset_keys) -> None:
+        '''List the datasets if they are given by a function, and load them on a pool
+        of threads, recording the outcome of each.'''
+        def load_dataset(dataset_key):
+            try:
+                load(*dataset_key)
+            except Exception:  # pylint: disable=broad-except
+                outcomes = self._failed
+            else:
+                outcomes = self._loaded
+            with self._lock:
+                outcomes.append(dataset_key)
+
+        try:
+            if callable(dataset_keys):
+                try:
+                    dataset_keys = list(dataset_keys())
+                except Exception as error:  # pylint: disable=broad-except
+                    with self._lock:
+                        self._error = '{}: {}'.format(type(error).__name__, error)
+                    return
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix='skope-warmup') as executor:
+                list(executor.map(load_dataset, dataset_keys))
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._finished = time.monotonic()
+        self._done.set()
+
+# Private helper methods
+
+def _dataset_json(dataset_key: Tuple[str, str]) -> dict:
+    return {'datasetId': dataset_key[0], 'variableName': dataset_key[1]}
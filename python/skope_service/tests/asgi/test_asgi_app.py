@@ -0,0 +1,119 @@
+'''Tests of the ASGI variant of the timeseries service.'''
+import asyncio
+import json
+import threading
+
+from skope_service.asgi_app import AsgiApp, app
+
+def call(asgi_app, method='GET', path='/', query_string=b'', headers=None, body=b''):
+    '''Call an ASGI application with one HTTP request and return the status,
+    headers, and body of the response.'''
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query_string,
+             'headers': headers or [], 'http_version': '1.1', 'scheme': 'http'}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start = messages[0]
+    return (start['status'], dict(start['headers']),
+            b''.join(message.get('body', b'') for message in messages[1:]))
+
+def chunked_wsgi_app(environ, start_response):
+    '''WSGI application returning the request method and body in three chunks.'''
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [environ['REQUEST_METHOD'].encode(), b' ', environ['wsgi.input'].read()]
+
+# pylint: disable=missing-docstring
+
+def test_status_route_is_served():
+    status, headers, body = call(app, path='/status')
+    assert status == 200
+    assert headers[b'content-type'] == b'application/json'
+    status_json = json.loads(body)
+    assert status_json['name'] == 'SKOPE Timeseries Service'
+    assert set(status_json) == {'name', 'ready', 'loadedDatasets', 'failedDatasets',
+                                'warmupDuration', 'warmupError', 'bytesResident'}
+
+def test_timeseries_route_is_served():
+    status, _, body = call(app, path='/timeseries/annual_5x5x5_dataset/uint16_variable',
+                           query_string=b'longitude=-123.0&latitude=45.0&start=0&end=4')
+    assert status == 200
+    assert json.loads(body)['values'] == [100, 200, 300, 400, 500]
+
+def test_timeseries_post_body_is_passed_to_route():
+    request_body = json.dumps({'boundaryGeometry': {'type': 'Point',
+                                                    'coordinates': [-123.0, 45.0]},
+                               'start': 0, 'end': 4}).encode()
+    status, _, body = call(app, method='POST',
+                           path='/timeseries/annual_5x5x5_dataset/uint16_variable',
+                           headers=[(b'content-type', b'application/json')], body=request_body)
+    assert status == 200
+    assert json.loads(body)['values'] == [100, 200, 300, 400, 500]
+
+def test_response_chunks_are_sent_in_order():
+    status, headers, body = call(AsgiApp(chunked_wsgi_app, max_workers=2, max_pending=2),
+                                 method='POST', body=b'geometry')
+    assert status == 200
+    assert headers[b'content-type'] == b'text/plain'
+    assert body == b'POST geometry'
+
+def test_requests_beyond_max_pending_are_refused():
+    status, headers, _ = call(AsgiApp(chunked_wsgi_app, max_workers=1, max_pending=0))
+    assert status == 503
+    assert headers[b'retry-after'] == b'1'
+
+def test_request_body_beyond_max_body_bytes_is_refused():
+    status, _, _ = call(AsgiApp(chunked_wsgi_app, max_workers=1, max_pending=1,
+                                max_body_bytes=4),
+                        method='POST', body=b'geometry')
+    assert status == 413
+
+def test_wsgi_application_runs_off_the_event_loop_thread():
+    threads = []
+
+    def recording_wsgi_app(environ, start_response):
+        threads.append(threading.current_thread())
+        return chunked_wsgi_app(environ, start_response)
+
+    call(AsgiApp(recording_wsgi_app, max_workers=1, max_pending=1))
+    assert threads and threads[0] is not threading.main_thread()
+
+def test_small_response_chunks_are_joined():
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'geometry', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asgi_app = AsgiApp(chunked_wsgi_app, max_workers=1, max_pending=1, chunk_bytes=6)
+    asyncio.run(asgi_app({'type': 'http', 'method': 'POST', 'path': '/', 'headers': []},
+                         receive, send))
+    assert [message.get('body') for message in messages[1:]] == [b'POST geometry', b'']
+
+def test_request_is_not_handled_if_client_disconnects_during_body():
+    calls = []
+    messages = [{'type': 'http.request', 'body': b'geo', 'more_body': True},
+                {'type': 'http.disconnect'}]
+
+    def recording_wsgi_app(environ, start_response):
+        calls.append(environ)
+        return chunked_wsgi_app(environ, start_response)
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        raise AssertionError('sent {} to a disconnected client'.format(message))
+
+    asgi_app = AsgiApp(recording_wsgi_app, max_workers=1, max_pending=1)
+    asyncio.run(asgi_app({'type': 'http', 'method': 'POST', 'path': '/', 'headers': []},
+                         receive, send))
+    assert not calls
+    assert asgi_app.pending == 0
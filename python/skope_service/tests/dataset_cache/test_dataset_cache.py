@@ -0,0 +1,122 @@
+'''Tests of the DatasetCache class.'''
+import os
+import threading
+
+import pytest
+
+from skope_service.dataset_cache import DatasetCache
+
+# pylint: disable=redefined-outer-name
+
+class StubDataset:
+    '''Stand-in for a RasterDataset that records the path it was opened from.'''
+    # pylint: disable=too-few-public-methods
+    def __init__(self, path, nbytes=100):
+        self.path = path
+        self.nbytes = nbytes
+
+@pytest.fixture
+def opened_paths():
+    '''Return a list recording each path opened by the cache.'''
+    return []
+
+@pytest.fixture
+def cache(opened_paths):
+    '''Return a cache holding at most two datasets and 250 bytes.'''
+    def opener(path):
+        opened_paths.append(path)
+        return StubDataset(path)
+    return DatasetCache(max_datasets=2, max_bytes=250, opener=opener)
+
+@pytest.fixture
+def data_files(tmpdir):
+    '''Return the paths to three empty data files.'''
+    paths = []
+    for name in ['a.tif', 'b.tif', 'c.tif']:
+        path = str(tmpdir.join(name))
+        open(path, 'w').close()
+        paths.append(path)
+    return paths
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_second_get_returns_cached_dataset(cache, data_files, opened_paths):
+    first = cache.get(('a', 'v'), data_files[0])
+    assert cache.get(('a', 'v'), data_files[0]) is first
+    assert opened_paths == [data_files[0]]
+
+def test_least_recently_used_dataset_is_evicted_when_count_exceeded(cache, data_files,
+                                                                    opened_paths):
+    cache.get('a', data_files[0])
+    cache.get('b', data_files[1])
+    cache.get('a', data_files[0])
+    cache.get('c', data_files[2])
+    assert len(cache) == 2
+    cache.get('b', data_files[1])
+    assert opened_paths == [data_files[0], data_files[1], data_files[2], data_files[1]]
+
+def test_datasets_are_evicted_when_bytes_exceeded(data_files):
+    cache = DatasetCache(max_datasets=10, max_bytes=250,
+                         opener=lambda path: StubDataset(path, nbytes=100))
+    for key, path in enumerate(data_files):
+        cache.get(key, path)
+    assert len(cache) == 2
+    assert cache.total_bytes == 200
+
+def test_dataset_is_reopened_when_file_modified(cache, data_files, opened_paths):
+    first = cache.get('a', data_files[0])
+    stat = os.stat(data_files[0])
+    os.utime(data_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert cache.get('a', data_files[0]) is not first
+    assert opened_paths == [data_files[0], data_files[0]]
+
+def test_invalidate_removes_dataset(cache, data_files, opened_paths):
+    cache.get('a', data_files[0])
+    cache.invalidate('a')
+    cache.get('a', data_files[0])
+    assert len(opened_paths) == 2
+    assert cache.total_bytes == 100
+
+def test_missing_file_raises_file_not_found_error(cache, tmpdir):
+    with pytest.raises(FileNotFoundError):
+        cache.get('x', str(tmpdir.join('missing.tif')))
+
+def test_dataset_is_reopened_when_reopen_function_says_so(data_files):
+    opened_paths = []
+    def opener(path):
+        opened_paths.append(path)
+        return StubDataset(path)
+    cache = DatasetCache(max_datasets=2, max_bytes=250, opener=opener,
+                         reopen=lambda dataset: len(opened_paths) < 2)
+    first = cache.get('a', data_files[0])
+    second = cache.get('a', data_files[0])
+    assert second is not first
+    assert cache.get('a', data_files[0]) is second
+    assert opened_paths == [data_files[0], data_files[0]]
+    assert cache.total_bytes == 100
+
+def test_concurrent_gets_share_one_open(data_files):
+    opened = threading.Event()
+    release = threading.Event()
+    opened_paths = []
+    def opener(path):
+        opened_paths.append(path)
+        opened.set()
+        release.wait(5)
+        return StubDataset(path)
+    cache = DatasetCache(max_datasets=2, max_bytes=250, opener=opener)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('a', data_files[0])))
+               for _ in range(4)]
+    threads[0].start()
+    opened.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert opened_paths == [data_files[0]]
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    assert cache.total_bytes == 100
@@ -0,0 +1,70 @@
+'''Tests of the DatasetCatalog class.'''
+import os
+
+import pytest
+
+from skope_service.dataset_catalog import DatasetCatalog
+
+# pylint: disable=redefined-outer-name
+
+def touch(directory, name):
+    '''Create an empty file with the given name in directory and return its path.'''
+    path = str(directory.join(name))
+    open(path, 'w').close()
+    return path
+
+@pytest.fixture
+def catalog(tmpdir):
+    '''Return a catalog of a directory holding GeoTIFF and NetCDF files.'''
+    touch(tmpdir, 'paleocar_v2_ppt.tif')
+    touch(tmpdir, 'paleocar_v2_gdd.nc')
+    touch(tmpdir, 'paleocar_v2_gdd.nc4')
+    touch(tmpdir, 'paleocar_v2_temp.txt')
+    return DatasetCatalog(str(tmpdir.join('{datasetId}_{variableName}')), ['.tif', '.nc', '.nc4'])
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_lookup_returns_path_of_file_with_configured_extension(catalog, tmpdir):
+    assert catalog.lookup('paleocar_v2', 'ppt').path == str(tmpdir.join('paleocar_v2_ppt.tif'))
+
+def test_lookup_prefers_earliest_listed_extension(catalog, tmpdir):
+    assert catalog.lookup('paleocar_v2', 'gdd').path == str(tmpdir.join('paleocar_v2_gdd.nc'))
+
+def test_lookup_ignores_files_with_other_extensions(catalog):
+    assert catalog.lookup('paleocar_v2', 'temp') is None
+
+def test_lookup_of_missing_dataset_returns_none(catalog):
+    assert catalog.lookup('paleocar_v3', 'ppt') is None
+
+def test_entry_records_file_size_and_modification_time(catalog, tmpdir):
+    entry = catalog.lookup('paleocar_v2', 'ppt')
+    assert entry.size == 0
+    assert entry.mtime == os.stat(str(tmpdir.join('paleocar_v2_ppt.tif'))).st_mtime_ns
+
+def test_catalog_indexes_each_name_once(catalog):
+    assert len(catalog) == 2
+
+def test_files_added_to_directory_are_found(catalog, tmpdir):
+    path = touch(tmpdir, 'paleocar_v2_tmax.tif')
+    os.utime(str(tmpdir), ns=(0, 0))
+    assert catalog.lookup('paleocar_v2', 'tmax').path == path
+
+def test_files_removed_from_directory_are_dropped(catalog, tmpdir):
+    os.remove(str(tmpdir.join('paleocar_v2_ppt.tif')))
+    os.utime(str(tmpdir), ns=(0, 0))
+    assert catalog.lookup('paleocar_v2', 'ppt') is None
+
+def test_missing_directory_gives_empty_catalog(tmpdir):
+    catalog = DatasetCatalog(str(tmpdir.join('missing', '{datasetId}_{variableName}')), ['.tif'])
+    assert len(catalog) == 0
+    assert catalog.lookup('paleocar_v2', 'ppt') is None
+
+def test_files_matching_excluded_templates_are_not_indexed(tmpdir):
+    touch(tmpdir, 'paleocar_v2_ppt.tif')
+    touch(tmpdir, 'paleocar_v2_ppt_uncertainty.tif')
+    excluded_template = str(tmpdir.join('{datasetId}_{variableName}_uncertainty'))
+    catalog = DatasetCatalog(str(tmpdir.join('{datasetId}_{variableName}')), ['.tif'],
+                             excluded_templates=[excluded_template])
+    assert catalog.lookup('paleocar_v2', 'ppt_uncertainty') is None
+    assert catalog.lookup('paleocar_v2', 'ppt') is not None
+    assert len(catalog) == 1
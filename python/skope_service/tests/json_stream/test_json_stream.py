@@ -0,0 +1,37 @@
+'''Tests of the incremental JSON encoder.'''
+import json
+
+import numpy
+
+from skope_service.json_stream import iter_json
+
+# pylint: disable=missing-docstring
+
+def encode(value, chunk_values=2):
+    return ''.join(iter_json(value, chunk_values))
+
+def test_arrays_are_encoded_as_json_arrays_across_chunks():
+    assert json.loads(encode(numpy.arange(5, dtype=numpy.uint16))) == [0, 1, 2, 3, 4]
+
+def test_float_values_round_trip_exactly():
+    values = numpy.array([0.1, 1 / 3, 1e-300, 12345678.9])
+    assert json.loads(encode(values)) == values.tolist()
+
+def test_float32_values_are_encoded_as_json_dumps_encodes_them():
+    values = numpy.array([0.1, 1 / 3, 1e-30, 12345678.9], dtype=numpy.float32)
+    assert encode(values) == json.dumps(values.tolist()).replace(' ', '')
+
+def test_nan_and_infinite_values_are_encoded_as_null():
+    assert json.loads(encode(numpy.array([1.5, numpy.nan, numpy.inf]))) == [1.5, None, None]
+
+def test_empty_array_is_encoded_as_empty_json_array():
+    assert encode(numpy.empty(0)) == '[]'
+
+def test_nested_structures_match_json_dumps():
+    body = {'datasetId': 'a"b', 'values': [None, numpy.array([1, 2])], 'start': '0',
+            'count': numpy.int64(3), 'partial': True}
+    assert json.loads(encode(body)) == {'datasetId': 'a"b', 'values': [None, [1, 2]], 'start': '0',
+                                        'count': 3, 'partial': True}
+
+def test_two_dimensional_arrays_are_encoded_as_nested_arrays():
+    assert json.loads(encode(numpy.arange(4.0).reshape(2, 2))) == [[0, 1], [2, 3]]
@@ -1,7 +1,8 @@
 '''Tests the /status endpoint.'''
 import pytest
 
-from skope_service import app
+from skope_service import app, flask_app
+from skope_service.warmup import Warmup
 
 # pylint: disable=redefined-outer-name
 
@@ -35,9 +36,31 @@ def test_response_header_has_two_keys(response):
     assert response.headers['Content-Type'] == 'application/json'
     assert int(response.headers['Content-Length']) > 0
 
-def test_response_json_contains_just_name_key(response_json):
-    assert len(response_json) == 1
-    assert 'name' in response_json
+def test_response_json_contains_name_and_readiness_keys(response_json):
+    assert set(response_json) == {'name', 'ready', 'loadedDatasets', 'failedDatasets',
+                                  'warmupDuration', 'warmupError', 'bytesResident'}
 
 def test_response_name_property_has_service_name_for_value(response_json):
     assert response_json['name'] == 'SKOPE Timeseries Service'
+
+def test_service_without_warmup_manifest_is_ready(response_json):
+    assert response_json['ready']
+    assert response_json['loadedDatasets'] == []
+    assert response_json['failedDatasets'] == []
+    assert response_json['warmupDuration'] >= 0
+    assert response_json['warmupError'] is None
+
+def test_response_reports_bytes_resident(response_json):
+    assert response_json['bytesResident'] >= 0
+
+def test_unreadable_warmup_manifest_is_reported_without_failing_requests(client, tmpdir,
+                                                                         monkeypatch):
+    monkeypatch.setattr(flask_app, 'warmup', Warmup(max_workers=1))
+    monkeypatch.setitem(app.config, 'TIMESERIES_WARMUP_MANIFEST',
+                        str(tmpdir.join('missing.json')))
+    assert client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                      '?longitude=-123.0&latitude=45.0').status_code == 200
+    assert flask_app.warmup.wait(5)
+    response = client.get('/status')
+    assert response.status_code == 200
+    assert response.get_json()['warmupError'].startswith('FileNotFoundError')
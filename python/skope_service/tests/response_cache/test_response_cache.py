@@ -0,0 +1,53 @@
+'''Tests of the ResponseCache class.'''
+import numpy
+import pytest
+
+from skope_service.response_cache import ResponseCache
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture
+def cache():
+    '''Return a cache holding at most 250 bytes of arrays.'''
+    return ResponseCache(max_bytes=250)
+
+def fields(size=12):
+    '''Return response fields holding an array of size 8-byte values.'''
+    return {'values': numpy.arange(size, dtype=numpy.float64), 'count': [None]}
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_cached_fields_are_returned_for_same_stamp(cache):
+    cache.put('a', 1, fields())
+    assert cache.get('a', 1)['values'].tolist() == list(range(12))
+
+def test_missing_key_returns_none(cache):
+    assert cache.get('a', 1) is None
+
+def test_fields_with_other_stamp_are_discarded(cache):
+    cache.put('a', 1, fields())
+    assert cache.get('a', 2) is None
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+def test_cached_arrays_are_read_only_copies(cache):
+    cube = numpy.zeros((3, 12))
+    cache.put('a', 1, {'values': cube[0]})
+    cached = cache.get('a', 1)['values']
+    assert cached.base is not cube
+    assert not cached.flags.writeable
+
+def test_least_recently_used_fields_are_evicted_beyond_max_bytes(cache):
+    cache.put('a', 1, fields())
+    cache.put('b', 1, fields())
+    cache.get('a', 1)
+    cache.put('c', 1, fields())
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) is not None
+    assert cache.total_bytes == 192
+
+def test_fields_larger_than_max_bytes_are_kept_alone(cache):
+    cache.put('a', 1, fields())
+    cache.put('b', 1, fields(100))
+    assert len(cache) == 1
+    assert cache.get('b', 1) is not None
@@ -0,0 +1,23 @@
+'''Tests of preloading datasets into shared memory.'''
+import pytest
+
+from skope import RasterDataset
+from skope_service.shared_pool import preload_shared_datasets
+
+# pylint: disable=missing-docstring
+
+def test_preloaded_dataset_is_attached_by_workers():
+    with preload_shared_datasets([('annual_5x5x5_dataset', 'uint16_variable')]) as pool:
+        assert len(pool) == 1
+        raster_dataset = RasterDataset('data/annual_5x5x5_dataset_uint16_variable.tif',
+                                       shared_memory=True)
+        assert raster_dataset.shared
+        assert raster_dataset.nbytes == 0
+
+def test_nothing_is_preloaded_by_default():
+    with preload_shared_datasets() as pool:
+        assert len(pool) == 0
+
+def test_preloading_unknown_dataset_raises_file_not_found_error():
+    with pytest.raises(FileNotFoundError):
+        preload_shared_datasets([('unknown_dataset', 'uint16_variable')])
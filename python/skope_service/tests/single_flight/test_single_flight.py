@@ -0,0 +1,120 @@
+'''Tests of the SingleFlight class.'''
+import threading
+
+import pytest
+
+from skope_service.single_flight import SingleFlight
+
+# pylint: disable=missing-docstring
+
+def start_waiting_calls(flights, key, function, count):
+    '''Start count threads calling function through flights under key once the
+    first call is in flight, and return the threads with a list of their results.'''
+    results = []
+    def call():
+        try:
+            results.append(flights.do(key, function))
+        except ValueError as error:
+            results.append(error)
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+def test_call_returns_result():
+    assert SingleFlight().do('a', lambda: 42) == 42
+
+def test_concurrent_calls_share_one_result():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    def function():
+        calls.append(None)
+        started.set()
+        release.wait(5)
+        return object()
+
+    leader, leader_results = start_waiting_calls(flights, 'a', function, 1)
+    started.wait(5)
+    followers, follower_results = start_waiting_calls(flights, 'a', function, 3)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert all(result is leader_results[0] for result in follower_results)
+    assert len(flights) == 0
+
+def test_concurrent_calls_share_one_exception():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    def function():
+        started.set()
+        release.wait(5)
+        raise ValueError('failed')
+
+    leader, leader_results = start_waiting_calls(flights, 'a', function, 1)
+    started.wait(5)
+    followers, follower_results = start_waiting_calls(flights, 'a', function, 2)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert all(result is leader_results[0] for result in follower_results)
+    assert isinstance(leader_results[0], ValueError)
+
+def test_calls_with_different_keys_are_not_shared():
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1) == 1
+    assert flights.do('b', lambda: 2) == 2
+
+def test_finished_call_is_repeated():
+    flights = SingleFlight()
+    calls = []
+    flights.do('a', lambda: calls.append(None))
+    flights.do('a', lambda: calls.append(None))
+    assert len(calls) == 2
+
+def test_exception_is_raised_to_caller():
+    def function():
+        raise ValueError('failed')
+    with pytest.raises(ValueError):
+        SingleFlight().do('a', function)
+
+def test_waiting_caller_calls_function_itself_after_timeout():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    def blocking_function():
+        started.set()
+        release.wait(5)
+        return 'leader'
+
+    leader, _ = start_waiting_calls(flights, 'a', blocking_function, 1)
+    started.wait(5)
+    assert flights.do('a', lambda: 'follower', timeout=0.01) == 'follower'
+    release.set()
+    leader[0].join(5)
+
+def test_waiting_caller_calls_function_itself_unless_result_is_reusable():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    def blocking_function():
+        started.set()
+        release.wait(5)
+        return {'partial': True}
+
+    leader, _ = start_waiting_calls(flights, 'a', blocking_function, 1)
+    started.wait(5)
+    results = []
+    follower = threading.Thread(target=lambda: results.append(flights.do(
+        'a', lambda: {'partial': False}, timeout=5,
+        reusable=lambda result, error: error is None and not result['partial'])))
+    follower.start()
+    release.set()
+    for thread in leader + [follower]:
+        thread.join(5)
+    assert results == [{'partial': False}]
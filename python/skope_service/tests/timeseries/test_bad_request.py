@@ -0,0 +1,63 @@
+'''Test the /timeseries endpoint for malformed requests.'''
+import pytest
+
+from skope_service import app
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+URL = '/timeseries/annual_5x5x5_dataset/uint16_variable'
+
+def test_invalid_boundary_geometry_json_is_bad_request(client):
+    response = client.get(URL + '?boundaryGeometry={"type":')
+    assert response.status_code == 400
+
+def test_missing_latitude_is_bad_request(client):
+    response = client.get(URL + '?longitude=-123.0')
+    assert response.status_code == 400
+
+def test_non_numeric_longitude_is_bad_request(client):
+    response = client.get(URL + '?longitude=west&latitude=45.0')
+    assert response.status_code == 400
+
+def test_non_numeric_start_is_bad_request(client):
+    response = client.get(URL + '?longitude=-123.0&latitude=45.0&start=first')
+    assert response.status_code == 400
+
+def test_missing_boundary_geometry_is_bad_request(client):
+    response = client.post(URL, json={'start': 0})
+    assert response.status_code == 400
+
+def test_body_that_is_not_an_object_is_bad_request(client):
+    response = client.post(URL, json=[-123.0, 45.0])
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('geometry', [
+    {'type': 'Point'},
+    {'type': 'Point', 'coordinates': [-123.0]},
+    {'type': 'Point', 'coordinates': ['-123.0', 45.0]},
+    {'type': 'MultiPoint', 'coordinates': [-123.0, 45.0]},
+    {'type': 'MultiPoint', 'coordinates': [[-123.0, 45.0], [-122.0]]},
+    {'type': 'Polygon', 'coordinates': [[-123.0, 45.0]]},
+    'POINT (-123.0 45.0)'
+])
+def test_malformed_coordinates_are_bad_request(client, geometry):
+    response = client.post(URL, json={'boundaryGeometry': geometry})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('query', ['start=-2&end=4', 'start=0&end=5', 'start=3&end=1'])
+def test_range_of_bands_outside_dataset_is_bad_request(client, query):
+    response = client.get(URL + '?longitude=-123.0&latitude=45.0&' + query)
+    assert response.status_code == 400
+
+def test_range_of_bands_outside_dataset_is_bad_request_for_multipoint(client):
+    response = client.post(URL, json={
+        'boundaryGeometry': {'type': 'MultiPoint', 'coordinates': [[-123.0, 45.0]]},
+        'start': 0, 'end': 1000})
+    assert response.status_code == 400
@@ -0,0 +1,76 @@
+'''Test binary responses of the /timeseries endpoint.'''
+import io
+
+import numpy
+import pytest
+
+from skope import RasterDataset
+from skope_service import app
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+def get_point_timeseries(client, mimetype):
+    '''Invoke the timeseries service for one point accepting the given MIME type.'''
+    return client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                      '?longitude=-123.0&latitude=45.0&start=0&end=4',
+                      headers={'Accept': mimetype})
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_json_is_returned_by_default(client):
+    response = client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                          '?longitude=-123.0&latitude=45.0&start=0&end=4')
+    assert response.mimetype == 'application/json'
+    assert 'Accept' in response.headers['Vary']
+
+def test_octet_stream_holds_little_endian_values_in_dataset_dtype(client):
+    response = get_point_timeseries(client, 'application/octet-stream')
+    assert response.mimetype == 'application/octet-stream'
+    assert response.headers['X-Dtype'] == '<u2'
+    assert response.headers['X-Shape'] == '5'
+    assert response.headers['X-Start'] == '0'
+    assert response.headers['X-End'] == '4'
+    values = numpy.frombuffer(response.data, dtype=response.headers['X-Dtype'])
+    assert values.tolist() == [100, 200, 300, 400, 500]
+
+def test_npy_holds_values_in_dataset_dtype(client):
+    response = get_point_timeseries(client, 'application/x-npy')
+    assert response.mimetype == 'application/x-npy'
+    values = numpy.load(io.BytesIO(response.data))
+    assert values.dtype == numpy.uint16
+    assert values.tolist() == [100, 200, 300, 400, 500]
+
+def test_octet_stream_of_empty_partial_series_keeps_dataset_dtype(client, monkeypatch):
+    def interrupted_series_at_pixel(self, row, column, begin=None, end=None, copy=True,
+                                    dtype=None, deadline=None):
+        raise deadline.exceeded(numpy.empty(0, dtype=numpy.uint16))
+    monkeypatch.setattr(RasterDataset, 'series_at_pixel', interrupted_series_at_pixel)
+    response = get_point_timeseries(client, 'application/octet-stream')
+    assert response.headers['X-Dtype'] == '<u2'
+    assert response.headers['X-Shape'] == '0'
+    assert response.data == b''
+
+def test_octet_stream_of_multipoint_lists_missing_rows(client):
+    response = client.post('/timeseries/annual_5x5x5_dataset/uint16_variable', json={
+        'boundaryGeometry': {'type': 'MultiPoint', 'coordinates': [[-123.0, 45.0], [-150.0, 45.0]]},
+        'start': 0,
+        'end': 4
+    }, headers={'Accept': 'application/octet-stream'})
+    assert response.headers['X-Shape'] == '2,5'
+    assert response.headers['X-Missing-Rows'] == '1'
+    values = numpy.frombuffer(response.data, dtype=response.headers['X-Dtype']).reshape(2, 5)
+    assert values[0].tolist() == [100, 200, 300, 400, 500]
+
+def test_arrow_stream_holds_table_of_series(client):
+    pyarrow = pytest.importorskip('pyarrow')
+    response = get_point_timeseries(client, 'application/vnd.apache.arrow.stream')
+    assert response.mimetype == 'application/vnd.apache.arrow.stream'
+    table = pyarrow.ipc.open_stream(response.data).read_all()
+    assert table.column('band').to_pylist() == [0, 1, 2, 3, 4]
+    assert table.column('values').to_pylist() == [100, 200, 300, 400, 500]
+    assert table.schema.metadata[b'datasetId'] == b'annual_5x5x5_dataset'
@@ -0,0 +1,54 @@
+'''Test HTTP caching of responses of the /timeseries endpoint.'''
+import pytest
+
+from skope_service import app
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+def get_point_timeseries(client, longitude, latitude, headers=None):
+    '''Invoke the timeseries service for the given point and return the response.'''
+    return client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                      '?longitude={}&latitude={}&start=0&end=4'.format(longitude, latitude),
+                      headers=headers)
+
+@pytest.fixture(scope='module')
+def response(client):
+    '''Invoke the timeseries service and return the response.'''
+    return get_point_timeseries(client, -123.0, 45.0)
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_response_has_weak_etag(response):
+    etag, weak = response.get_etag()
+    assert etag
+    assert weak
+
+def test_response_has_last_modified_date(response):
+    assert response.last_modified is not None
+
+def test_request_with_matching_etag_is_not_modified(client, response):
+    not_modified = get_point_timeseries(client, -123.0, 45.0,
+                                        headers={'If-None-Match': response.headers['ETag']})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+
+def test_request_modified_since_last_modified_date_is_not_modified(client, response):
+    headers = {'If-Modified-Since': response.headers['Last-Modified']}
+    not_modified = get_point_timeseries(client, -123.0, 45.0, headers=headers)
+    assert not_modified.status_code == 304
+
+def test_points_in_same_pixel_share_etag(client, response):
+    assert get_point_timeseries(client, -122.9, 44.9).get_etag() == response.get_etag()
+
+def test_points_in_same_pixel_echo_their_own_coordinates(client):
+    geometry = get_point_timeseries(client, -122.9, 44.9).get_json()['boundaryGeometry']
+    assert geometry['coordinates'] == [-122.9, 44.9]
+
+def test_binary_response_has_different_etag(client, response):
+    binary = get_point_timeseries(client, -123.0, 45.0, headers={'Accept': 'application/x-npy'})
+    assert binary.get_etag() != response.get_etag()
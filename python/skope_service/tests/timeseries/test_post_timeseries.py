@@ -0,0 +1,50 @@
+'''Test the /timeseries endpoint for batches of points.'''
+import pytest
+
+from skope_service import app
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+@pytest.fixture(scope='module')
+def response(client):
+    '''Invoke the timeseries service with two points and return the response.'''
+    return client.post('/timeseries/annual_5x5x5_dataset/uint16_variable', json={
+        'boundaryGeometry': {
+            'type': 'MultiPoint',
+            'coordinates': [[-123.0, 45.0], [-150.0, 45.0]]
+        },
+        'start': 0,
+        'end': 4
+    })
+
+@pytest.fixture(scope='module')
+def response_json(response):
+    '''Return the JSON body of response.'''
+    return response.get_json()
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_response_status_is_success(response):
+    assert response.status_code == 200
+
+def test_response_body_is_json(response):
+    assert response.is_json
+
+def test_boundary_geometry_should_be_multipoint_matching_request(response_json):
+    assert response_json['boundaryGeometry']['type'] == 'MultiPoint'
+    assert response_json['boundaryGeometry']['coordinates'] == [[-123, 45], [-150, 45]]
+
+def test_range_start_and_end_in_response_json_should_match_request(response_json):
+    assert response_json['start'] == '0'
+    assert response_json['end'] == '4'
+
+def test_values_should_contain_series_for_point_in_pixel_0_0(response_json):
+    assert response_json['values'][0] == [100, 200, 300, 400, 500]
+
+def test_values_should_be_null_for_point_outside_coverage(response_json):
+    assert response_json['values'][1] is None
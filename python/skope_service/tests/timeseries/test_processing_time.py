@@ -0,0 +1,53 @@
+'''Test the processing time limit of the /timeseries endpoint.'''
+import time
+
+import pytest
+
+from skope_service import app, flask_app
+from skope_service.flask_app import response_cache
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+@pytest.fixture(scope='module')
+def response(client):
+    '''Invoke the timeseries service and return the response.'''
+    return client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                      '?longitude=-123.0&latitude=45.0&start=0&end=4')
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_response_reports_processing_time(response):
+    assert 0 <= response.get_json()['processingTime'] < app.config['TIMESERIES_MAX_PROCESSING_TIME']
+
+def test_response_has_server_timing_header(response):
+    assert response.headers['Server-Timing'].startswith('extract;dur=')
+
+def test_complete_response_is_not_partial(response):
+    assert 'partial' not in response.get_json()
+
+def test_request_exceeding_processing_time_is_service_unavailable(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'TIMESERIES_MAX_PROCESSING_TIME', 0)
+    response_cache.clear()
+    response = client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                          '?longitude=-123.0&latitude=45.0&start=0&end=4')
+    assert response.status_code == 503
+
+def test_opening_datasets_does_not_count_towards_processing_time(client, monkeypatch):
+    get_raster_dataset = flask_app._get_raster_dataset  # pylint: disable=protected-access
+
+    def slow_get_raster_dataset(dataset_id, variable_name):
+        time.sleep(0.2)
+        return get_raster_dataset(dataset_id, variable_name)
+
+    monkeypatch.setattr(flask_app, '_get_raster_dataset', slow_get_raster_dataset)
+    monkeypatch.setitem(app.config, 'TIMESERIES_MAX_PROCESSING_TIME', 100)
+    response_cache.clear()
+    response = client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                          '?longitude=-123.0&latitude=45.0&start=0&end=4')
+    assert response.status_code == 200
+    assert 'partial' not in response.get_json()
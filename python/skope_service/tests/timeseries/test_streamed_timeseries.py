@@ -0,0 +1,100 @@
+'''Test streamed responses of the /timeseries endpoint.'''
+import json
+import os
+
+import numpy
+import pytest
+
+from osgeo import gdal
+from skope import RasterDataset
+from skope_service import app, flask_app
+from skope_service.dataset_catalog import DatasetCatalog
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+@pytest.fixture(scope='module')
+def float32_dataset(tmpdir_factory):
+    '''Create a dataset of float32 values with no exact float32 text in a temporary
+    directory and point the catalog of the service at the directory while the
+    tests run.'''
+    directory = str(tmpdir_factory.mktemp('float32_data'))
+    values = RasterDataset('data/annual_5x5x5_dataset_uint16_variable.tif')
+    float32_dataset = RasterDataset.create(
+        os.path.join(directory, 'annual_5x5x5_dataset_float32_variable.tif'),
+        'GTiff', gdal.GDT_Float32, shape=values.shape,
+        origin=values.origin, pixel_size=values.pixel_size)
+    float32_dataset.write_bands((values.read_band(band_index) / 3
+                                 for band_index in range(values.bands)), nodata=-1)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(flask_app, 'dataset_catalog', DatasetCatalog(
+            os.path.join(directory, '{datasetId}_{variableName}'),
+            app.config['TIMESERIES_DATA_FILE_EXTENSIONS']))
+        yield 'float32_variable'
+
+@pytest.fixture(scope='module')
+def infinite_dataset(tmpdir_factory):
+    '''Create a dataset of float32 values including infinities in a temporary
+    directory and point the catalog of the service at the directory while the
+    tests run.'''
+    directory = str(tmpdir_factory.mktemp('infinite_data'))
+    values = RasterDataset('data/annual_5x5x5_dataset_uint16_variable.tif')
+    infinite_dataset = RasterDataset.create(
+        os.path.join(directory, 'annual_5x5x5_dataset_infinite_variable.tif'),
+        'GTiff', gdal.GDT_Float32, shape=values.shape,
+        origin=values.origin, pixel_size=values.pixel_size)
+    infinite_dataset.write_bands(numpy.full(values.shape[1:], value, dtype=numpy.float32)
+                                 for value in [1.5, numpy.inf, -numpy.inf, numpy.nan, 2.5])
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(flask_app, 'dataset_catalog', DatasetCatalog(
+            os.path.join(directory, '{datasetId}_{variableName}'),
+            app.config['TIMESERIES_DATA_FILE_EXTENSIONS']))
+        yield 'infinite_variable'
+
+def get_timeseries(client, geometry, variable_name='uint16_variable'):
+    '''Invoke the timeseries service with the given geometry and return the response.'''
+    return client.get('/timeseries/annual_5x5x5_dataset/' + variable_name +
+                      '?start=0&end=4&boundaryGeometry=' + json.dumps(geometry))
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+@pytest.mark.parametrize('geometry', [
+    {'type': 'Point', 'coordinates': [-123.0, 45.0]},
+    {'type': 'MultiPoint', 'coordinates': [[-123.0, 45.0], [-150.0, 45.0]]},
+    {'type': 'Polygon',
+     'coordinates': [[[-180, 90], [180, 90], [180, -90], [-180, -90], [-180, 90]]]}
+], ids=['point', 'multipoint', 'polygon'])
+def test_streamed_response_matches_unstreamed_response(client, geometry, monkeypatch):
+    expected = get_timeseries(client, geometry).get_json()
+    monkeypatch.setitem(app.config, 'TIMESERIES_STREAM_MIN_VALUES', 0)
+    response = get_timeseries(client, geometry)
+    assert 'Content-Length' not in response.headers
+    assert response.mimetype == 'application/json'
+    streamed = response.get_json()
+    del expected['processingTime'], streamed['processingTime']
+    assert streamed == expected
+
+def test_small_response_is_not_streamed(client):
+    response = get_timeseries(client, {'type': 'Point', 'coordinates': [-123.0, 45.0]})
+    assert int(response.headers['Content-Length']) > 0
+
+def test_streamed_float32_values_match_unstreamed_values(client, float32_dataset, monkeypatch):
+    geometry = {'type': 'Point', 'coordinates': [-123.0, 45.0]}
+    expected = get_timeseries(client, geometry, float32_dataset).get_json()
+    monkeypatch.setitem(app.config, 'TIMESERIES_STREAM_MIN_VALUES', 0)
+    streamed = get_timeseries(client, geometry, float32_dataset).get_json()
+    assert expected['values'][0] != pytest.approx(100 / 3, rel=1e-12)
+    assert streamed['values'] == expected['values']
+
+@pytest.mark.parametrize('min_values', [0, 1000], ids=['streamed', 'unstreamed'])
+def test_nan_and_infinite_values_are_null(client, infinite_dataset, monkeypatch, min_values):
+    monkeypatch.setitem(app.config, 'TIMESERIES_STREAM_MIN_VALUES', min_values)
+    geometry = {'type': 'Point', 'coordinates': [-123.0, 45.0]}
+    response = get_timeseries(client, geometry, infinite_dataset)
+    assert response.get_json()['values'] == [1.5, None, None, None, 2.5]
@@ -0,0 +1,70 @@
+'''Test the /timeseries endpoint with uncertainties.'''
+import os
+import shutil
+
+import pytest
+
+from osgeo import gdal
+from skope import RasterDataset
+from skope_service import app, flask_app
+from skope_service.dataset_catalog import DatasetCatalog
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+@pytest.fixture(scope='module')
+def data_directory(tmpdir_factory):
+    '''Copy the test dataset to a temporary directory beside an uncertainty dataset
+    on its grid holding one tenth of its values, and point the catalogs of the
+    service at the directory while the tests run.'''
+    directory = str(tmpdir_factory.mktemp('uncertainty_data'))
+    values_path = os.path.join(directory, 'annual_5x5x5_dataset_uint16_variable.tif')
+    shutil.copyfile('data/annual_5x5x5_dataset_uint16_variable.tif', values_path)
+    values = RasterDataset(values_path)
+    uncertainty = RasterDataset.create(
+        os.path.join(directory, 'annual_5x5x5_dataset_uint16_variable_uncertainty.tif'),
+        'GTiff', gdal.GDT_Float32, shape=values.shape,
+        origin=values.origin, pixel_size=values.pixel_size)
+    uncertainty.write_bands((values.read_band(band_index) / 10
+                             for band_index in range(values.bands)), nodata=-1)
+
+    values_template = os.path.join(directory, '{datasetId}_{variableName}')
+    uncertainty_template = values_template + '_uncertainty'
+    extensions = app.config['TIMESERIES_DATA_FILE_EXTENSIONS']
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(flask_app, 'dataset_catalog', DatasetCatalog(
+            values_template, extensions, excluded_templates=[uncertainty_template]))
+        monkeypatch.setattr(flask_app, 'uncertainty_catalog',
+                            DatasetCatalog(uncertainty_template, extensions))
+        yield directory
+
+@pytest.fixture(scope='module')
+def response(client, data_directory):  # pylint: disable=unused-argument
+    '''Invoke the timeseries service with uncertainties and return the response.'''
+    return client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                      '?longitude=-123.0&latitude=45.0&start=0&end=4&uncertainty=true')
+
+# pylint: disable=redefined-outer-name, missing-docstring, unused-argument
+
+def test_response_status_is_success(response):
+    assert response.status_code == 200
+
+def test_values_are_returned_with_uncertainty(response):
+    assert response.get_json()['values'] == [100, 200, 300, 400, 500]
+
+def test_uncertainty_matches_values(response):
+    assert response.get_json()['uncertainty'] == pytest.approx([10, 20, 30, 40, 50])
+
+def test_uncertainty_is_not_returned_unless_requested(client, data_directory):
+    response = client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                          '?longitude=-123.0&latitude=45.0&start=0&end=4')
+    assert 'uncertainty' not in response.get_json()
+
+def test_uncertainty_file_is_not_served_as_a_variable(client, data_directory):
+    response = client.get('/timeseries/annual_5x5x5_dataset/uint16_variable_uncertainty' +
+                          '?longitude=-123.0&latitude=45.0&start=0&end=4')
+    assert response.status_code == 404
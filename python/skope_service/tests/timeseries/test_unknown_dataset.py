@@ -0,0 +1,28 @@
+'''Test the /timeseries endpoint for datasets and uncertainties not in the catalog.'''
+import pytest
+
+from skope_service import app
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_unknown_dataset_is_not_found(client):
+    response = client.get('/timeseries/unknown_dataset/uint16_variable' +
+                          '?longitude=-123.0&latitude=45.0')
+    assert response.status_code == 404
+
+def test_unknown_variable_is_not_found(client):
+    response = client.get('/timeseries/annual_5x5x5_dataset/unknown_variable' +
+                          '?longitude=-123.0&latitude=45.0')
+    assert response.status_code == 404
+
+def test_missing_uncertainty_is_not_found(client):
+    response = client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                          '?longitude=-123.0&latitude=45.0&uncertainty=true')
+    assert response.status_code == 404
@@ -0,0 +1,55 @@
+'''Test the /timeseries endpoint for polygon geometries.'''
+import json
+
+import pytest
+
+from skope_service import app
+
+# pylint: disable=redefined-outer-name
+
+@pytest.fixture(scope='module')
+def client():
+    '''Return the Flask client instance to test against.'''
+    return app.test_client()
+
+@pytest.fixture(scope='module')
+def geometry():
+    '''Return a GeoJSON polygon enclosing the whole dataset.'''
+    return {'type': 'Polygon',
+            'coordinates': [[[-180, 90], [180, 90], [180, -90], [-180, -90], [-180, 90]]]}
+
+@pytest.fixture(scope='module')
+def response(client, geometry):
+    '''Invoke the timeseries service with a polygon and return the response.'''
+    return client.get('/timeseries/annual_5x5x5_dataset/uint16_variable' +
+                      '?start=0&end=4&boundaryGeometry=' + json.dumps(geometry))
+
+@pytest.fixture(scope='module')
+def response_json(response):
+    '''Return the JSON body of response.'''
+    return response.get_json()
+
+# pylint: disable=redefined-outer-name, missing-docstring
+
+def test_response_status_is_success(response):
+    assert response.status_code == 200
+
+def test_boundary_geometry_should_match_request(response_json, geometry):
+    assert response_json['boundaryGeometry'] == geometry
+
+def test_statistics_have_one_value_per_band(response_json):
+    for name in ['values', 'min', 'max', 'count']:
+        assert len(response_json[name]) == 5
+
+def test_count_includes_every_pixel_of_5x5_dataset(response_json):
+    assert response_json['count'] == [25] * 5
+
+def test_mean_lies_between_min_and_max(response_json):
+    for mean, minimum, maximum in zip(response_json['values'], response_json['min'],
+                                      response_json['max']):
+        assert minimum <= mean <= maximum
+
+def test_unsupported_geometry_type_is_bad_request(client):
+    response = client.post('/timeseries/annual_5x5x5_dataset/uint16_variable',
+                           json={'boundaryGeometry': {'type': 'LineString', 'coordinates': []}})
+    assert response.status_code == 400
@@ -0,0 +1,102 @@
+'''Tests of the Warmup class and warm-up manifests.'''
+import json
+import os
+import threading
+
+from skope_service.warmup import Warmup, read_manifest
+
+# pylint: disable=missing-docstring
+
+def test_manifest_lists_dataset_keys(tmpdir):
+    path = str(tmpdir.join('manifest.json'))
+    with open(path, 'w') as manifest_file:
+        json.dump([{'datasetId': 'a', 'variableName': 'x'},
+                   {'datasetId': 'b', 'variableName': 'y'}], manifest_file)
+    assert read_manifest(path) == [('a', 'x'), ('b', 'y')]
+
+def test_warmup_without_datasets_is_ready_immediately():
+    warmup = Warmup(max_workers=2)
+    warmup.start(lambda dataset_id, variable_name: None, [])
+    assert warmup.ready
+    assert warmup.status()['loadedDatasets'] == []
+
+def test_warmup_is_not_ready_until_datasets_are_loaded():
+    release = threading.Event()
+    warmup = Warmup(max_workers=2)
+    warmup.start(lambda dataset_id, variable_name: release.wait(5), [('a', 'x')])
+    assert not warmup.ready
+    assert not warmup.status()['ready']
+    release.set()
+    assert warmup.wait(5)
+    assert warmup.status()['loadedDatasets'] == [{'datasetId': 'a', 'variableName': 'x'}]
+
+def test_warmup_loads_datasets_in_parallel():
+    barrier = threading.Barrier(3, timeout=5)
+    warmup = Warmup(max_workers=3)
+    warmup.start(lambda dataset_id, variable_name: barrier.wait(),
+                 [('a', 'x'), ('b', 'x'), ('c', 'x')])
+    assert warmup.wait(5)
+    assert len(warmup.status()['loadedDatasets']) == 3
+
+def test_failed_datasets_are_reported_and_warmup_finishes():
+    def load(dataset_id, _variable_name):
+        if dataset_id == 'missing':
+            raise FileNotFoundError(dataset_id)
+    warmup = Warmup(max_workers=2)
+    warmup.start(load, [('a', 'x'), ('missing', 'x')])
+    assert warmup.wait(5)
+    status = warmup.status()
+    assert status['ready']
+    assert status['loadedDatasets'] == [{'datasetId': 'a', 'variableName': 'x'}]
+    assert status['failedDatasets'] == [{'datasetId': 'missing', 'variableName': 'x'}]
+
+def test_status_reports_warmup_duration():
+    warmup = Warmup(max_workers=1)
+    warmup.start(lambda dataset_id, variable_name: None, [('a', 'x')])
+    assert warmup.wait(5)
+    assert warmup.status()['warmupDuration'] >= 0
+
+def test_warmup_is_started_once_per_process():
+    calls = []
+    warmup = Warmup(max_workers=1)
+    warmup.start(lambda dataset_id, variable_name: calls.append(dataset_id), [('a', 'x')])
+    warmup.start(lambda dataset_id, variable_name: calls.append(dataset_id), [('b', 'x')])
+    assert warmup.wait(5)
+    assert warmup.started
+    assert calls == ['a']
+
+def test_warmup_started_before_fork_is_started_afresh(monkeypatch):
+    release = threading.Event()
+    warmup = Warmup(max_workers=1)
+    warmup.start(lambda dataset_id, variable_name: release.wait(5), [('a', 'x')])
+
+    # act as a process forked while the warm-up was running
+    parent_pid = os.getpid()
+    monkeypatch.setattr(os, 'getpid', lambda: parent_pid + 1)
+    assert not warmup.started
+    assert not warmup.ready
+    warmup.start(lambda dataset_id, variable_name: None, [('b', 'x')])
+    assert warmup.wait(5)
+    assert warmup.status()['loadedDatasets'] == [{'datasetId': 'b', 'variableName': 'x'}]
+    release.set()
+
+def test_datasets_listed_by_function_are_loaded():
+    calls = []
+    warmup = Warmup(max_workers=1)
+    warmup.start(lambda dataset_id, variable_name: calls.append(dataset_id),
+                 lambda: [('a', 'x')])
+    assert warmup.wait(5)
+    assert calls == ['a']
+    assert warmup.status()['warmupError'] is None
+
+def test_error_listing_datasets_is_reported_and_warmup_finishes(tmpdir):
+    path = str(tmpdir.join('manifest.json'))
+    with open(path, 'w') as manifest_file:
+        json.dump([{'variableName': 'x'}], manifest_file)
+    warmup = Warmup(max_workers=1)
+    warmup.start(lambda dataset_id, variable_name: None, lambda: read_manifest(path))
+    assert warmup.wait(5)
+    status = warmup.status()
+    assert status['ready']
+    assert status['loadedDatasets'] == []
+    assert status['warmupError'] == "KeyError: 'datasetId'"